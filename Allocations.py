@@ -0,0 +1,397 @@
+""" Python Evolving Snake game
+
+    Description:
+        Allocations file includes the allocation tracker class, which measures the memory allocated by each frame
+        and each simulation tick with tracemalloc and the garbage collections caused by it
+        Run it with: $ python Allocations.py --frames 3000 --budget 4096
+        The frames of the game loop of Main.py are played headless with the turns of the autopilot, the script fails with exit code 1,
+        if a steady state frame or a frame with a tick allocates more bytes than the budget
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# only the allocations in the files of the game are shown in the top lines
+base_path = os.path.dirname(os.path.abspath(__file__))
+
+# maximum bytes, which a steady state frame or tick may allocate
+allocation_budget = 4096
+
+# frames of the UI for each simulation tick --> tickrate 60 and game_speed 150 of Main.py
+frames_per_tick = 9
+
+
+class Allocation_Tracker():
+    """
+    Description:
+        Measures the allocations of frames and ticks, a measurement starts with begin(kind) and ends with end(kind):
+        - allocated: bytes allocated between begin and end (peak of the traced memory - traced memory at begin),
+          the objects freed in the same frame like temporary rects are counted too
+        - net: bytes still allocated at the end, they are freed by a later frame or the garbage collector
+        - blocks: number of memory blocks still allocated at the end
+        - collections: garbage collections during the measurement and their pause time
+        The allocations are attributed to the source lines by comparing a snapshot of the traced memory
+        at the start of the tracking with a snapshot at the time of the report
+        Measurements of different kinds must not overlap, the peak of tracemalloc is reset by begin
+
+    Attributes:
+        traceback_frames: number of stack frames stored for each allocation
+        measurements: list of (allocated bytes, net bytes, net blocks, collections, gc pause ms) of each kind
+        start_memory: traced memory at the begin of the current measurement
+        start_blocks: allocated blocks at the begin of the current measurement
+        collections: garbage collections since the begin of the current measurement
+        gc_time: garbage collection pause in ms since the begin of the current measurement
+        gc_start: start time of the running garbage collection
+        snapshot: snapshot of the traced memory at the start of the tracking
+
+    Params:
+        traceback_frames (int): number of stack frames stored for each allocation --> default 1
+
+    Tests:
+        1. check if a measurement of a block, which creates a list of 1000 ints, has more than 8000 allocated bytes
+        2. check if a measurement of an empty block has nearly 0 allocated bytes
+    """
+
+    def __init__(self, traceback_frames=1):
+        self.traceback_frames = traceback_frames
+        self.measurements = {}
+
+        self.start_memory = 0
+        self.start_blocks = 0
+        self.collections = 0
+        self.gc_time = 0.0
+        self.gc_start = 0.0
+        self.snapshot = None
+
+
+    def start(self):
+        """
+        Description:
+            start tracemalloc and the garbage collection callback
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if tracemalloc.is_tracing() is True after the call
+        """
+
+        tracemalloc.start(self.traceback_frames)
+        gc.callbacks.append(self.gc_callback)
+        self.snapshot = tracemalloc.take_snapshot()
+
+
+    def stop(self):
+        """
+        Description:
+            stop tracemalloc and the garbage collection callback
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if tracemalloc.is_tracing() is False after the call
+        """
+
+        if self.gc_callback in gc.callbacks:
+            gc.callbacks.remove(self.gc_callback)
+        tracemalloc.stop()
+
+
+    def gc_callback(self, phase, info):
+        """
+        Description:
+            count the garbage collections and their pause time, called by the garbage collector
+
+        Params:
+            phase (String): "start" or "stop" of the collection
+            info (dict): generation, collected and uncollectable objects
+
+        Returns:
+            none
+
+        Tests:
+            1. check if gc.collect() inside of a measurement counts one collection
+        """
+
+        if phase == "start":
+            self.gc_start = time.perf_counter()
+        else:
+            self.collections += 1
+            self.gc_time += (time.perf_counter() - self.gc_start) * 1000
+
+
+    def begin(self, kind):
+        """
+        Description:
+            begin the measurement of a frame or a tick
+
+        Params:
+            kind (String): kind of the measurement, e.g. "frame" or "tick"
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the collections are 0 after the call
+        """
+
+        self.collections = 0
+        self.gc_time = 0.0
+
+        tracemalloc.reset_peak()
+        self.start_blocks = sys.getallocatedblocks()
+        self.start_memory = tracemalloc.get_traced_memory()[0]
+
+
+    def end(self, kind):
+        """
+        Description:
+            end the measurement of a frame or a tick and keep its values
+
+        Params:
+            kind (String): kind of the measurement, the same as of begin
+
+        Returns:
+            int: allocated bytes of the measurement
+
+        Tests:
+            1. check if the measurements of the kind grow by one
+        """
+
+        memory, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+
+        allocated = peak - self.start_memory
+        measurement = (allocated, memory - self.start_memory, blocks - self.start_blocks, self.collections, self.gc_time)
+        self.measurements.setdefault(kind, []).append(measurement)
+
+        return allocated
+
+
+    def summary(self, kind, skip=0):
+        """
+        Description:
+            return the statistics of the measurements of a kind
+
+        Params:
+            kind (String): kind of the measurements
+            skip (int): number of measurements at the start, which are not counted, e.g. the warm up
+
+        Returns:
+            dict: count, mean, p95 and max allocated bytes, mean net bytes, collections and gc pause in ms
+
+        Tests:
+            1. check if max is the highest allocated value of the measurements
+        """
+
+        measurements = self.measurements.get(kind, [])[skip:]
+
+        if len(measurements) == 0:
+            return {"count": 0, "mean": 0, "p95": 0, "max": 0, "net": 0, "collections": 0, "gc_time": 0.0}
+
+        allocated = sorted(measurement[0] for measurement in measurements)
+
+        return {
+            "count": len(measurements),
+            "mean": sum(allocated) / len(allocated),
+            "p95": allocated[round((len(allocated) - 1) * 0.95)],
+            "max": allocated[-1],
+            "net": sum(measurement[1] for measurement in measurements) / len(measurements),
+            "collections": sum(measurement[3] for measurement in measurements),
+            "gc_time": sum(measurement[4] for measurement in measurements),
+        }
+
+
+    def over_budget(self, kind, budget, skip=0, ignored=()):
+        """
+        Description:
+            return the measurements, which allocated more bytes than the budget
+
+        Params:
+            kind (String): kind of the measurements
+            budget (int): maximum allocated bytes
+            skip (int): number of measurements at the start, which are not checked
+            ignored (set): indices of measurements, which are not checked, e.g. frames with a full redraw
+
+        Returns:
+            list: (index, allocated bytes) of each measurement over the budget
+
+        Tests:
+            1. check if a budget of 0 returns all measurements with allocations
+        """
+
+        measurements = self.measurements.get(kind, [])
+        return [(index, measurements[index][0]) for index in range(skip, len(measurements))
+                if measurements[index][0] > budget and index not in ignored]
+
+
+    def top_lines(self, limit=10):
+        """
+        Description:
+            return the source lines of the game, which hold the most memory allocated since the start of the tracking
+
+        Params:
+            limit (int): number of lines
+
+        Returns:
+            list: (file:line, size difference in bytes, count difference) of the lines
+
+        Tests:
+            1. check if only files of the game are returned
+        """
+
+        # the measurements of the tracker itself are no allocations of the game
+        filters = (tracemalloc.Filter(True, os.path.join(base_path, "*")), tracemalloc.Filter(False, os.path.abspath(__file__)))
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        statistics = snapshot.compare_to(self.snapshot.filter_traces(filters), "lineno")
+
+        lines = []
+        for statistic in statistics:
+            if statistic.size_diff <= 0:
+                continue
+
+            frame = statistic.traceback[0]
+            lines.append(("{}:{}".format(os.path.basename(frame.filename), frame.lineno), statistic.size_diff, statistic.count_diff))
+
+            if len(lines) == limit:
+                break
+
+        return lines
+
+
+def run_game(tracker, frames, width=27, height=23):
+    """
+    Description:
+        play a headless game with the autopilot and measure each frame of the game loop of Main.py,
+        a frame with a simulation tick is measured as "tick", the other frames as "frame"
+        the path search of the autopilot replaces the input of the player, its turn is put into the input queue before the frame
+        and is not measured, a new game is started after the game over
+
+    Params:
+        tracker (Allocation_Tracker): the started tracker
+        frames (int): number of frames
+        width (int): number of grid cells in x direction
+        height (int): number of grid cells in y direction
+
+    Returns:
+        dict: kind --> indices of the measurements with a full redraw, they are no steady state frames
+
+    Tests:
+        1. check if the tracker has frames measurements of both kinds together after the call
+    """
+
+    # no window and no sound device is needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from Main import Game, Game_Loop
+    from Scheduler import Frame_Scheduler
+
+    game = Game(False, width, height)
+    game.load_assets()
+
+    # the frames are not capped, the measurement runs as fast as possible
+    loop = Game_Loop(game, False, False, False, Frame_Scheduler({}, ()))
+    full_redraws = {"frame": set(), "tick": set()}
+
+    for frame in range(frames):
+        steps = 1 if frame % frames_per_tick == 0 else 0
+        kind = "tick" if steps > 0 else "frame"
+
+        if steps > 0:
+            # a new game starts without measuring, the reset is no steady state
+            if game.engine.game_over_status == True:
+                game.reset()
+
+            action = game.autopilot.next_action(game.engine)
+            if action is not None:
+                loop.input_queue.push(action, game.engine.direction)
+
+        tracker.begin(kind)
+        dirty_rects = loop.frame(steps, (frame % frames_per_tick) / frames_per_tick)
+        loop.wait()
+        tracker.end(kind)
+
+        if dirty_rects is None:
+            full_redraws[kind].add(len(tracker.measurements[kind]) - 1)
+
+    return full_redraws
+
+
+def parse_arguments(arguments=None):
+    """
+    Description:
+        read the command line arguments
+
+    Params:
+        arguments (list): command line arguments, None for sys.argv
+
+    Returns:
+        argparse.Namespace: the arguments
+
+    Tests:
+        1. check if the default budget is allocation_budget
+    """
+
+    parser = argparse.ArgumentParser(description="Measure the allocations of each frame and tick of a headless game")
+    parser.add_argument("--frames", type=int, default=3000, help="number of frames")
+    parser.add_argument("--warmup", type=int, default=120, help="frames at the start, which are not checked")
+    parser.add_argument("--budget", type=int, default=allocation_budget, help="maximum allocated bytes of a steady state frame or tick")
+    parser.add_argument("--top", type=int, default=10, help="number of source lines with the most allocated memory")
+    parser.add_argument("--width", type=int, default=27, help="number of grid cells in x direction")
+    parser.add_argument("--height", type=int, default=23, help="number of grid cells in y direction")
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    tracker = Allocation_Tracker()
+    tracker.start()
+    full_redraws = run_game(tracker, arguments.frames, arguments.width, arguments.height)
+    top_lines = tracker.top_lines(arguments.top)
+    tracker.stop()
+
+    warmup_ticks = arguments.warmup // frames_per_tick
+
+    print("kind     count  mean [B]  p95 [B]  max [B]  net [B]  gc  gc [ms]")
+    for kind, skip in (("frame", arguments.warmup - warmup_ticks), ("tick", warmup_ticks)):
+        summary = tracker.summary(kind, skip)
+        print("{:<8} {count:<6} {mean:<9.0f} {p95:<8} {max:<8} {net:<8.0f} {collections:<3} {gc_time:.2f}".format(kind, **summary))
+
+    print("")
+    print("line                      bytes     blocks")
+    for line, size, count in top_lines:
+        print("{:<25} {:<9} {}".format(line, size, count))
+
+    # steady state: no warm up, no full redraw
+    failed = (tracker.over_budget("frame", arguments.budget, arguments.warmup - warmup_ticks, full_redraws["frame"])
+              + tracker.over_budget("tick", arguments.budget, warmup_ticks, full_redraws["tick"]))
+
+    if len(failed) > 0:
+        print("")
+        print("{} frames or ticks over the budget of {} bytes, the highest: {} bytes".format(len(failed), arguments.budget, max(size for index, size in failed)))
+        sys.exit(1)
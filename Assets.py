@@ -0,0 +1,225 @@
+""" Python Evolving Snake game
+
+    Description:
+        Assets file includes the asset manager class, which loads each image and sound of the game once per process
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import pygame
+import logging
+import threading
+
+from concurrent.futures import Future
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# the folders are found relative to this file, independent of the working directory and the operating system
+base_path = os.path.dirname(os.path.abspath(__file__))
+image_path = os.path.join(base_path, "Images")
+sound_path = os.path.join(base_path, "Sounds")
+
+
+class Asset_Manager():
+    """
+    Description:
+        Loads images and sounds on first use and keeps them for the whole process
+        Images are converted to the pixel format of the display for fast blits and each scaled size and rotation is cached,
+        so a new game object gets the same surfaces without loading or scaling them again
+        Big images can be preloaded by a background thread, so the first frame doesn`t wait for them
+
+    Attributes:
+        images: converted images keyed by the file name
+        scaled_images: scaled and rotated images keyed by (file name, size, angle)
+        sounds: sounds keyed by the file name
+        surfaces: composed surfaces keyed by a key of the caller
+        pending: images, which are loaded by the loader thread: file name --> Future of the loaded surface
+
+    Params:
+        none
+
+    Tests:
+        1. check if two calls of image with the same name and size return the same surface
+        2. check if a restart of the game doesn`t load an image again
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.scaled_images = {}
+        self.sounds = {}
+        self.surfaces = {}
+        self.pending = {}
+
+
+    def image(self, name, size=None, alpha=True, angle=0):
+        """
+        Description:
+            return the image of the Images folder, loaded and converted on the first call
+
+        Params:
+            name (String): file name of the image, e.g. "Head.png"
+            size (tuple): (width, height) to scale the image to, None for the original size
+            alpha (bool): True to keep the transparency of the image, False for images without transparency like the background
+            angle (int): counterclockwise rotation in degrees after scaling, e.g. 90 for a sprite in an other direction
+
+        Returns:
+            pygame.Surface: the cached image
+
+        Tests:
+            1. check if the returned surface has the given size
+            2. check if the file is only loaded once for different sizes
+        """
+
+        key = (name, size, angle)
+        image = self.scaled_images.get(key)
+
+        if image is None:
+            image = self.images.get(name)
+
+            if image is None:
+                # a preloaded file is taken from the loader thread, if it is still loading the call waits for it
+                future = self.pending.pop(name, None)
+                if future is not None:
+                    image = future.result()
+                else:
+                    image = pygame.image.load(os.path.join(image_path, name))
+
+                # convert to the display pixel format, this needs a display mode
+                if pygame.display.get_surface() is not None:
+                    image = image.convert_alpha() if alpha else image.convert()
+
+                self.images[name] = image
+
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+
+            if angle != 0:
+                image = pygame.transform.rotate(image, angle)
+
+            self.scaled_images[key] = image
+
+        return image
+
+
+    def preload(self, names, finished=None):
+        """
+        Description:
+            load the image files in a background thread, the files are converted and scaled by the first call of image,
+            because converting needs the display of the main thread
+
+        Params:
+            names (tuple): file names of the images in the order of loading
+            finished (function): function without parameters, called by the loader thread after the last image
+
+        Returns:
+            threading.Thread: the loader thread
+
+        Tests:
+            1. check if image returns the preloaded file without loading it again
+            2. check if finished is called after all images are ready
+        """
+
+        futures = []
+        for name in names:
+            if name not in self.images and name not in self.pending:
+                future = Future()
+                self.pending[name] = future
+                futures.append((name, future))
+
+        thread = threading.Thread(target=self.load_files, args=(futures, finished), name="asset loader", daemon=True)
+        thread.start()
+
+        return thread
+
+
+    def load_files(self, futures, finished):
+        """
+        Description:
+            load the image files of the futures, runs in the loader thread
+
+        Params:
+            futures (list): (file name, Future) of each image
+            finished (function): function without parameters, called after the last image, None for no call
+
+        Returns:
+            none
+
+        Tests:
+            1. check if a missing file sets the exception of its future and the other files are loaded
+        """
+
+        for name, future in futures:
+            try:
+                future.set_result(pygame.image.load(os.path.join(image_path, name)))
+
+            except Exception as e:
+                logging.error("Error occurred while preloading an image", exc_info=True)
+                future.set_exception(e)
+
+        if finished is not None:
+            try:
+                finished()
+
+            except Exception as e:
+                logging.error("Error occurred after preloading the images", exc_info=True)
+
+
+    def sound(self, name):
+        """
+        Description:
+            return the sound of the Sounds folder, loaded on the first call
+
+        Params:
+            name (String): file name of the sound, e.g. "EatingSound.wav"
+
+        Returns:
+            pygame.mixer.Sound: the cached sound
+
+        Tests:
+            1. check if two calls with the same name return the same sound object
+        """
+
+        sound = self.sounds.get(name)
+
+        if sound is None:
+            sound = pygame.mixer.Sound(os.path.join(sound_path, name))
+            self.sounds[name] = sound
+
+        return sound
+
+
+    def surface(self, key, build):
+        """
+        Description:
+            return a surface composed out of other assets, it is only composed on the first call for the key
+
+        Params:
+            key (tuple): key of the surface, it has to include everything the surface depends on, like the size
+            build (function): function without parameters, which composes and returns the surface
+
+        Returns:
+            pygame.Surface: the cached surface
+
+        Tests:
+            1. check if build is only called on the first call for the key
+        """
+
+        surface = self.surfaces.get(key)
+
+        if surface is None:
+            surface = build()
+            self.surfaces[key] = surface
+
+        return surface
+
+
+# asset manager of the process, used by all game objects
+assets = Asset_Manager()
@@ -0,0 +1,281 @@
+""" Python Evolving Snake game
+
+    Description:
+        Audio file includes the audio manager class, which initialises the mixer once per process,
+        preloads the sounds and plays them on a reserved pool of channels with a priority
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import pygame
+import logging
+
+from Assets import assets
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# settings of the mixer, a small buffer gives a low latency between eating the food and hearing it,
+# a too small buffer crackles on slow systems --> 1024 or 2048
+audio_frequency = 44100
+audio_size = -16
+audio_channels = 2
+audio_buffer_size = 512
+
+# number of mixer channels reserved for the sounds of the game
+audio_pool_size = 4
+
+
+class Audio_Manager():
+    """
+    Description:
+        Initialises the mixer only once, a new game object or a restart doesn`t initialise it again
+        Each sound is loaded once with its volume and priority, play uses one of the reserved channels:
+        - a free channel of the pool
+        - if all channels play, the channel with the lowest priority is stopped, if its priority is not higher
+        - else the sound is skipped
+        When the sound is muted, play returns without touching the mixer
+
+    Attributes:
+        frequency: sample rate of the mixer
+        size: bits of a sample, negative for signed samples
+        channels: 1 for mono, 2 for stereo
+        buffer_size: number of samples of the mixer buffer, smaller --> lower latency
+        pool_size: number of reserved channels
+        sounds: dict of the loaded sounds: name --> (sound, priority)
+        sound_files: dict of the file names of the loaded sounds: name --> file name
+        pool: the reserved channels
+        channel_priorities: priority of the last sound of each channel of the pool
+        channel_started: play count at the start of the last sound of each channel, to stop the oldest sound first
+        plays: number of started sounds
+        muted: True if no sound is played
+        available: True if the mixer is initialised, False without an audio device
+
+    Params:
+        frequency (int): sample rate --> default audio_frequency
+        size (int): bits of a sample --> default audio_size
+        channels (int): 1 for mono, 2 for stereo --> default audio_channels
+        buffer_size (int): samples of the mixer buffer --> default audio_buffer_size
+        pool_size (int): number of reserved channels --> default audio_pool_size
+
+    Tests:
+        1. check if a second call of init doesn`t initialise the mixer again
+        2. check if play returns None and plays nothing while muted
+    """
+
+    def __init__(self, frequency=audio_frequency, size=audio_size, channels=audio_channels, buffer_size=audio_buffer_size, pool_size=audio_pool_size):
+        self.frequency = frequency
+        self.size = size
+        self.channels = channels
+        self.buffer_size = buffer_size
+        self.pool_size = pool_size
+
+        self.sounds = {}
+        self.sound_files = {}
+        self.pool = []
+        self.channel_priorities = []
+        self.channel_started = []
+        self.plays = 0
+        self.muted = False
+        self.available = False
+
+
+    def init(self):
+        """
+        Description:
+            initialise the mixer with the settings and reserve the channel pool, only on the first call
+
+        Params:
+            none
+
+        Returns:
+            bool: True if the mixer is available
+
+        Tests:
+            1. check if the mixer has the buffer size of the settings after the first call
+            2. check if the game runs without sound, if there is no audio device
+        """
+
+        if self.available:
+            return True
+
+        try:
+            # the mixer is only initialised, if no other module did it before
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.pre_init(self.frequency, self.size, self.channels, self.buffer_size)
+                pygame.mixer.init()
+
+            # the first channels are reserved, pygame doesn`t use them for sound.play() of other sounds
+            if pygame.mixer.get_num_channels() < self.pool_size:
+                pygame.mixer.set_num_channels(self.pool_size)
+            pygame.mixer.set_reserved(self.pool_size)
+
+            self.pool = [pygame.mixer.Channel(index) for index in range(self.pool_size)]
+            self.channel_priorities = [0] * self.pool_size
+            self.channel_started = [0] * self.pool_size
+            self.available = True
+
+        except Exception as e:
+            logging.error("Error occurred while initialising the mixer, the game runs without sound", exc_info=True)
+            self.available = False
+
+        return self.available
+
+
+    def configure(self, frequency=None, buffer_size=None):
+        """
+        Description:
+            change the settings of the mixer, an initialised mixer is initialised again with the new settings
+            this causes a short hitch, so only call it from a settings menu and not during a game
+
+        Params:
+            frequency (int): new sample rate, None to keep it
+            buffer_size (int): new number of samples of the mixer buffer, None to keep it
+
+        Returns:
+            bool: True if the mixer is available
+
+        Tests:
+            1. check if pygame.mixer.get_init() returns the new frequency
+            2. check if the loaded sounds are loaded again for the new mixer
+        """
+
+        if frequency is not None:
+            self.frequency = frequency
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+
+        if not self.available:
+            return self.init()
+
+        try:
+            # the sounds of the old mixer can`t be played by the new one, they are loaded again
+            loaded = [(name, self.sound_files[name], sound.get_volume(), priority) for name, (sound, priority) in self.sounds.items()]
+
+            pygame.mixer.quit()
+            self.available = False
+            assets.sounds.clear()
+
+            if self.init():
+                for name, file_name, volume, priority in loaded:
+                    self.load(name, file_name, volume, priority)
+
+        except Exception as e:
+            logging.error("Error occurred while configuring the mixer", exc_info=True)
+
+        return self.available
+
+
+    def load(self, name, file_name, volume=1.0, priority=0):
+        """
+        Description:
+            load a sound of the Sounds folder once and set its volume and priority
+
+        Params:
+            name (String): name of the sound for play
+            file_name (String): file name of the sound, e.g. "EatingSound.wav"
+            volume (float): volume of the sound 0.0 - 1.0
+            priority (int): higher priority sounds stop lower priority sounds, if all channels play
+
+        Returns:
+            pygame.mixer.Sound: the sound, None if the mixer is not available
+
+        Tests:
+            1. check if a second load of the same file doesn`t read the file again
+        """
+
+        if not self.init():
+            return None
+
+        try:
+            sound = assets.sound(file_name)
+            sound.set_volume(volume)
+            self.sounds[name] = (sound, priority)
+            self.sound_files[name] = file_name
+            return sound
+
+        except Exception as e:
+            logging.error("Error occurred while loading a sound", exc_info=True)
+            return None
+
+
+    def play(self, name):
+        """
+        Description:
+            play the loaded sound on a channel of the pool
+
+        Params:
+            name (String): name of the loaded sound
+
+        Returns:
+            pygame.mixer.Channel: the channel of the sound, None if the sound is muted, not loaded or skipped
+
+        Tests:
+            1. check if a sound is skipped, if all channels play sounds with a higher priority
+            2. check if the oldest sound is stopped, if all channels play sounds with the same priority
+        """
+
+        if self.muted or not self.available:
+            return None
+
+        # the sound is still loading, e.g. by the loader thread of the assets
+        if name not in self.sounds:
+            return None
+
+        try:
+            sound, priority = self.sounds[name]
+
+            # a free channel, else the channel with the lowest priority and the oldest sound
+            choice = None
+            for index, channel in enumerate(self.pool):
+                if not channel.get_busy():
+                    choice = index
+                    break
+                if choice is None or (self.channel_priorities[index], self.channel_started[index]) < (self.channel_priorities[choice], self.channel_started[choice]):
+                    choice = index
+
+            if self.pool[choice].get_busy() and self.channel_priorities[choice] > priority:
+                return None
+
+            self.plays += 1
+            self.channel_priorities[choice] = priority
+            self.channel_started[choice] = self.plays
+
+            channel = self.pool[choice]
+            channel.play(sound)
+            return channel
+
+        except Exception as e:
+            logging.error("Error occurred while playing a sound", exc_info=True)
+            return None
+
+
+    def set_muted(self, muted):
+        """
+        Description:
+            mute or unmute the sounds, muting stops the playing sounds
+
+        Params:
+            muted (bool): True to mute the sounds
+
+        Returns:
+            none
+
+        Tests:
+            1. check if no channel of the pool is busy after muting
+        """
+
+        self.muted = muted
+
+        if muted and self.available:
+            for channel in self.pool:
+                channel.stop()
+
+
+# audio manager of the process, used by all game objects
+audio = Audio_Manager()
@@ -0,0 +1,491 @@
+""" Python Evolving Snake game
+
+    Description:
+        Autopilot file includes the autopilot class, which steers the snake to the food with an A* path search on the engine grid
+        The path is cached and followed tick by tick, it is only searched again if the food moved or the path is blocked,
+        the search to the food is spread over several ticks with a limit of expanded cells per tick
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import heapq
+import logging
+
+from array import array
+from collections import deque
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+
+class Path_Search():
+    """
+    Description:
+        A* search from the food back to the snake head, which is continued over several ticks:
+        each call of advance expands at most a limited number of cells, so a search on a huge board doesn`t block a tick
+        The food doesn`t move while the search runs, the head moves each tick, so the search ends at the cell next to the current head,
+        the manhattan distance to the head at the start of the search is the heuristic
+        The board changes while the search runs, so each cell is added only once: a cell freed by the tail later doesn`t lead
+        to updating the cost of the cells behind it again, the path may be a bit longer than the shortest path
+    Attributes:
+        food: packed cell of the food, the root of the search
+        stride: number of cells in one row of the grid
+        target_x: x coordinate of the head at the start of the search
+        target_y: y coordinate of the head at the start of the search
+        came_from: array with the next cell on the way to the food of each packed cell, 0 for a cell not reached yet,
+                   the array is allocated once, so the search doesn`t resize a dict in the middle of a tick
+        open_cells: heap of (estimated length, -cost, cell) of the cells to expand, each cell is added once
+        exhausted: bool, True if all reachable cells are expanded without reaching the head
+
+    Params:
+        stride (int): number of cells in one row of the grid
+        cell_count (int): number of cells of the grid
+        food (int): packed cell of the food
+        head (int): packed cell of the head at the start of the search
+
+    Tests:
+        1. check if the path of a search on an empty board has the length of the manhattan distance
+        2. check if a search with a limit of 10 cells on a 500 x 500 board returns None and is not exhausted
+    """
+
+    def __init__(self, stride, cell_count, food, head):
+        self.food = food
+        self.stride = stride
+        self.target_y, self.target_x = divmod(head, stride)
+
+        # cell 0 is a border cell, it is never on a path, the food points to itself
+        food_y, food_x = divmod(food, stride)
+        self.came_from = array('i', bytes(4 * cell_count))
+        self.came_from[food] = food
+        self.open_cells = [(abs(self.target_x - food_x) + abs(self.target_y - food_y), 0, food)]
+        self.exhausted = False
+
+
+    def advance(self, grid, head, limit):
+        """
+        Description:
+            continue the search on the current grid until the cell next to the head is reached or limit cells are expanded
+
+        Params:
+            grid (bytearray): number of blocks on each packed cell, the border cells are set to 1
+            head (int): packed cell of the current head
+            limit (int): maximum number of expanded cells in this call
+
+        Returns:
+            list: cells of the path from the cell next to the head up to the food, None if the head is not reached yet
+
+        Tests:
+            1. check if the search is exhausted for a food enclosed by the body
+            2. check if two calls with a limit of 100 expand the same cells as one call with 200
+        """
+
+        stride = self.stride
+        steps = (-stride, 1, stride, -1)
+        came_from = self.came_from
+        open_cells = self.open_cells
+        expanded = 0
+
+        while open_cells:
+            if expanded == limit:
+                return None
+
+            estimate, negative_cost, cell = heapq.heappop(open_cells)
+
+            # the head moves onto this cell with the next tick
+            if abs(cell - head) in (1, stride):
+                path = [cell]
+                while cell != self.food:
+                    cell = came_from[cell]
+                    path.append(cell)
+                return path
+
+            expanded += 1
+            next_cost = -negative_cost + 1
+            for step in steps:
+                neighbour = cell + step
+
+                if grid[neighbour] == 0 and came_from[neighbour] == 0:
+                    came_from[neighbour] = cell
+
+                    y, x = divmod(neighbour, stride)
+                    heapq.heappush(open_cells, (next_cost + abs(self.target_x - x) + abs(self.target_y - y), -next_cost, neighbour))
+
+        self.exhausted = True
+        return None
+
+
+class Autopilot():
+    """
+    Description:
+        Chooses the action of each tick for the snake of an engine:
+        - a path to the food is only followed, if the snake can still reach its tail after eating, so it doesn`t trap itself
+        - without such a path the snake follows its tail, the tail always moves away and frees the way
+        - the plan is kept between the ticks, the food is searched again when the food moved or the plan is blocked,
+          after an unreachable or unsafe food the next search starts, when the plan to the tail is used up
+        - each search expands at most max_expanded cells in a tick, the search to the food is continued in the next ticks,
+          while the snake follows its tail, so a tick on a huge board stays far below the game speed
+
+    Attributes:
+        plan: deque of the next cells of the snake head
+        plan_food: food cell of the plan and the search, both are dropped when the food moves
+        following_tail: bool, True if the plan leads to the tail and not to the food
+        search: Path_Search to the food, which is continued in the next tick, None without a running search
+        expected_head: head cell after the last returned action, a different head means the player moved the snake
+        max_expanded: maximum number of cells expanded by one search in one tick
+        searches: number of started searches, to measure the caching
+
+    Params:
+        max_expanded (int): maximum number of cells expanded by one search in one tick --> default 1000
+
+    Tests:
+        1. check if the snake eats the food on an empty board on the shortest way
+        2. check if the number of searches is much less than the number of ticks
+        3. check if next_action takes less than 50 ms on a 500 x 500 board with unreachable food
+    """
+
+    def __init__(self, max_expanded=1000):
+        self.max_expanded = max_expanded
+        self.searches = 0
+        self.reset()
+
+
+    def reset(self):
+        """
+        Description:
+            forget the plan and the search, e.g. for a new game
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the next call of next_action searches a new path
+        """
+
+        self.plan = deque()
+        self.plan_food = None
+        self.following_tail = False
+        self.search = None
+        self.expected_head = None
+
+
+    def next_action(self, engine):
+        """
+        Description:
+            return the action for the next tick of the engine:
+            - the plan is followed, as long as the snake is where the plan expects it and the next cell is free
+            - without a plan to the food, the search to the food is continued, a found path is followed if it is safe
+            - without any plan, the snake follows its tail or moves to any free cell next to the head
+
+        Params:
+            engine (Engine): engine of the game
+
+        Returns:
+            int: action (move_up, move_right, move_down, move_left), None to keep the direction
+
+        Tests:
+            1. check if the returned action never moves the head into the border or the body, if a free cell is next to the head
+            2. check if no search happens in a tick, in which the plan is still valid
+            3. check if the head doesn`t move onto the tail in a tick, in which the snake grows
+        """
+
+        try:
+            head = engine.body[0]
+
+            # a new food --> the plan and the search lead to the old food
+            if engine.food != self.plan_food:
+                self.plan.clear()
+                self.search = None
+                self.plan_food = engine.food
+
+            # the player moved the snake or the next cell is blocked, e.g. by the tail in a tick, in which the snake grows
+            if head != self.expected_head or (len(self.plan) > 0 and not self.free(engine, self.plan[0])):
+                self.plan.clear()
+
+            # search the food without a plan to the food, a running search is continued while the snake follows its tail
+            if engine.food is not None and (len(self.plan) == 0 or (self.following_tail and self.search is not None)):
+                self.search_food(engine, head)
+
+            if len(self.plan) == 0:
+                # follow the tail, the cells of the path stay free while the snake follows it
+                path = self.find_path(engine.grid, engine.stride, head, engine.body[-1])
+                if path is not None and self.free(engine, path[0]):
+                    self.plan.extend(path)
+                    self.following_tail = True
+
+            if len(self.plan) == 0:
+                # no path at all --> any free cell next to the head
+                for cell in self.neighbours(engine, head):
+                    if self.free(engine, cell):
+                        self.plan.append(cell)
+                        self.following_tail = True
+                        break
+                else:
+                    self.expected_head = None
+                    return None
+
+            cell = self.plan.popleft()
+            self.expected_head = cell
+            return self.action(engine, head, cell)
+
+        except Exception as e:
+            logging.error("Error occurred while choosing the autopilot action", exc_info=True)
+            return None
+
+
+    def search_food(self, engine, head):
+        """
+        Description:
+            start or continue the search to the food for max_expanded cells,
+            a found path, which is still free and safe, replaces the plan
+
+        Params:
+            engine (Engine): engine of the game
+            head (int): packed cell of the head
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the plan ends on the food, when the food is reachable on an empty board
+            2. check if the plan is not changed, when the food is enclosed by the body
+        """
+
+        if self.search is None:
+            self.search = Path_Search(engine.stride, len(engine.grid), engine.food, head)
+            self.searches += 1
+
+        path = self.search.advance(engine.grid, head, self.max_expanded)
+
+        if path is None:
+            # unreachable food --> the next search starts when the plan to the tail is used up
+            if self.search.exhausted:
+                self.search = None
+            return
+
+        self.search = None
+
+        # the snake moved during the search, the path may lead over a cell, which is no longer free
+        if not self.free(engine, path[0]) or any(engine.grid[cell] != 0 for cell in path[1:]):
+            return
+
+        if self.safe(engine, path):
+            self.plan.clear()
+            self.plan.extend(path)
+            self.following_tail = False
+
+
+    def safe(self, engine, path):
+        """
+        Description:
+            check if the snake can reach its tail from the food after following the path,
+            the board after the path is marked on the grid of the engine and restored after the search, the grid is not copied
+
+        Params:
+            engine (Engine): engine of the game
+            path (list): cells from the cell next to the head up to the food
+
+        Returns:
+            bool: True if the tail is reachable after eating, False if not or not within max_expanded cells
+
+        Tests:
+            1. check if a path into a dead end is not safe
+            2. check if a path on an empty board is safe
+            3. check if the grid of the engine is the same after the call
+        """
+
+        body = engine.body
+        length = len(body) + (1 if engine.new_block else 0)
+        grid = engine.grid
+
+        # number of blocks of the old body, which are still on the board when the head reaches the food
+        remaining = length - len(path)
+
+        if remaining > 0:
+            added = path
+            removed = [body[index] for index in range(remaining, len(body))]
+            tail = body[remaining - 1]
+        else:
+            added = path[-length:]
+            removed = list(body)
+            tail = path[-length]
+
+        # the tail leaves its cell with the next move, so the head can follow it
+        if tail == path[-1]:
+            return True
+
+        for cell in added:
+            grid[cell] += 1
+        for cell in removed:
+            grid[cell] -= 1
+
+        try:
+            return self.find_path(grid, engine.stride, path[-1], tail) is not None
+
+        finally:
+            # restore the grid of the engine
+            for cell in removed:
+                grid[cell] += 1
+            for cell in added:
+                grid[cell] -= 1
+
+
+    def find_path(self, grid, stride, start, goal):
+        """
+        Description:
+            A* search of the shortest path over the free cells of the grid from start to goal,
+            the goal cell may be occupied (e.g. the tail), the manhattan distance is the heuristic
+
+        Params:
+            grid (bytearray): number of blocks on each packed cell, the border cells are set to 1
+            stride (int): number of cells in one row of the grid
+            start (int): packed start cell
+            goal (int): packed goal cell
+
+        Returns:
+            list: cells of the path without the start cell, None if the goal is not reachable within max_expanded cells
+
+        Tests:
+            1. check if the path on an empty board has the length of the manhattan distance
+            2. check if a goal enclosed by the body returns None
+        """
+
+        self.searches += 1
+
+        goal_y, goal_x = divmod(goal, stride)
+        steps = (-stride, 1, stride, -1)
+
+        came_from = {start: None}
+        cost = {start: 0}
+
+        # heap of (estimated length, -cost, cell), the higher cost first on the same estimate --> less expanded cells
+        start_y, start_x = divmod(start, stride)
+        open_cells = [(abs(goal_x - start_x) + abs(goal_y - start_y), 0, start)]
+        expanded = 0
+
+        while open_cells:
+            estimate, negative_cost, cell = heapq.heappop(open_cells)
+
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came_from[cell]
+                path.reverse()
+                return path
+
+            if -negative_cost > cost[cell]:
+                continue
+
+            expanded += 1
+            if expanded > self.max_expanded:
+                return None
+
+            next_cost = -negative_cost + 1
+            for step in steps:
+                neighbour = cell + step
+
+                if (grid[neighbour] == 0 or neighbour == goal) and next_cost < cost.get(neighbour, next_cost + 1):
+                    cost[neighbour] = next_cost
+                    came_from[neighbour] = cell
+
+                    y, x = divmod(neighbour, stride)
+                    heapq.heappush(open_cells, (next_cost + abs(goal_x - x) + abs(goal_y - y), -next_cost, neighbour))
+
+        return None
+
+
+    def free(self, engine, cell):
+        """
+        Description:
+            check if the head can move onto the cell in the next tick, the tail cell is free if the snake doesn`t grow
+
+        Params:
+            engine (Engine): engine of the game
+            cell (int): packed cell next to the head
+
+        Returns:
+            bool: True if the cell is free in the next tick
+
+        Tests:
+            1. check if the border cells are not free
+            2. check if the tail cell is free without new_block
+        """
+
+        if abs(cell - engine.body[0]) not in (1, engine.stride):
+            return False
+
+        return engine.grid[cell] == 0 or (cell == engine.body[-1] and not engine.new_block and len(engine.body) > 2)
+
+
+    def neighbours(self, engine, cell):
+        """
+        Description:
+            return the 4 cells next to the cell
+
+        Params:
+            engine (Engine): engine of the game
+            cell (int): packed cell
+
+        Returns:
+            tuple: the cells above, right, below and left of the cell
+
+        Tests:
+            1. check if the neighbours of a cell are in the order of the actions
+        """
+
+        return (cell - engine.stride, cell + 1, cell + engine.stride, cell - 1)
+
+
+    def action(self, engine, head, cell):
+        """
+        Description:
+            return the action, which moves the head onto the cell next to it
+
+        Params:
+            engine (Engine): engine of the game
+            head (int): packed cell of the head
+            cell (int): packed cell next to the head
+
+        Returns:
+            int: action (move_up, move_right, move_down, move_left)
+
+        Tests:
+            1. check if the cell right of the head returns move_right
+        """
+
+        return self.neighbours(engine, head).index(cell)
+
+
+# autopilot of the process, as policy for the tournament: --policy Autopilot:autopilot_policy
+autopilot = Autopilot()
+
+
+def autopilot_policy(engine):
+    """
+    Description:
+        policy function of the autopilot, the tournament calls autopilot_policy.reset before each game
+
+    Params:
+        engine (Engine): engine of the game
+
+    Returns:
+        int: action of the next tick
+
+    Tests:
+        1. check if a tournament with the autopilot has a higher mean score than the greedy policy
+    """
+
+    return autopilot.next_action(engine)
+
+
+# the plan of the last game is forgotten before a new game
+autopilot_policy.reset = autopilot.reset
@@ -0,0 +1,478 @@
+""" Python Evolving Snake game
+
+    Description:
+        Batch file includes the batch engine class, which simulates many independent games at once with NumPy
+        The rules are the same as in the engine class, but each rule is one vectorised operation over all games
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import numpy as np
+import logging
+
+from Engine import move_directions, check_effect_weights
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# action of the step function to keep the direction
+keep_direction = -1
+
+
+class Batch_Engine():
+    """
+    Description:
+        Create an object of the batch engine, which holds the state of count games in NumPy arrays
+        Each game follows the rules of the Engine class: moving, eating, the random effects, collisions and health loss
+        A game stays over after game over, until it is reset
+
+    Attributes:
+        count: number of games
+        grid_cell_count_x: number of grid_cells in x direction
+        grid_cell_count_y: number of grid_cells in y direction
+        stride: number of cells in one row, including the border cells left and right of the playarea
+        capacity: maximum length of a snake
+        rng: NumPy random generator of the batch
+        grid: (count, cells) number of snake blocks on each packed cell, the border cells are set to 1
+        body: (count, capacity) ring buffer of the packed cells of each snake
+        head_index: index of the head in the ring buffer of each snake, the body follows at the next indices
+        head: packed cell of the head of each snake
+        length: length of each snake
+        direction: action index (move_up, move_right, move_down, move_left) of the direction of each snake
+        new_block: bool for each snake, which indicates the snake body getting a new block with the next move
+        food: packed cell of the food of each game, -1 if there is no free cell left
+        game_over_status: bool for each game, which indicates the end of the game
+        base_healt_loss: health loss of a new game and after the effects, which reset the health loss
+        random_effect_step: points between two random effects
+        effect_thresholds: upper bounds of the random index for each effect, the sums of the effect weights
+        healt_loss: health loss of each game
+        current_health: health of each game
+        highscore: highscore of each game
+        random_effect_interval: highscore of the next random effect of each game
+        last_effect: index (0-4) of the random effect of the last step of each game, -1 for no effect
+
+    Params:
+        count (int): number of games
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
+        seed (int): seed of the random generator, None for a random seed
+        healt_loss (float): health loss of each tick --> default 0.5, the same rules as the engine
+        random_effect_step (int): points between two random effects --> default 250
+        effect_weights (tuple): weight of each of the 5 random effects --> default equal weights (10, 10, 10, 10, 10)
+
+    Tests:
+        1. check if each game of the batch has the same state as an engine, which gets the same food positions and effects
+        2. check if the step time for 4096 games is much less than 4096 engine steps
+    """
+
+    def __init__(self, count, grid_cell_count_x=27, grid_cell_count_y=23, seed=None, healt_loss=0.5, random_effect_step=250, effect_weights=(10, 10, 10, 10, 10)):
+        self.count = count
+        self.grid_cell_count_x = grid_cell_count_x
+        self.grid_cell_count_y = grid_cell_count_y
+        self.stride = grid_cell_count_x + 2
+        self.capacity = grid_cell_count_x * grid_cell_count_y + 1
+
+        self.max_health = 100
+        self.rng = np.random.default_rng(seed)
+
+        # rules, which can be changed to tune the game, like in the engine
+        self.base_healt_loss = healt_loss
+        self.random_effect_step = random_effect_step
+        self.effect_thresholds = np.cumsum(check_effect_weights(effect_weights))
+
+        # change of the packed cell for each action and the opposite action of each action
+        self.cell_steps = np.array([dy * self.stride + dx for dx, dy in move_directions], dtype=np.int32)
+        self.opposite_actions = np.array([2, 3, 0, 1], dtype=np.int8)
+
+        # grid of one game without snake, the border around the playarea counts as occupied
+        self.empty_grid = np.ones((grid_cell_count_y + 2, self.stride), dtype=np.uint8)
+        self.empty_grid[1:-1, 1:-1] = 0
+        self.empty_grid = self.empty_grid.reshape(-1)
+
+        self.grid = np.empty((count, self.empty_grid.size), dtype=np.uint8)
+        self.body = np.zeros((count, self.capacity), dtype=np.int32)
+        self.head_index = np.zeros(count, dtype=np.int32)
+        self.head = np.zeros(count, dtype=np.int32)
+        self.length = np.zeros(count, dtype=np.int32)
+        self.direction = np.zeros(count, dtype=np.int8)
+        self.new_block = np.zeros(count, dtype=bool)
+        self.food = np.zeros(count, dtype=np.int32)
+        self.game_over_status = np.zeros(count, dtype=bool)
+        self.healt_loss = np.zeros(count, dtype=np.float64)
+        self.current_health = np.zeros(count, dtype=np.float64)
+        self.highscore = np.zeros(count, dtype=np.int64)
+        self.random_effect_interval = np.zeros(count, dtype=np.int64)
+        self.last_effect = np.full(count, -1, dtype=np.int8)
+
+        self.reset()
+
+
+    def reset(self, games=None):
+        """
+        Description:
+            set the games back to the initial values of a new game
+
+        Params:
+            games (array): indices or bool mask of the games to reset, None for all games
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the reset games have a snake with 3 blocks in the middle of the playarea
+            2. check if the other games are not changed
+        """
+
+        try:
+            games = self.indices(games)
+
+            # initial snake in the middle of the playarea, moving downwards
+            x = self.grid_cell_count_x // 2 + 1
+            y = self.grid_cell_count_y // 2 + 1
+            initial_body = np.array([y * self.stride + x, (y - 1) * self.stride + x, (y - 2) * self.stride + x], dtype=np.int32)
+
+            self.grid[games] = self.empty_grid
+            self.body[games, 0:3] = initial_body
+            self.head_index[games] = 0
+            self.head[games] = initial_body[0]
+            self.length[games] = 3
+            self.grid[games[:, None], initial_body] += 1
+
+            self.direction[games] = 2
+            self.new_block[games] = False
+            self.game_over_status[games] = False
+
+            self.healt_loss[games] = self.base_healt_loss
+            self.current_health[games] = 100
+            self.highscore[games] = 0
+            self.random_effect_interval[games] = self.random_effect_step
+            self.last_effect[games] = -1
+
+            self.randomize_food(games)
+
+        except Exception as e:
+            logging.error("Error occurred while resetting the batch engine", exc_info=True)
+
+
+    def indices(self, games):
+        """
+        Description:
+            convert a selection of games into an array of game indices
+
+        Params:
+            games (array): indices or bool mask of games, None for all games
+
+        Returns:
+            array: the indices of the games
+
+        Tests:
+            1. check if a bool mask returns the indices of the True values
+        """
+
+        if games is None:
+            return np.arange(self.count)
+
+        games = np.asarray(games)
+        if games.dtype == bool:
+            return np.flatnonzero(games)
+
+        return games
+
+
+    def heads(self, games):
+        """
+        Description:
+            return the packed cells of the heads of the games
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            array: the head cells
+
+        Tests:
+            1. check if the head of a new game is in the middle of the playarea
+        """
+
+        return self.head[games]
+
+
+    def tails(self, games):
+        """
+        Description:
+            return the packed cells of the tails of the games
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            array: the tail cells
+
+        Tests:
+            1. check if the tail of a new game is two cells above the head
+        """
+
+        return self.body[games, (self.head_index[games] + self.length[games] - 1) % self.capacity]
+
+
+    def step(self, actions=None):
+        """
+        Description:
+            simulate one tick of all running games:
+            - turn the snakes to the direction of the actions
+            - move the snakes, check if food was eaten and check collisions
+            - reduce the health
+
+        Params:
+            actions (array): action of each game (move_up, move_right, move_down, move_left) or keep_direction, None to keep all directions
+
+        Returns:
+            array: bool for each game, True while the game is still running
+
+        Tests:
+            1. check if the heads move one cell in the direction of the actions
+            2. check if the games, which hit the border, return False
+        """
+
+        self.last_effect[:] = -1
+        games = np.flatnonzero(~self.game_over_status)
+
+        if actions is not None:
+            self.turn(games, np.asarray(actions)[games])
+
+        self.move_snakes(games)
+        self.check_snacks(games)
+        self.check_collisions(games)
+
+        # only update the health of the running games
+        self.update_health(games[~self.game_over_status[games]])
+
+        return ~self.game_over_status
+
+
+    def turn(self, games, actions):
+        """
+        Description:
+            change the direction of the snakes, a turn into the opposite direction is ignored
+
+        Params:
+            games (array): indices of the games
+            actions (array): action of each of the games, keep_direction to keep the direction
+
+        Returns:
+            none
+
+        Tests:
+            1. check if move_up is ignored for a snake moving downwards
+        """
+
+        valid = (actions >= 0) & (actions != self.opposite_actions[self.direction[games]])
+        self.direction[games[valid]] = actions[valid]
+
+
+    def move_snakes(self, games):
+        """
+        Description:
+            move the snakes one cell forward, a snake with new_block keeps its last block and grows
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the length stays the same without new_block
+            2. check if the length grows by one with new_block
+        """
+
+        growing = self.new_block[games]
+
+        # remove the last block of the snakes, which don`t grow
+        shrinking = games[~growing]
+        self.grid[shrinking, self.tails(shrinking)] -= 1
+
+        self.length[games[growing]] += 1
+        self.new_block[games] = False
+
+        # Adding the new head by adding the direction to the old head
+        heads = self.heads(games) + self.cell_steps[self.direction[games]]
+        self.head_index[games] = (self.head_index[games] - 1) % self.capacity
+        self.body[games, self.head_index[games]] = heads
+        self.head[games] = heads
+        self.grid[games, heads] += 1
+
+
+    def check_snacks(self, games):
+        """
+        Description:
+            for each snake head on the food: a new food position is determined, the snake grows by one block,
+            the highscore is updated depending on the health, the health is growing again and the random effects are activated
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. Check if the highscore changes when the snake eat some food and health is regenerated
+        """
+
+        eaters = games[self.food[games] == self.heads(games)]
+        if eaters.size == 0:
+            return
+
+        self.randomize_food(eaters)
+        self.new_block[eaters] = True
+
+        # Increase Highscore depending on the health
+        health = self.current_health[eaters]
+        self.highscore[eaters] += np.where(health <= 25, 75, np.where(health <= 50, 50, 25))
+
+        # Regenerate Health
+        self.current_health[eaters] = np.where(health <= 90, health + 10, self.max_health)
+
+        # Call a random effect every random_effect_step points
+        effects = eaters[self.highscore[eaters] >= self.random_effect_interval[eaters]]
+        self.random_effect_interval[effects] += self.random_effect_step
+        self.randomize_effects(effects)
+
+
+    def randomize_food(self, games):
+        """
+        Description:
+            choose a random free cell as food position for each of the games
+            random cells are tried a few times, the games without a free cell found this way choose out of all free cells
+            if the snake covers the whole playarea, there is no free cell left and the game is over
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the food is never on a snake block
+            2. check if a game with a full playarea is over
+        """
+
+        pending = games
+
+        for attempt in range(8):
+            if pending.size == 0:
+                return
+
+            cells = self.rng.integers(1, self.grid_cell_count_y + 1, pending.size) * self.stride + self.rng.integers(1, self.grid_cell_count_x + 1, pending.size)
+            free = self.grid[pending, cells] == 0
+
+            self.food[pending[free]] = cells[free]
+            pending = pending[~free]
+
+        for game in pending:
+            free_cells = np.flatnonzero(self.grid[game] == 0)
+
+            if free_cells.size == 0:
+                # the snake covers the whole playarea --> no cell left for the food
+                self.food[game] = -1
+                self.game_over_status[game] = True
+            else:
+                self.food[game] = free_cells[self.rng.integers(free_cells.size)]
+
+
+    def randomize_effects(self, games):
+        """
+        Description:
+            choose one out of 5 random effects for each of the games depending on the effect weights and do this effect:
+            0 --> health loss increased, 1 --> health loss decreased, 2 --> health reduced by half,
+            3 --> health doubled, 4 --> length of the snake reduced by two thirds
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. check if last_effect is set for the games
+            2. check if the length is a third after effect 4
+        """
+
+        if games.size == 0:
+            return
+
+        # the effect of a random index is the first effect, whose threshold is above the index
+        effects = np.searchsorted(self.effect_thresholds, self.rng.integers(0, self.effect_thresholds[-1], games.size), side="right")
+        self.last_effect[games] = effects
+
+        self.healt_loss[games] = self.base_healt_loss
+        self.healt_loss[games[effects == 0]] = self.base_healt_loss * 1.5
+        self.healt_loss[games[effects == 1]] = self.base_healt_loss * 0.5
+
+        halved = games[effects == 2]
+        self.current_health[halved] = self.current_health[halved] / 2
+
+        doubled = games[effects == 3]
+        self.current_health[doubled] = np.minimum(self.current_health[doubled] * 2, self.max_health)
+
+        shortened = games[effects == 4]
+        if shortened.size > 0:
+            # set the length of the snake to a third and remove the blocks behind it from the grid
+            length = self.length[shortened]
+            new_length = np.round(length / 3).astype(np.int32)
+            removed = length - new_length
+
+            removed_games = np.repeat(shortened, removed)
+            offsets = np.arange(removed.sum()) - np.repeat(np.cumsum(removed) - removed, removed) + np.repeat(new_length, removed)
+            removed_cells = self.body[removed_games, (self.head_index[removed_games] + offsets) % self.capacity]
+
+            np.subtract.at(self.grid, (removed_games, removed_cells), 1)
+            self.length[shortened] = new_length
+
+
+    def check_collisions(self, games):
+        """
+        Description:
+            check collisions of the snake heads with the border or the snake body, both are one lookup in the grid
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. Check, a snake crashes a border, the game is over
+            2. Check, a snake head crashes the snake body, the game is over
+        """
+
+        crashed = games[self.grid[games, self.heads(games)] > 1]
+        self.game_over_status[crashed] = True
+
+
+    def update_health(self, games):
+        """
+        Description:
+            Reduces the health of the games, a game with a health of 0 is over
+
+        Params:
+            games (array): indices of the games
+
+        Returns:
+            none
+
+        Tests:
+            1. Test, if health is 0 the game is over
+            2. check if the health is falling continuously
+        """
+
+        alive = self.current_health[games] > 0
+
+        living = games[alive]
+        self.current_health[living] -= self.healt_loss[living]
+        self.game_over_status[games[~alive]] = True
@@ -0,0 +1,226 @@
+""" Python Evolving Snake game
+
+    Description:
+        Benchmark file includes benchmarks for the headless engine, the batch engine, the memory of resident games and the startup of the game
+        Run it with: $ python Benchmark.py
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import sys
+import time
+import subprocess
+import tracemalloc
+
+from Engine import Engine, Body
+
+# the batch engine needs NumPy, without NumPy only the engine is measured
+try:
+    from Batch import Batch_Engine
+except ImportError:
+    Batch_Engine = None
+
+# snake lengths and number of moves for each benchmark run
+lengths = (3, 10, 100, 1000, 10000)
+ticks = 20000
+
+# number of games and steps for each batch benchmark run
+batch_counts = (1, 64, 1024, 4096)
+batch_steps = 500
+
+# snake lengths and number of resident engines for each memory benchmark run
+memory_lengths = (3, 100, 1000)
+memory_games = 1000
+
+# number of started processes for the startup benchmark
+startup_runs = 5
+
+# the child process shows the main menu, prints the time after the first flip and exits
+startup_script = "import time, Main; Main.game_loop(False, True, max_frames=1); print(time.time(), flush=True)"
+
+
+def build_engine(length, width=None):
+    """
+    Description:
+        create an engine with a straight snake of the given length, moving to the right
+        by default the playarea is long enough that the snake never reaches the border during the benchmark
+
+    Params:
+        length (int): number of blocks of the snake
+        width (int): number of grid cells in x direction, None for a playarea longer than the moves of the benchmark
+
+    Returns:
+        Engine: the prepared engine
+
+    Tests:
+        1. check if the snake has the given length
+        2. check if the head is the block with the highest x coordinate
+    """
+
+    if width is None:
+        width = length + ticks + 10
+
+    engine = Engine(width, 3)
+    engine.body = Body(engine.cell_type, (engine.cell(x, 2) for x in range(length + 1, 1, -1)))
+    engine.direction = (1, 0)
+    engine.build_grid()
+
+    return engine
+
+
+def benchmark_move(length):
+    """
+    Description:
+        measure the time of one move of a snake with the given length
+
+    Params:
+        length (int): number of blocks of the snake
+
+    Returns:
+        float: time of one move in microseconds
+
+    Tests:
+        1. check if the time for 3 and 10000 blocks is nearly the same
+    """
+
+    engine = build_engine(length)
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        engine.move_snake()
+    end = time.perf_counter()
+
+    return (end - start) / ticks * 1000000
+
+
+def benchmark_update(length):
+    """
+    Description:
+        measure the time of one update (move, snack check and collision check) of a snake with the given length
+
+    Params:
+        length (int): number of blocks of the snake
+
+    Returns:
+        float: time of one update in microseconds
+
+    Tests:
+        1. check if the time for 3 and 10000 blocks is nearly the same
+    """
+
+    engine = build_engine(length)
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        engine.update()
+    end = time.perf_counter()
+
+    return (end - start) / ticks * 1000000
+
+
+def benchmark_batch(count):
+    """
+    Description:
+        measure the time of one game tick in a batch of count games with random turns
+        finished games are reset, so all games are running during the whole benchmark
+
+    Params:
+        count (int): number of games in the batch
+
+    Returns:
+        float: time of one game tick in microseconds
+
+    Tests:
+        1. check if the time per game tick falls with a growing number of games
+    """
+
+    batch = Batch_Engine(count, seed=0)
+    actions = batch.rng.integers(-1, 4, (batch_steps, count))
+
+    start = time.perf_counter()
+    for i in range(batch_steps):
+        alive = batch.step(actions[i])
+        batch.reset(~alive)
+    end = time.perf_counter()
+
+    return (end - start) / (batch_steps * count) * 1000000
+
+
+def benchmark_memory(length):
+    """
+    Description:
+        measure the memory of resident engines with a snake of the given length on a playarea just long enough for it,
+        like the game states kept during a bulk simulation
+
+    Params:
+        length (int): number of blocks of the snake
+
+    Returns:
+        tuple: (bytes of one engine, bytes of the body of one engine for each block)
+
+    Tests:
+        1. check if the body bytes for each block are less than 5 for a snake of 1000 blocks
+    """
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    engines = [build_engine(length, length + 2) for i in range(memory_games)]
+    memory = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    body = engines[0].body
+    return (memory / memory_games, sys.getsizeof(body.cells) / len(body))
+
+
+def benchmark_startup():
+    """
+    Description:
+        measure the time from the start of a new python process to the first flip of the main menu,
+        the time includes the start of the interpreter, the imports, the window and the first frame
+
+    Params:
+        none
+
+    Returns:
+        float: median of the startup time of startup_runs processes in milliseconds
+
+    Tests:
+        1. check if the time is less than the time with loading all images before the first frame
+    """
+
+    times = []
+    for i in range(startup_runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, "-c", startup_script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout
+
+        # the last line of the output is the time of the first flip, pygame prints its version before
+        times.append((float(output.split()[-1]) - start) * 1000)
+
+    return sorted(times)[len(times) // 2]
+
+
+if __name__ == "__main__":
+    print("length    move [us]  update [us]")
+    for length in lengths:
+        print("{:<9} {:<10.3f} {:.3f}".format(length, benchmark_move(length), benchmark_update(length)))
+
+    print("")
+    print("length    engine [B]  body [B/block]")
+    for length in memory_lengths:
+        print("{:<9} {:<11.0f} {:.2f}".format(length, *benchmark_memory(length)))
+
+    if Batch_Engine is not None:
+        print("")
+        print("games     tick [us]")
+        for count in batch_counts:
+            print("{:<9} {:.3f}".format(count, benchmark_batch(count)))
+
+    print("")
+    print("startup to first flip [ms]")
+    print("{:.0f}".format(benchmark_startup()))
@@ -0,0 +1,130 @@
+""" Python Evolving Snake game
+
+    Description:
+        Controls file includes the key mapping of the snake controls, the autopilot key, the profiler keys and the input queue class,
+        which buffers the turns of the player until the next simulation tick
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import pygame
+
+from collections import deque
+
+from Engine import move_up, move_right, move_down, move_left, move_directions
+
+# Controles for the snake: "Arrow keys" or "w", "a", "s", "d"
+key_actions = {
+    pygame.K_UP: move_up,       pygame.K_w: move_up,
+    pygame.K_RIGHT: move_right, pygame.K_d: move_right,
+    pygame.K_DOWN: move_down,   pygame.K_s: move_down,
+    pygame.K_LEFT: move_left,   pygame.K_a: move_left,
+}
+
+# toggles the autopilot, a key of the snake controls gives the control back to the player
+autopilot_key = pygame.K_TAB
+
+# shows the profiler overlay in the score block and writes the trace of the last frames to logs/frame_trace.json
+profiler_key = pygame.K_F3
+trace_key = pygame.K_F4
+
+
+class Input_Queue():
+    """
+    Description:
+        Buffers the turns of the player, each simulation tick takes exactly one turn out of the queue
+        A turn is checked against the last turn in the queue, or the direction of the snake if the queue is empty,
+        so two fast key presses in one tick can`t reverse the snake into its own body and no key press gets lost
+
+    Attributes:
+        size: maximum number of buffered turns
+        actions: deque of the buffered actions (move_up, move_right, move_down, move_left)
+
+    Params:
+        size (int): maximum number of buffered turns --> default 3
+
+    Tests:
+        1. check if "up" and "left" pressed in one tick while moving down, turns left in the first and up in the second tick
+        2. check if "up" pressed while moving down is ignored
+    """
+
+    def __init__(self, size=3):
+        self.size = size
+        self.actions = deque()
+
+
+    def push(self, action, direction):
+        """
+        Description:
+            add a turn to the queue, if it changes the direction and doesn`t reverse it
+
+        Params:
+            action (int): one of move_up, move_right, move_down, move_left
+            direction (tuple): (x, y) current direction of the snake
+
+        Returns:
+            bool: True if the turn was added to the queue
+
+        Tests:
+            1. check if the same direction twice is only added once
+            2. check if a full queue doesn`t add the turn
+        """
+
+        # the direction the snake will have after the buffered turns
+        if len(self.actions) > 0:
+            direction = move_directions[self.actions[-1]]
+
+        new_direction = move_directions[action]
+
+        # no change or a reversal into the body
+        if new_direction == direction or (new_direction[0] == -direction[0] and new_direction[1] == -direction[1]):
+            return False
+
+        if len(self.actions) >= self.size:
+            return False
+
+        self.actions.append(action)
+        return True
+
+
+    def pop(self):
+        """
+        Description:
+            take the next turn out of the queue, called once per simulation tick
+
+        Params:
+            none
+
+        Returns:
+            int: the next action, None if no turn is buffered
+
+        Tests:
+            1. check if the turns are returned in the order of the key presses
+        """
+
+        if len(self.actions) == 0:
+            return None
+
+        return self.actions.popleft()
+
+
+    def clear(self):
+        """
+        Description:
+            remove all buffered turns, e.g. on pause or restart
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if pop returns None after function call
+        """
+
+        self.actions.clear()
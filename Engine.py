@@ -0,0 +1,845 @@
+""" Python Evolving Snake game
+
+    Description:
+        Engine file includes the engine class, the headless simulation of the snake game rules
+        The engine does not use pygame, so it runs without display, audio or images
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import random
+import numbers
+import logging
+
+from array import array
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# actions for the step function --> index into move_directions
+move_up = 0
+move_right = 1
+move_down = 2
+move_left = 3
+
+# direction vectors (x, y) for each action
+move_directions = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# names of the 5 random effects, in the order of randomize_effect
+effect_names = ("health_loss_increased", "health_loss_decreased", "health_halved", "health_doubled", "snake_shortened")
+
+# initial number of blocks, which fit into the array of a body before it grows
+body_capacity = 8
+
+
+def cell_typecode(cell_count):
+    """
+    Description:
+        return the smallest array typecode for the packed cells of a grid, 2 bytes for boards up to 65536 cells
+
+    Params:
+        cell_count (int): number of cells of the grid, including the border
+
+    Returns:
+        String: 'H' or 'I'
+
+    Tests:
+        1. check if a grid of 29 x 25 cells returns 'H'
+        2. check if a grid of 1000 x 1000 cells returns 'I'
+    """
+
+    return 'H' if cell_count <= 0x10000 else 'I'
+
+
+def check_effect_weights(effect_weights):
+    """
+    Description:
+        check the weights of the random effects, a wrong number of weights would give the weights to the wrong effects
+        and without a positive weight no effect can be chosen
+        A ValueError is raised, if there are not 5 non negative integer weights with a positive sum
+
+    Params:
+        effect_weights (iterable): weight of each of the 5 random effects
+
+    Returns:
+        tuple: the weights
+
+    Tests:
+        1. check if (10, 10, 10, 10, 10) and (1, 0, 0, 0, 0) are returned as tuple
+        2. check if 4 weights, a negative weight and 5 zero weights raise a ValueError
+    """
+
+    effect_weights = tuple(effect_weights)
+
+    if len(effect_weights) != len(effect_names):
+        raise ValueError("{} effect weights are needed ({}), got {}".format(len(effect_names), ", ".join(effect_names), len(effect_weights)))
+    if any(not isinstance(weight, numbers.Integral) or isinstance(weight, bool) or weight < 0 for weight in effect_weights):
+        raise ValueError("the effect weights must be non negative integers, got {}".format(effect_weights))
+    if sum(effect_weights) == 0:
+        raise ValueError("at least one effect weight must be positive, got {}".format(effect_weights))
+
+    return effect_weights
+
+
+class Body:
+    """
+    Description:
+        Create an object of the snake body, a ring buffer of packed cells in an array
+        Each block costs 2 or 4 bytes instead of a Python int in a deque, the head is added in front and the tail removed at the end,
+        so a move costs the same for each length of the snake. When the array is full, it grows to the double size
+        Like a deque, body[0] is the head, body[-1] is the tail and iterating starts at the head
+
+    Attributes:
+        cells: array of the packed cells, the blocks are stored from start on and wrap around at the end of the array
+        start: index of the head in cells
+        length: number of blocks
+
+    Params:
+        typecode (String): typecode of the cells array, see cell_typecode --> default 'I'
+        blocks (iterable): packed cells of the blocks, the head first
+
+    Tests:
+        1. check if body[0] is the last cell added by appendleft and body[-1] the first one
+        2. check if the blocks keep their order after the array grows with the head not at index 0
+    """
+
+    __slots__ = ("cells", "start", "length")
+
+    def __init__(self, typecode='I', blocks=()):
+        blocks = array(typecode, blocks)
+        self.length = len(blocks)
+        self.start = 0
+
+        # free space behind a short body, so the first blocks eaten don`t grow the array
+        self.cells = blocks + array(typecode, bytes(blocks.itemsize * max(body_capacity - self.length, 0)))
+
+
+    def __len__(self):
+        return self.length
+
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("body index out of range")
+
+        index += self.start
+        if index >= len(self.cells):
+            index -= len(self.cells)
+        return self.cells[index]
+
+
+    def __iter__(self):
+        cells = self.cells
+        end = self.start + self.length
+
+        if end <= len(cells):
+            return iter(cells[self.start:end])
+        return iter(cells[self.start:] + cells[:end - len(cells)])
+
+
+    def appendleft(self, cell):
+        """
+        Description:
+            add a block in front of the head, the new block is the head
+
+        Params:
+            cell (int): the packed cell of the new head
+
+        Returns:
+            none
+
+        Tests:
+            1. check if body[0] is the cell after the function call
+        """
+
+        if self.length == len(self.cells):
+            # copy the blocks in order to the start of an array of the double size
+            cells = array(self.cells.typecode, self)
+            cells.extend(cells)
+            self.cells = cells
+            self.start = 0
+
+        start = self.start - 1
+        if start < 0:
+            start += len(self.cells)
+
+        self.cells[start] = cell
+        self.start = start
+        self.length += 1
+
+
+    def pop(self):
+        """
+        Description:
+            remove the last block of the body
+
+        Params:
+            none
+
+        Returns:
+            int: the packed cell of the removed block
+
+        Tests:
+            1. check if the length decreases by 1 and the old body[-1] is returned
+        """
+
+        if self.length == 0:
+            raise IndexError("pop from an empty body")
+
+        self.length -= 1
+        index = self.start + self.length
+        if index >= len(self.cells):
+            index -= len(self.cells)
+        return self.cells[index]
+
+
+class Engine:
+    """
+    Description:
+        Create an object of the engine, which holds the whole game state and the game rules
+        Moving the snake, eating food, random effects, collision detection and health loss happen here,
+        the pygame classes Game, Snake and Food only draw this state and play sounds
+
+    Attributes:
+        grid_cell_count_x: number of grid_cells in x direction
+        grid_cell_count_y: number of grid_cells in y direction
+        stride: number of cells in one row, including the border cells left and right of the playarea
+        cell_type: typecode of the arrays of packed cells, 'H' (2 bytes) if the grid has up to 65536 cells
+        body: Body of packed cells of the snake, body[0] is the head
+        grid: bytearray with the number of snake blocks on each packed cell, the border cells are set to 1
+        free_cells: array of all packed cells of the playarea without a snake block, in no order
+        free_index: array with the index of each packed cell in free_cells, only valid for free cells
+        direction: (x, y) moving direction of the snake, (0, 0) means no movement
+        new_block: bool, which indicates the snake body getting a new block with the next move
+        food: packed cell of the food, None if there is no free cell left
+        game_over_status: bool, which indicates the end of the game
+        healt_loss: the value, health is decreasing every tick
+        max_health: maximum health of the snake
+        current_health: the current health
+        highscore: the highscore calculated by current_health and food eaten
+        base_healt_loss: health loss of a new game and after the effects, which reset the health loss
+        random_effect_step: points between two random effects
+        effect_weights: weight of each of the 5 random effects
+        effect_thresholds: upper bounds of the random index for each effect, the sums of the effect weights
+        random_effect_interval: every 250 Points a random effect appears
+        random_effect_status: flag, if random effect is activated or false
+        random_effect_message: the message displayed for the player at the stats area
+        effect_counts: number of times each random effect happened in the current game
+        seed: seed of the random generator of the current game
+        rng: random generator of the game, the same seed and the same actions always give the same game
+
+    Params:
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
+        seed (int): seed of the random generator of the first game, None for a random seed
+        healt_loss (float): health loss of each tick --> default 0.5
+        random_effect_step (int): points between two random effects --> default 250
+        effect_weights (tuple): weight of each of the 5 random effects --> default equal weights (10, 10, 10, 10, 10)
+
+    Tests:
+        1. check if an engine can be created and stepped without pygame being imported
+        2. check if the initial body length is 3 blocks and it`s direction is downwards
+        3. check if an engine has no __dict__, the state of thousands of games is kept resident during bulk simulation
+    """
+
+    __slots__ = ("grid_cell_count_x", "grid_cell_count_y", "stride", "cell_type", "max_health", "base_healt_loss",
+                 "random_effect_step", "effect_weights", "effect_thresholds", "seed", "rng", "body", "direction", "new_block", "grid",
+                 "free_cells", "free_index", "food", "game_over_status", "healt_loss", "current_health", "highscore",
+                 "random_effect_interval", "random_effect_status", "random_effect_message", "effect_counts")
+
+    def __init__(self, grid_cell_count_x=27, grid_cell_count_y=23, seed=None, healt_loss=0.5, random_effect_step=250, effect_weights=(10, 10, 10, 10, 10)):
+        self.grid_cell_count_x = grid_cell_count_x
+        self.grid_cell_count_y = grid_cell_count_y
+
+        # a cell (x, y) is packed into one int: y * stride + x
+        # the playarea is 1..grid_cell_count in both directions, 0 and grid_cell_count + 1 are the border
+        self.stride = grid_cell_count_x + 2
+        self.cell_type = cell_typecode(self.stride * (grid_cell_count_y + 2))
+
+        self.max_health = 100               # maximum health
+
+        # rules, which can be changed to tune the game
+        self.base_healt_loss = healt_loss
+        self.random_effect_step = random_effect_step
+        self.effect_weights = check_effect_weights(effect_weights)
+
+        # the random index of an effect is below the sum of the weights up to this effect
+        self.effect_thresholds = []
+        for weight in self.effect_weights:
+            self.effect_thresholds.append(weight + (self.effect_thresholds[-1] if self.effect_thresholds else 0))
+
+        self.reset(seed)
+
+
+    def reset(self, seed=None):
+        """
+        Description:
+            set the game state back to the initial values of a new game
+            each game gets its own random generator, so the game can be simulated again from its seed
+
+        Params:
+            seed (int): seed of the random generator of the new game, None for a random seed
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the snake has 3 blocks in the middle of the playarea after function call
+            2. check if health, highscore and random effect values are reset
+        """
+
+        try:
+            # a new seed for each game, the food positions and random effects only depend on it
+            if seed is None:
+                seed = random.getrandbits(64)
+            self.seed = seed
+            self.rng = random.Random(seed)
+
+            # initial snake in the middle of the playarea, moving downwards
+            x = self.grid_cell_count_x // 2 + 1
+            y = self.grid_cell_count_y // 2 + 1
+            self.body = Body(self.cell_type, (self.cell(x, y), self.cell(x, y - 1), self.cell(x, y - 2)))
+            self.direction = (0, 1)
+            self.new_block = False
+
+            self.build_grid()
+
+            self.game_over_status = False       # default value --> game running
+
+            self.healt_loss = self.base_healt_loss  # value of health loss
+            self.current_health = 100           # value of health
+            self.highscore = 0                  # highscore --> default 0
+
+            self.random_effect_interval = self.random_effect_step   # first random effect at Highscore = 250, than increase by 250 and so on
+            self.random_effect_status = False   # Default False, set to true after reaching 250 Points
+            self.random_effect_message = "No effect"    # Default there is no used effect
+            self.effect_counts = [0] * len(effect_names)
+
+            self.randomize_food()
+
+        except Exception as e:
+            logging.error("Error occurred while resetting the engine", exc_info=True)
+
+
+    def build_grid(self):
+        """
+        Description:
+            build the occupancy grid of the border and the snake body and the index of the free cells
+            the grid is only build on a new body, each move updates it incrementally
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if each border cell and each snake block is 1 in the grid
+            2. check if each other cell of the playarea is 0
+        """
+
+        # the border around the playarea counts as occupied
+        self.grid = bytearray([1]) * (self.stride * (self.grid_cell_count_y + 2))
+        for y in range(1, self.grid_cell_count_y + 1):
+            row = y * self.stride
+            self.grid[row + 1:row + self.grid_cell_count_x + 1] = bytes(self.grid_cell_count_x)
+
+        # all cells of the playarea are free before the snake is placed, filled row by row for big boards
+        self.free_cells = array(self.cell_type)
+        self.free_index = array(self.cell_type, bytes(len(self.grid) * self.free_cells.itemsize))
+        for y in range(1, self.grid_cell_count_y + 1):
+            row = y * self.stride
+            self.free_index[row + 1:row + self.grid_cell_count_x + 1] = array(self.cell_type, range(len(self.free_cells), len(self.free_cells) + self.grid_cell_count_x))
+            self.free_cells.extend(range(row + 1, row + self.grid_cell_count_x + 1))
+
+        for block in self.body:
+            self.occupy(block)
+
+
+    def occupy(self, cell):
+        """
+        Description:
+            add a snake block to the cell, a free cell is swap removed from the free cells
+
+        Params:
+            cell (int): the packed cell
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the grid value of the cell increases by 1
+            2. check if the cell is not in free_cells after function call
+        """
+
+        count = self.grid[cell]
+        self.grid[cell] = count + 1
+
+        if count == 0:
+            # move the last free cell to the index of the occupied cell
+            index = self.free_index[cell]
+            last = self.free_cells.pop()
+            if last != cell:
+                self.free_cells[index] = last
+                self.free_index[last] = index
+
+
+    def release(self, cell):
+        """
+        Description:
+            remove a snake block from the cell, the cell is added to the free cells as soon as no block is left on it
+
+        Params:
+            cell (int): the packed cell
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the grid value of the cell decreases by 1
+            2. check if the cell is in free_cells after the last block left it
+        """
+
+        count = self.grid[cell] - 1
+        self.grid[cell] = count
+
+        if count == 0:
+            self.free_index[cell] = len(self.free_cells)
+            self.free_cells.append(cell)
+
+
+    def cell(self, x, y):
+        """
+        Description:
+            pack the grid coordinates x and y into one cell index
+
+        Params:
+            x (int): x coordinate of the cell
+            y (int): y coordinate of the cell
+
+        Returns:
+            int: the packed cell
+
+        Tests:
+            1. check if position(cell(x, y)) returns (x, y)
+        """
+
+        return y * self.stride + x
+
+
+    def position(self, cell):
+        """
+        Description:
+            unpack a cell index into the grid coordinates x and y
+
+        Params:
+            cell (int): the packed cell
+
+        Returns:
+            tuple: (x, y) coordinates of the cell
+
+        Tests:
+            1. check if position(cell(x, y)) returns (x, y)
+        """
+
+        y, x = divmod(cell, self.stride)
+        return (x, y)
+
+
+    def step(self, action=None):
+        """
+        Description:
+            simulate one tick of the game:
+            - turn the snake to the direction of the action
+            - move the snake, check if food was eaten and check collisions
+            - reduce the health
+
+        Params:
+            action (int): one of move_up, move_right, move_down, move_left or None to keep the direction
+
+        Returns:
+            bool: True while the game is still running, False after game over
+
+        Tests:
+            1. check if the head moves one cell in the direction of the action
+            2. check if step returns False after the snake hits the border
+        """
+
+        if self.game_over_status:
+            return False
+
+        if action is not None:
+            self.turn(action)
+
+        self.update()
+
+        # only update the health if the game is running
+        if not self.game_over_status:
+            self.update_health()
+
+        return not self.game_over_status
+
+
+    def turn(self, action):
+        """
+        Description:
+            change the direction of the snake, a turn into the opposite direction is ignored
+
+        Params:
+            action (int): one of move_up, move_right, move_down, move_left
+
+        Returns:
+            bool: True if the direction was changed
+
+        Tests:
+            1. check if the direction changes from downwards to left with move_left
+            2. check if the direction stays downwards with move_up
+        """
+
+        direction = move_directions[action]
+
+        # the snake can not move back into its own body
+        if direction[0] == -self.direction[0] and direction[1] == -self.direction[1] and self.direction != (0, 0):
+            return False
+
+        self.direction = direction
+        return True
+
+
+    def update(self):
+        """
+        Description:
+            moving the snake, check if the snake has eaten something and check if the snake has a collision
+
+        Params:
+            none
+
+        Returns:
+            bool: True if the snake has eaten the food in this tick
+
+        Tests:
+            1. check if snake has a new position after function call
+            2. check if game still runs after check_collision function call -> game over or game still running
+        """
+
+        self.move_snake()
+        snack = self.check_snack()
+        self.check_collision()
+
+        return snack
+
+
+    def move_snake(self):
+        """
+        Description:
+            Moving the snake forward in the direction of the snakes direction
+            if the snake growes, the last block stays where it is
+            both ends of the body ring buffer change, so a move costs the same for each length of the snake
+            the ring buffer of Body and the grid updates of release and occupy are written out here, this is the hot path of each tick
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check the position of the snake changes
+            2. check if the snake grows 1 block if new_block is true
+        """
+
+        try:
+            direction = self.direction
+
+            if direction != (0, 0):
+                # the ring buffer, release and occupy are inlined, each method call costs more than the move itself
+                body = self.body
+                cells = body.cells
+                size = len(cells)
+                grid = self.grid
+                free_cells = self.free_cells
+                free_index = self.free_index
+
+                if self.new_block == True:
+                    # keep the last block --> the snake grows by one block
+                    self.new_block = False
+                    if body.length == size:
+                        # the array is full, Body.appendleft grows it
+                        head = cells[body.start] + direction[1] * self.stride + direction[0]
+                        body.appendleft(head)
+                        self.occupy(head)
+                        return
+                    body.length += 1
+                else:
+                    # remove the last block, the length stays the same
+                    index = body.start + body.length - 1
+                    if index >= size:
+                        index -= size
+                    tail = cells[index]
+
+                    count = grid[tail] - 1
+                    grid[tail] = count
+                    if count == 0:
+                        free_index[tail] = len(free_cells)
+                        free_cells.append(tail)
+
+                # Adding the new head by adding the direction to the old head
+                start = body.start
+                head = cells[start] + direction[1] * self.stride + direction[0]
+                start = start - 1 if start > 0 else size - 1
+                cells[start] = head
+                body.start = start
+
+                count = grid[head]
+                grid[head] = count + 1
+                if count == 0:
+                    # move the last free cell to the index of the occupied cell
+                    index = free_index[head]
+                    last = free_cells.pop()
+                    if last != head:
+                        free_cells[index] = last
+                        free_index[last] = index
+
+        except Exception as e:
+            logging.error("Error occurred while moving the snakes body blocks positions", exc_info=True)
+
+
+    def check_snack(self):
+        """
+        Description:
+            When the snake head is on the food, a new position of the food is determined and the snake grows by one block
+            also the highscore is updated depending on the rest of the health and the current health is growing again
+
+        Params:
+            none
+
+        Returns:
+            bool: True if the food was eaten
+
+        Tests:
+            1. Check if the highscore changes when the snake eat some food and health is regenerated
+            2. Check if the food got a new position, which is not on the snake
+        """
+
+        try:
+            # food position is snakes head position
+            if self.food != self.body.cells[self.body.start]:
+                return False
+
+            # generate new food position
+            self.randomize_food()
+
+            # indicate to add a new block
+            self.new_block = True
+
+            # Increase Highscore
+            if self.current_health <= 25:
+                self.highscore += 75
+            elif self.current_health <= 50:
+                self.highscore += 50
+            else:
+                self.highscore += 25
+
+            # Regenerate Health
+            if self.current_health <= 90:
+                self.current_health += 10
+            else:
+                self.current_health = 100
+
+            # Call a random effect
+            if self.highscore >= self.random_effect_interval:
+                self.random_effect_status = True
+                self.random_effect_interval += self.random_effect_step
+
+                self.randomize_effect()
+
+            return True
+
+        except Exception as e:
+            logging.error("Error occurred after snake ate food", exc_info=True)
+            return False
+
+
+    def check_collision(self):
+        """
+        Description:
+            - check collision between the snake head and the border
+            - check collision between snake head and any part of the snake body
+            both are one lookup in the occupancy grid, the head cell is counted twice on a collision
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Check, snake crashes a border, the game is over
+            2. Check, the snake head crashes the snake body, the game is over
+        """
+
+        try:
+            # the head is on a border cell or on a body block
+            if self.grid[self.body.cells[self.body.start]] > 1:
+                self.game_over()
+
+        except Exception as e:
+            logging.error("Error occurred when a snake collision was detected", exc_info=True)
+
+
+    def update_health(self):
+        """
+        Description:
+            Reduces the current health at each function call and as soon as they are 0, the game ends
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Test, if health is 0 the game is over
+            2. check if the health is falling continuously
+        """
+
+        try:
+            if self.current_health > 0:
+                self.current_health -= self.healt_loss
+            # when health is 0 --> end the game
+            else:
+                self.game_over()
+
+        except Exception as e:
+            logging.error("Error occurred while trying to update health", exc_info=True)
+
+
+    def game_over(self):
+        """
+        Description:
+            stop the snakes moving by setting the direction to (0,0), and set the game_over_status to True to indicate the end of the game
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Prove the status of the game_over_status after function call
+            2. Check the direction of the snake after function call, this should be (0,0)
+        """
+
+        self.direction = (0, 0)
+        self.game_over_status = True
+
+
+    def randomize_food(self):
+        """
+        Desription:
+            randomize the position of the food by choosing a random cell out of the free cells
+            this costs the same, no matter how much of the playarea is covered by the snake
+            if the snake covers the whole playarea there is no free cell left and the game is over
+
+        Params:
+            none
+
+        Returns:
+            bool: True if the food got a new position, False if there is no free cell left
+
+        Tests:
+            1. check if the food position changes for each new food
+            2. check if the food is never on a snake block
+        """
+
+        try:
+            if len(self.free_cells) == 0:
+                # the snake covers the whole playarea --> no cell left for the food
+                self.food = None
+                self.random_effect_message = "No free cell - left for the food"
+                self.game_over()
+                return False
+
+            self.food = self.free_cells[self.rng.randrange(len(self.free_cells))]
+            return True
+
+        except Exception as e:
+            logging.error("Error occurred while generate a randomized position for the food", exc_info=True)
+            return False
+
+
+    def randomize_effect(self):
+        """
+        Desription:
+            generate a random number, to get a random effect out of 5 effects and do this effect
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Check if the random_effect_status is reset after the function call
+            2. check if the random_effect_message changes
+        """
+
+        try:
+            # if random effect is requested do a random effect
+            if self.random_effect_status == True:
+                self.random_effect_status = False
+
+                # generate random index, to choose a ramdom effect depending on the effect weights
+                thresholds = self.effect_thresholds
+                effect_index = self.rng.randint(0, thresholds[-1] - 1)
+
+                if effect_index < thresholds[0]:
+                    # set health loss up
+                    self.healt_loss = self.base_healt_loss * 1.5
+                    self.random_effect_message = "Your health - loss increased"
+                    self.effect_counts[0] += 1
+
+                elif effect_index < thresholds[1]:
+                    # set health loss down
+                    self.healt_loss = self.base_healt_loss * 0.5
+                    self.random_effect_message = "Your health - loss decreased"
+                    self.effect_counts[1] += 1
+
+                elif effect_index < thresholds[2]:
+                    # reset health loss and lose half of current health
+                    self.healt_loss = self.base_healt_loss
+                    self.current_health = self.current_health / 2
+                    self.random_effect_message = "Your current health - has been reduced - by half"
+                    self.effect_counts[2] += 1
+
+                elif effect_index < thresholds[3]:
+                    # reset health loss and double the health, it can`t be greater than the maximum
+                    self.healt_loss = self.base_healt_loss
+                    self.current_health = min(self.current_health * 2, self.max_health)
+                    self.random_effect_message = "Your current health - was doubled"
+                    self.effect_counts[3] += 1
+
+                else:
+                    # reset health loss
+                    self.healt_loss = self.base_healt_loss
+                    self.effect_counts[4] += 1
+
+                    # set the length of the snake to a third --> round it to an integer because the index
+                    length = round(len(self.body) / 3)
+
+                    # remove the last blocks, each block was added by one move before
+                    for i in range(len(self.body) - length):
+                        self.release(self.body.pop())
+
+                    self.random_effect_message = "The length of your - snake was reduced - by two thirds"
+
+        except Exception as e:
+            logging.error("Error occurred while activating a random effect", exc_info=True)
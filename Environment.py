@@ -0,0 +1,383 @@
+""" Python Evolving Snake game
+
+    Description:
+        Environment file includes the environment classes for training an AI with reinforcement learning
+        The interface follows gym: reset() --> observation, step(action) --> observation, reward, done, info, render()
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import numpy as np
+import logging
+
+from Engine import Engine
+from Batch import Batch_Engine
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# number of actions: move_up, move_right, move_down, move_left
+action_count = 4
+
+# characters of the text rendering
+render_chars = {"border": "#", "body": "o", "head": "@", "food": "*", "free": "."}
+
+
+def render_board(occupancy, head, food):
+    """
+    Description:
+        build a text picture of one board, each cell is one character
+
+    Params:
+        occupancy (array): (rows, columns) number of snake blocks on each cell, including the border
+        head (array): (x, y) cell of the snake head
+        food (array): (x, y) cell of the food, negative if there is no food
+
+    Returns:
+        String: one line of text for each row of the board
+
+    Tests:
+        1. check if the text has grid_cell_count_y + 2 lines with grid_cell_count_x + 2 characters
+        2. check if the head and food characters are on the cells of head and food
+    """
+
+    rows, columns = occupancy.shape
+    lines = []
+
+    for y in range(rows):
+        line = []
+        for x in range(columns):
+            if x == head[0] and y == head[1]:
+                line.append(render_chars["head"])
+            elif x == food[0] and y == food[1]:
+                line.append(render_chars["food"])
+            elif x == 0 or y == 0 or x == columns - 1 or y == rows - 1:
+                line.append(render_chars["border"])
+            elif occupancy[y, x] > 0:
+                line.append(render_chars["body"])
+            else:
+                line.append(render_chars["free"])
+        lines.append("".join(line))
+
+    return "\n".join(lines)
+
+
+class Snake_Env():
+    """
+    Description:
+        Environment of one game on the headless engine
+        The observation is a dict of NumPy arrays, which are created once and updated in place on each step:
+        - occupancy: (grid_cell_count_y + 2, grid_cell_count_x + 2) view on the grid of the engine, no copy
+          the border cells are 1, the cells of the snake the number of blocks on it
+        - head: (x, y) of the snake head
+        - food: (x, y) of the food, (-1, -1) if there is no free cell left
+        - health: [current_health]
+        The same dict is returned by every step, copy the arrays to keep an observation
+        The reward of a step is the increase of the highscore, it depends on the health like in the game
+
+    Attributes:
+        engine: headless engine of the game
+        observation: dict of the observation arrays
+        info: dict with highscore, length and random effect message, updated in place on each step
+        last_highscore: highscore of the last step
+
+    Params:
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
+        healt_loss (float): health loss of each tick --> default 0.5
+        random_effect_step (int): points between two random effects --> default 250
+        effect_weights (tuple): weight of each of the 5 random effects --> default equal weights (10, 10, 10, 10, 10)
+
+    Tests:
+        1. check if the occupancy array changes after a step without calling reset
+        2. check if the reward of a step with eating the food is 25 with a health over 50
+    """
+
+    def __init__(self, grid_cell_count_x=27, grid_cell_count_y=23, healt_loss=0.5, random_effect_step=250, effect_weights=(10, 10, 10, 10, 10)):
+        self.engine = Engine(grid_cell_count_x, grid_cell_count_y, None, healt_loss, random_effect_step, effect_weights)
+
+        self.observation = {
+            "occupancy": None,
+            "head": np.zeros(2, dtype=np.int32),
+            "food": np.zeros(2, dtype=np.int32),
+            "health": np.zeros(1, dtype=np.float64),
+        }
+        self.info = {"highscore": 0, "length": 0, "effect": ""}
+        self.last_highscore = 0
+
+
+    def reset(self, seed=None):
+        """
+        Description:
+            start a new game
+
+        Params:
+            seed (int): seed of the random generator of the game, None for a random seed
+
+        Returns:
+            dict: the observation of the new game
+
+        Tests:
+            1. check if the head is in the middle of the playarea
+            2. check if the health is 100
+        """
+
+        try:
+            self.engine.reset(seed)
+
+            # the engine builds a new grid for a new game, so the view is only created here and not on each step
+            occupancy = np.frombuffer(self.engine.grid, dtype=np.uint8).reshape(self.engine.grid_cell_count_y + 2, self.engine.stride)
+            occupancy.flags.writeable = False
+            self.observation["occupancy"] = occupancy
+
+            self.last_highscore = 0
+            self.observe()
+
+        except Exception as e:
+            logging.error("Error occurred while resetting the environment", exc_info=True)
+
+        return self.observation
+
+
+    def step(self, action):
+        """
+        Description:
+            simulate one tick of the game with the action
+
+        Params:
+            action (int): move_up, move_right, move_down, move_left or None / -1 to keep the direction
+
+        Returns:
+            dict: the observation after the tick
+            int: reward, the increase of the highscore
+            bool: done, True if the game is over
+            dict: info with highscore, length and random effect message
+
+        Tests:
+            1. check if done is True after moving into the border
+            2. check if the reward is 0 without eating
+        """
+
+        if action is not None and action < 0:
+            action = None
+
+        alive = self.engine.step(action)
+
+        reward = self.engine.highscore - self.last_highscore
+        self.last_highscore = self.engine.highscore
+
+        self.observe()
+        return self.observation, reward, not alive, self.info
+
+
+    def observe(self):
+        """
+        Description:
+            write the head, food, health and info of the engine into the observation arrays
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if no new array is created by the function
+        """
+
+        engine = self.engine
+        head = self.observation["head"]
+        food = self.observation["food"]
+
+        head[1], head[0] = divmod(engine.body[0], engine.stride)
+        if engine.food is not None:
+            food[1], food[0] = divmod(engine.food, engine.stride)
+        else:
+            food[:] = -1
+        self.observation["health"][0] = engine.current_health
+
+        self.info["highscore"] = engine.highscore
+        self.info["length"] = len(engine.body)
+        self.info["effect"] = engine.random_effect_message
+
+
+    def render(self, mode="human"):
+        """
+        Description:
+            show the board as text
+
+        Params:
+            mode (String): "human" to print the board, "ansi" to return it
+
+        Returns:
+            String: the board, only with mode "ansi"
+
+        Tests:
+            1. check if mode "ansi" returns the text of render_board
+        """
+
+        text = render_board(self.observation["occupancy"], self.observation["head"], self.observation["food"])
+
+        if mode == "ansi":
+            return text
+
+        print(text)
+        print("Highscore: {}  Health: {}".format(self.engine.highscore, self.engine.current_health))
+
+
+class Batch_Env():
+    """
+    Description:
+        Environment of count games on the batch engine, all games are stepped with one call
+        A game is reset automatically in the step it ends, the returned done array marks these games
+        The observation arrays are created once and updated in place, the arrays of the batch engine are used directly:
+        - occupancy: (count, grid_cell_count_y + 2, grid_cell_count_x + 2) view on the grid of the batch engine
+        - head: (count, 2) x, y of the snake heads
+        - food: (count, 2) x, y of the food, y is -1 if there is no free cell left
+        - health: (count) the health array of the batch engine
+        The reward of each game is the increase of the highscore in the step
+
+    Attributes:
+        batch: batch engine of the games
+        observation: dict of the observation arrays
+        reward: reward of each game of the last step
+        done: bool of each game, True if the game ended in the last step
+        final_highscore: highscore of each game at the end of its last finished game
+        last_highscore: highscore of each game after the last step
+
+    Params:
+        count (int): number of games
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
+        seed (int): seed of the random generator, None for a random seed
+        healt_loss (float): health loss of each tick --> default 0.5
+        random_effect_step (int): points between two random effects --> default 250
+        effect_weights (tuple): weight of each of the 5 random effects --> default equal weights (10, 10, 10, 10, 10)
+
+    Tests:
+        1. check if the ended games are running again after the step
+        2. check if the observation arrays are the same objects after many steps
+    """
+
+    def __init__(self, count, grid_cell_count_x=27, grid_cell_count_y=23, seed=None, healt_loss=0.5, random_effect_step=250, effect_weights=(10, 10, 10, 10, 10)):
+        self.batch = Batch_Engine(count, grid_cell_count_x, grid_cell_count_y, seed, healt_loss, random_effect_step, effect_weights)
+
+        self.observation = {
+            "occupancy": self.batch.grid.reshape(count, grid_cell_count_y + 2, self.batch.stride),
+            "head": np.zeros((count, 2), dtype=np.int32),
+            "food": np.zeros((count, 2), dtype=np.int32),
+            "health": self.batch.current_health,
+        }
+
+        self.reward = np.zeros(count, dtype=np.int64)
+        self.done = np.zeros(count, dtype=bool)
+        self.final_highscore = np.zeros(count, dtype=np.int64)
+        self.last_highscore = np.zeros(count, dtype=np.int64)
+
+
+    def reset(self):
+        """
+        Description:
+            start a new game in each environment
+
+        Params:
+            none
+
+        Returns:
+            dict: the observation of the new games
+
+        Tests:
+            1. check if the heads of all games are in the middle of the playarea
+        """
+
+        self.batch.reset()
+        self.last_highscore[:] = 0
+        self.observe()
+
+        return self.observation
+
+
+    def step(self, actions):
+        """
+        Description:
+            simulate one tick of all games with the actions, the ended games are reset
+
+        Params:
+            actions (array): action of each game (move_up, move_right, move_down, move_left) or -1 to keep the direction
+
+        Returns:
+            dict: the observation after the tick, of the new game for the ended games
+            array: reward of each game
+            array: done of each game
+            dict: info with the final highscore of the ended games
+
+        Tests:
+            1. check if the reward of the games, which ate, is positive
+            2. check if final_highscore is set for the done games
+        """
+
+        alive = self.batch.step(actions)
+
+        np.subtract(self.batch.highscore, self.last_highscore, out=self.reward)
+        np.logical_not(alive, out=self.done)
+
+        if self.done.any():
+            self.final_highscore[self.done] = self.batch.highscore[self.done]
+            self.batch.reset(self.done)
+
+        self.last_highscore[:] = self.batch.highscore
+        self.observe()
+
+        return self.observation, self.reward, self.done, {"final_highscore": self.final_highscore}
+
+
+    def observe(self):
+        """
+        Description:
+            write the head and food cells of the batch engine as x, y into the observation arrays
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the head of game 0 matches the head of the batch engine
+        """
+
+        head = self.observation["head"]
+        food = self.observation["food"]
+
+        np.divmod(self.batch.head, self.batch.stride, out=(head[:, 1], head[:, 0]))
+        np.divmod(self.batch.food, self.batch.stride, out=(food[:, 1], food[:, 0]))
+
+
+    def render(self, game=0, mode="human"):
+        """
+        Description:
+            show the board of one game as text
+
+        Params:
+            game (int): index of the game
+            mode (String): "human" to print the board, "ansi" to return it
+
+        Returns:
+            String: the board, only with mode "ansi"
+
+        Tests:
+            1. check if the text of game 0 and game 1 differ after some steps
+        """
+
+        text = render_board(self.observation["occupancy"][game], self.observation["head"][game], self.observation["food"][game])
+
+        if mode == "ansi":
+            return text
+
+        print(text)
+        print("Highscore: {}  Health: {}".format(self.batch.highscore[game], self.batch.current_health[game]))
@@ -0,0 +1,267 @@
+""" Python Evolving Snake game
+
+    Description:
+        Equivalence file checks, that the batch engine follows the same rules as the engine:
+        each game of a batch is played again by an engine, which gets the same actions, food positions and random effects,
+        the body, grid, food, health, highscore and game over state are compared after every tick
+        Run it with: $ python Equivalence.py --games 256 --ticks 1000 --sizes 27x23,5x5,4x3
+        The script fails with exit code 1, if a game of the batch differs from its engine (needs NumPy)
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import sys
+import argparse
+
+import numpy as np
+
+from Engine import Engine
+from Batch import Batch_Engine, keep_direction
+from Tournament import parse_effect_weights
+
+
+class Scripted_Random():
+    """
+    Description:
+        Random generator of an engine, which returns the food positions and random effects drawn by the batch engine,
+        Engine.randomize_food and Engine.randomize_effect use it like a random.Random
+
+    Attributes:
+        engine: the engine of the generator
+        food: packed cell of the next food
+        effect: index (0-4) of the next random effect
+
+    Params:
+        engine (Engine): the engine of the generator
+
+    Tests:
+        1. check if the next food of the engine is the cell given by food
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.food = None
+        self.effect = None
+
+
+    def randrange(self, stop):
+        """ index of the scripted food in the free cells of the engine """
+        return self.engine.free_index[self.food]
+
+
+    def randint(self, a, b):
+        """ highest random index of the scripted effect, see Engine.randomize_effect """
+        return self.engine.effect_thresholds[self.effect] - 1
+
+
+def create_engine(batch, game, rules):
+    """
+    Description:
+        create an engine for a game of the batch right after its reset, with the same food as the game
+
+    Params:
+        batch (Batch_Engine): the batch
+        game (int): index of the game in the batch
+        rules (dict): healt_loss, random_effect_step and effect_weights of the batch
+
+    Returns:
+        Engine: the engine with a scripted random generator
+
+    Tests:
+        1. check if the engine has the same food as the game
+    """
+
+    engine = Engine(batch.grid_cell_count_x, batch.grid_cell_count_y, 0, **rules)
+    engine.rng = Scripted_Random(engine)
+
+    engine.rng.food = int(batch.food[game])
+    engine.randomize_food()
+
+    return engine
+
+
+def greedy_actions(batch, rng, randomness=0.2):
+    """
+    Description:
+        return an action for each game of the batch, which moves the head towards the food,
+        some actions are random, so the snakes eat, grow, get random effects and also crash
+
+    Params:
+        batch (Batch_Engine): the batch
+        rng (np.random.Generator): random generator of the actions
+        randomness (float): part of the random actions
+
+    Returns:
+        array: action of each game, keep_direction to keep the direction
+
+    Tests:
+        1. check if the action of a head left of the food is move_right, if it is not random
+    """
+
+    head_y, head_x = np.divmod(batch.head, batch.stride)
+    food_y, food_x = np.divmod(batch.food, batch.stride)
+
+    # move_up = 0, move_right = 1, move_down = 2, move_left = 3
+    actions = np.where(food_x > head_x, 1, np.where(food_x < head_x, 3, np.where(food_y > head_y, 2, 0)))
+
+    random = rng.random(batch.count) < randomness
+    actions[random] = rng.integers(keep_direction, 4, random.sum())
+
+    return actions
+
+
+def differences(batch, game, engine):
+    """
+    Description:
+        compare the state of a game of the batch with the state of its engine
+
+    Params:
+        batch (Batch_Engine): the batch
+        game (int): index of the game in the batch
+        engine (Engine): the engine of the game
+
+    Returns:
+        list: names of the values, which differ
+
+    Tests:
+        1. check if a new game and its new engine have no differences
+    """
+
+    names = []
+
+    length = int(batch.length[game])
+    body = batch.body[game, (batch.head_index[game] + np.arange(length)) % batch.capacity]
+
+    if list(engine.body) != body.tolist():
+        names.append("body")
+    if bytes(engine.grid) != batch.grid[game].tobytes():
+        names.append("grid")
+    if (engine.food if engine.food is not None else -1) != batch.food[game]:
+        names.append("food")
+    if engine.current_health != batch.current_health[game]:
+        names.append("health")
+    if engine.highscore != batch.highscore[game]:
+        names.append("highscore")
+    if engine.game_over_status != batch.game_over_status[game]:
+        names.append("game_over")
+
+    return names
+
+
+def check(count, ticks, width, height, seed=0, rules={}):
+    """
+    Description:
+        play count games in a batch with greedy and random actions and each game again with an engine,
+        a finished game is reset in the batch and gets a new engine
+
+    Params:
+        count (int): number of games in the batch
+        ticks (int): number of ticks
+        width (int): number of grid cells in x direction
+        height (int): number of grid cells in y direction
+        seed (int): seed of the batch and the actions
+        rules (dict): healt_loss, random_effect_step and effect_weights of the batch and the engines, empty for the default rules
+
+    Returns:
+        tuple: (number of mismatches, number of compared game ticks, number of random effects, first mismatch or None)
+
+    Tests:
+        1. check if no mismatch is found on a 27 x 23, 5 x 5 and 4 x 3 board
+        2. check if no mismatch is found with a health loss of 1.0, an effect step of 50 and the weights 1,2,3,4,40
+    """
+
+    batch = Batch_Engine(count, width, height, seed, **rules)
+    engines = [create_engine(batch, game, rules) for game in range(count)]
+
+    action_rng = np.random.default_rng(seed + 1)
+    mismatches = 0
+    compared = 0
+    effects = 0
+    first = None
+
+    for tick in range(ticks):
+        actions = greedy_actions(batch, action_rng)
+        running = ~batch.game_over_status
+        batch.step(actions)
+
+        for game in np.flatnonzero(running):
+            engine = engines[game]
+
+            # the engine draws the food and the effect of the batch
+            engine.rng.food = int(batch.food[game])
+            engine.rng.effect = int(batch.last_effect[game])
+            effects += batch.last_effect[game] >= 0
+
+            action = int(actions[game])
+            engine.step(None if action == keep_direction else action)
+
+            names = differences(batch, game, engine)
+            compared += 1
+            if names:
+                mismatches += 1
+                if first is None:
+                    first = (tick, int(game), names)
+
+        # new games for the finished games
+        ended = np.flatnonzero(batch.game_over_status)
+        if ended.size > 0:
+            batch.reset(ended)
+            for game in ended:
+                engines[game] = create_engine(batch, game, rules)
+
+    return (mismatches, compared, int(effects), first)
+
+
+def parse_arguments(arguments=None):
+    """
+    Description:
+        read the command line arguments
+
+    Params:
+        arguments (list): command line arguments, None for sys.argv
+
+    Returns:
+        argparse.Namespace: the arguments
+
+    Tests:
+        1. check if the default sizes are 27x23, 5x5 and 4x3
+    """
+
+    parser = argparse.ArgumentParser(description="Check that the batch engine plays the same games as the engine")
+    parser.add_argument("--games", type=int, default=256, help="number of games in the batch")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks")
+    parser.add_argument("--sizes", default="27x23,5x5,4x3", help="board sizes, e.g. 27x23,5x5")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the batch and the actions")
+    parser.add_argument("--healt-loss", type=float, default=0.5, help="health loss of each tick")
+    parser.add_argument("--effect-interval", type=int, default=250, help="points between two random effects")
+    parser.add_argument("--effect-weights", type=parse_effect_weights, default=(10, 10, 10, 10, 10), help="weights of the 5 random effects")
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    failed = False
+
+    # the same rules for the batch and the engines, like the rules of Tournament.py
+    rules = {
+        "healt_loss": arguments.healt_loss,
+        "random_effect_step": arguments.effect_interval,
+        "effect_weights": arguments.effect_weights,
+    }
+
+    print("board     game ticks  effects  mismatches")
+    for size in arguments.sizes.split(","):
+        width, height = (int(value) for value in size.split("x"))
+        mismatches, compared, effects, first = check(arguments.games, arguments.ticks, width, height, arguments.seed, rules)
+
+        print("{:<9} {:<11} {:<8} {}".format(size, compared, effects, mismatches))
+        if first is not None:
+            failed = True
+            print("          first mismatch: tick {}, game {}, {}".format(*first))
+
+    sys.exit(1 if failed else 0)
@@ -10,14 +10,14 @@
         License : free
 """
 
-import pygame
-import random
 import logging
 
 from pygame.math import Vector2
+from Assets import assets
+from Logger import setup_logging
 
 # Set config for logging
-logging.basicConfig(format='%(asctime)s - %(message)s', filename='logs\\logfile.log', datefmt='%y-%m-%d %H:%M')
+setup_logging()
 
 class Food():
     """
@@ -26,7 +26,7 @@ class Food():
 
     Attributes:
         game: game object
-        randomize: radomizing a position
+        pos: position of the food in the game engine
         x: x coordinate
         y: y coordinate
         food_img: image source for the food object --> cookie image
@@ -47,17 +47,55 @@ class Food():
         try:
             self.game = game
 
-            # set a randomized position -> x and y coordinate
-            self.randomize()
-
-            # preload and transforme image
-            self.food_img = pygame.image.load("Images\Cookie.png")
-            self.food_img = pygame.transform.scale(self.food_img, (self.game.grid_cell_size, self.game.grid_cell_size))
+            # the image is loaded with load_images, the main menu is shown before the loader thread finished
+            self.food_img = None
 
         except Exception as e:
             logging.error("Error occurred while food object creating", exc_info=True)
 
 
+    def load_images(self):
+        """
+        Description:
+            get the image of the food from the asset manager,
+            called by the game after the loader thread finished or before the first game starts
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if food_img has the size of a grid cell after the call
+        """
+
+        try:
+            # preloaded and transformed image of the asset manager
+            self.food_img = assets.image("Cookie.png", (self.game.grid_cell_size, self.game.grid_cell_size))
+
+        except Exception as e:
+            logging.error("Error occurred while loading the food image", exc_info=True)
+
+
+    @property
+    def pos(self):
+        """ the position of the engine food as Vector2 """
+        return Vector2(self.game.engine.position(self.game.engine.food))
+
+
+    @property
+    def x(self):
+        """ x coordinate of the engine food """
+        return self.game.engine.position(self.game.engine.food)[0]
+
+
+    @property
+    def y(self):
+        """ y coordinate of the engine food """
+        return self.game.engine.position(self.game.engine.food)[1]
+
+
     def draw_food(self):
         """
         Description:
@@ -75,7 +113,14 @@ class Food():
         """
 
         try:
-            food_rect = pygame.Rect((self.pos.x * self.game.grid_cell_size), (self.pos.y * self.game.grid_cell_size), self.game.grid_cell_size, self.game.grid_cell_size)
+            # no free cell was left for the food
+            if self.game.engine.food is None:
+                return
+
+            # rect of the food on the screen, None if the camera doesn`t show it
+            food_rect = self.game.cell_rect(self.game.engine.food)
+            if food_rect is None:
+                return
 
             # adding the image to the rect and blit it on the screen
             self.game.game_screen.blit(self.food_img, food_rect)
@@ -87,9 +132,7 @@ class Food():
     def randomize(self):
         """
         Desription:
-            randomize the position (x and y coordinates) of the food object by randomizing two int values
-            x --> random int between the frist grid and the last grid in x direction
-            y --> random int between the frist grid and the last grid in y direction
+            randomize the position of the food object by choosing a random free cell of the game engine
 
         Params:
             none
@@ -102,19 +145,8 @@ class Food():
             2. check if the pos attribute got two coordinates, which change for a new food object
         """
         try:
-            # ramdomize an int for x coordinate
-            self.x = random.randint(1, self.game.grid_cell_count_x)
-
-            # randomize an int for y coordinate
-            self.y = random.randint(1, self.game.grid_cell_count_y)
-
-            # set position to the randomized coordinates
-            self.pos = Vector2(self.x, self.y)
-
-            # check if food is on the position of a snake block, if true, randomize a new position
-            for block in self.game.snake.body:
-                if self.pos == block:
-                    self.randomize()
+            # the engine chooses a cell, which is not on a snake block
+            self.game.engine.randomize_food()
         
         except Exception as e:
             logging.error("Error occurred while generate a randomized position for the object", exc_info=True)
@@ -132,68 +164,13 @@ class Food():
             none
 
         Tests:
-            1. Check if the game.random_effect_status is reset after the function call
-            2. check if a random number was generated and stored in effect_index
-            3. check if the game.random_effec_message changes
+            1. Check if the game.engine.random_effect_status is reset after the function call
+            2. check if the game.engine.random_effect_message changes
         """
 
         try:
-            # if random effect is requested return a random index for a random effect
-            if self.game.random_effect_status == True:
-                self.game.random_effect_status = False
-
-                # generate random index, to choose a ramdom effect
-                effect_index = random.randint( 0, 49)
-
-                if effect_index < 10:
-                    # set health loss up
-                    self.game.healt_loss = 0.75
-
-                    # change the random effect message
-                    self.game.random_effect_message = "Your health - loss increased"
-                    
-                elif effect_index < 20:
-                    # set health loss down
-                    self.game.healt_loss = 0.25
-                    
-                    # change the random effect message
-                    self.game.random_effect_message = "Your health - loss decreased"
-
-                elif effect_index < 30:
-                    # reset health loss
-                    self.game.healt_loss = 0.5
-                    
-                    # lose half of current health
-                    self.game.current_health = self.game.current_health / 2
-
-                    # change the random effect message
-                    self.game.random_effect_message = "Your current health - has been reduced - by half"
-
-                elif effect_index < 40:
-                    # reset health loss
-                    self.game.healt_loss = 0.5
-                    
-                    # set Health to the double
-                    if (self.game.current_health * 2) <= self.game.max_health:
-                        self.game.current_health = self.game.current_health * 2
-                    else:
-                        # set it fix to maximum, so health can`t be greater than 100
-                        self.game.current_health = self.game.max_health
-                    
-                    self.game.random_effect_message = "Your current health - was doubled"
-
-                elif effect_index < 50:
-                    # reset health loss and health regeneration
-                    self.game.healt_loss = 0.5
-
-                    # set the length of the snake to a third --> round it to an integer because the index
-                    length = round(len(self.game.snake.body) / 3)
-                    
-                    # take the first body element until the length element and override the body with them
-                    self.game.snake.body = self.game.snake.body[0:length]
-
-                    self.game.random_effect_message = "The length of your - snake was reduced - by two thirds"
-
+            # the engine checks the random effect status and activates the effect
+            self.game.engine.randomize_effect()
 
         except Exception as e:
             logging.error("Error occurred while activating a random effect", exc_info=True)
\ No newline at end of file
@@ -16,14 +16,22 @@ import logging
 
 from pygame.locals import *
 from pygame.math import Vector2
-from pygame import mixer
+from collections import OrderedDict
 
 from Menu import *  
 from Snake import *
 from Food import *
+from Engine import Engine
+from Assets import assets
+from Audio import audio
+from Profiler import profiler
+from Replay import Replay
+from Autopilot import Autopilot
+from Scheduler import state_running, state_main_menu, state_pause, state_game_over
+from Logger import setup_logging
 
 # Set config for logging
-logging.basicConfig(format='%(asctime)s - %(message)s', filename='logs\\logfile.log', datefmt='%y-%m-%d %H:%M')
+setup_logging()
 
 # set used colors
 darkgrey = (85,85,85)
@@ -31,6 +39,85 @@ black = (0,0,0)
 white = (255, 255, 255)
 red = (255, 0, 0)
 
+# font face of all texts
+font_face = "comicsans"
+
+# event posted by the loader thread, when the sprites, the full size background and the sound are loaded
+assets_loaded_event = pygame.event.custom_type()
+
+# images of the running game, they are loaded by the loader thread while the main menu is shown
+gameplay_images = ("Head.png", "Body.png", "Cookie.png", "Background.png")
+
+# color of the background until the background image is loaded
+loading_color = (30, 30, 40)
+
+# fonts keyed by (face, size) and rendered text surfaces keyed by (text, size, color)
+# the caches live as long as the process, so a new game object keeps the rendered texts
+font_cache = {}
+text_cache = OrderedDict()
+text_cache_size = 128       # maximum number of rendered texts, the least recently used text is removed first
+
+
+def get_font(face, size):
+    """
+    Description:
+        return the font of the face and size, the system font lookup only happens once for each (face, size)
+
+    Params:
+        face (String): name of the system font
+        size (Int): the size of the font
+
+    Returns:
+        pygame.font.Font: the cached font
+
+    Tests:
+        1. Check if two calls with the same face and size return the same font object
+        2. Check if pygame.font.SysFont is only called once for each size
+    """
+
+    key = (face, size)
+    font = font_cache.get(key)
+
+    if font is None:
+        font = pygame.font.SysFont(face, size)
+        font_cache[key] = font
+
+    return font
+
+
+def render_text(text, size, color):
+    """
+    Description:
+        return the rendered text surface, a text is only rendered again if it was removed from the bounded cache
+
+    Params:
+        text (String): the text to render
+        size (Int): the size of the text font
+        color (RGB Tupel ([0-255],[0-255],[0-255])): the color of the text
+
+    Returns:
+        pygame.Surface: the cached text surface
+
+    Tests:
+        1. Check if a static lable like "Highscore:" is rendered once for many calls
+        2. Check if the cache never holds more than text_cache_size surfaces
+    """
+
+    key = (text, size, color)
+    text_surface = text_cache.get(key)
+
+    if text_surface is None:
+        text_surface = get_font(font_face, size).render(text, True, color)
+        text_cache[key] = text_surface
+
+        # remove the least recently used text
+        if len(text_cache) > text_cache_size:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+
+    return text_surface
+
 
 class Game:
     """
@@ -46,16 +133,34 @@ class Game:
         grid_cell_count_x: number of grid_cells in x direction
         grid_cell_count_y: number of gid_cells in y direction
         sound_active: bool, which set sound on or off --> initial set on
-        game_over_status: bool, which indicates the end of the game --> when turns true, the game is over
-        healt_loss: the value, health is decreasing everytime
+        engine: instance of an object of the Engine class, the headless simulation with the game state
+                (game_over_status, healt_loss, max_health, current_health, highscore, random effect values)
+        replay: recording of the seed and the inputs of the current game
+        autopilot: path search, which steers the snake to the food
+        autopilot_active: bool, True if the autopilot steers the snake instead of the player
         health_bar_length: width of the healthbar 
-        max_health: maximum health the snake game has
-        current_health: the current health left on the healthbar
-        highscore: the highscore calculated by current_health and food eaten
         play_area_x: the playarea width for the snake game
         play_area_y: the playarea height for the snake game
+        view_cells_x: number of grid cells in x direction, which are visible in the playarea
+        view_cells_y: number of grid cells in y direction, which are visible in the playarea
+        play_rect: rect of the visible grid cells on the screen, the drawing of the snake is clipped to it
+        camera_x: number of grid cells left of the visible cells, the camera follows the snake head
+        camera_y: number of grid cells above the visible cells
+        camera_margin: minimal distance in cells of the head to the edge of the view, before the camera moves
         game_screen: the displayed window with screen_height x screen_width as size
-        background_img: background image
+        background_img: background image, None until the loader thread loaded it
+        assets_loaded: bool, True if the sprites and the background image are taken from the loader thread
+        background_layer: the static layer, background image with playarea, score block and grid composed once
+        hud_rect: rect of the changing stats (highscore, health and effect message) in the score block
+        profiler_rect: rect of the profiler overlay in the score block below the pause button, it is shown instead of the stats
+        profiler_interval: number of frames between two redraws of the profiler overlay
+        profiler_drawn_frame: frame of the profiler at the last redraw of the overlay
+        full_redraw: bool, which indicates the next frame has to draw the whole screen
+        dirty_cells: set of packed cells changed since the last frame
+        drawn_stats: the stats values of the last drawn stats
+        previous_head: packed cell of the snake head before the last tick
+        previous_tail: packed cell of the snake tail before the last tick
+        interpolation: position between the last tick (0.0) and the next tick (1.0) to draw head and tail
         restart_button_img: "restart" button image
         exit_button_img: "exit" button image
         start_button_img: "play" button image
@@ -63,7 +168,7 @@ class Game:
         pause_button_img: "pause" button image
         sound_on_img: "sound on"  button image
         sound_off_img: "sound off" button image
-        snack_sound: soundfile for snack sound
+        snack_sound: name of the snack sound in the audio manager
         snake: instance of an object of the Snake class
         food: instance of an object of the Food class
         game_over_menu: instance on an object of the Menu class for the game over menu, when the game is over
@@ -76,13 +181,12 @@ class Game:
         button_pause: button object for the "pause" button
         button_sound_on: button object for the "sound on" button
         button_sound_off: button object for the "sound off" button
-
-        random_effect_interval: every 250 Points a random effect appears
-        ramdom_effect_status: flag, if random effect is activated or false
-        random_effect_message: the message displayed for the player at the stats area
+        ui: dispatcher of the mouse events to the buttons of each game state
 
     Params:
         sound_active (bool): displayes if sound is set to on or set to off
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
 
     Returns:
         none
@@ -102,74 +206,95 @@ class Game:
         snack_sound: https://www.soundboard.com/sb/Cookie_Monster_Soundboard  last call: 04.06.2021
     """
 
-    def __init__(self, sound_active):
-        pygame.mixer.pre_init(44100, -16, 2, 512)
-        mixer.init()
-        pygame.init()
+    def __init__(self, sound_active, grid_cell_count_x=27, grid_cell_count_y=23):
+        # only the display and the fonts are needed for the main menu, the mixer is initialised by the loader thread
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Evolving Snake")
 
+        # the gameplay images and the sound are loaded in the background, the first frame doesn`t wait for them
+        self.snack_sound = "snack"
+        self.assets_loaded = False
+        self.background_img = None
+        assets.preload(gameplay_images, self.finish_preload)
+
         # declare constants and references
         self.screen_height = 1000        #window height
         self.screen_width = 1500         #window width
 
         self.grid_cell_size = 40
-        self.grid_cell_count_y = 23       # 23 blocks height - playarea
-        self.grid_cell_count_x = 27       # 27 blocks width  - playarea
+        self.grid_cell_count_y = grid_cell_count_y      # 23 blocks height - playarea
+        self.grid_cell_count_x = grid_cell_count_x      # 27 blocks width  - playarea
 
         self.sound_active = sound_active    # get from the main.py as parameter
-        self.game_over_status = False       # default value --> game running --> True
 
-        self.healt_loss = 0.5               # value of health loss
-        self.health_bar_length = 200        # healthbar width
-        self.max_health = 100               # maximum health 
-        self.current_health = 100           # value of health --> inner healthbar width
+        # headless simulation, holds the game state and the game rules
+        self.engine = Engine(self.grid_cell_count_x, self.grid_cell_count_y)
 
-        self.highscore = 0                  # highscore --> default 0
+        # the inputs of each tick, to simulate the game again
+        self.replay = Replay()
+        self.replay.start(self.engine)
+
+        # the autopilot steers the snake after toggling it with the autopilot key
+        self.autopilot = Autopilot()
+        self.autopilot_active = False
+
+        self.health_bar_length = 200        # healthbar width
 
         self.play_area_x = self.screen_width - 420  # width of the playarea on the screen 
         self.play_area_y = self.screen_height - 80  # height of the playarea on the screen
 
-        self.game_screen = pygame.display.set_mode((self.screen_width, self.screen_height)) # game screen/ window size of pygame 
-
-        self.random_effect_interval= 250    # first random effect at Highscore = 250, than increase by 250 and so on
-        self.random_effect_status = False   # Default False, set to true after reaching 250 Points
-        self.random_effect_message = "No effect"    # Default there is no used effect
+        # the playarea shows 27 x 23 cells, a bigger board is shown by a camera, which follows the head
+        self.view_cells_x = min(self.grid_cell_count_x, self.play_area_x // self.grid_cell_size)
+        self.view_cells_y = min(self.grid_cell_count_y, self.play_area_y // self.grid_cell_size)
+        self.play_rect = pygame.Rect(40, 40, self.view_cells_x * self.grid_cell_size, self.view_cells_y * self.grid_cell_size)
+        self.camera_margin = 4
+        self.camera_x = 0
+        self.camera_y = 0
+        self.update_camera()
+
+        # game screen/ window size of pygame, a restart keeps the window of the last game
+        self.game_screen = pygame.display.get_surface()
+        if self.game_screen is None or self.game_screen.get_size() != (self.screen_width, self.screen_height):
+            self.game_screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+
+        # dirty rendering: only the changed cells and stats are drawn, as long as no full redraw is needed
+        self.hud_rect = pygame.Rect(self.screen_width - 340, 190, 300, 380)
+        # the overlay starts below the pause button, a redraw of the overlay must not cover the button
+        self.profiler_rect = pygame.Rect(self.screen_width - 340, 190, 300, 450)
+        self.profiler_interval = 30
+        self.profiler_drawn_frame = 0
+        self.full_redraw = True
+        self.dirty_cells = set()
+        self.drawn_stats = None
+
+        # render interpolation between the last two ticks
+        self.previous_head = self.engine.body[0]
+        self.previous_tail = self.engine.body[-1]
+        self.interpolation = 0.0
 
         # try load local data
         try:
-            # load Images:
-            self.background_img = pygame.image.load("Images\Background.png")
-            self.restart_button_img = pygame.image.load("Images\\restart_btn.png")  
-            self.exit_button_img = pygame.image.load("Images\exit_btn.png")         
-            self.start_button_img = pygame.image.load("Images\start_btn.png")       
-            self.resume_button_img = pygame.image.load("Images\\resume_btn.png")    
-            self.pause_button_img = pygame.image.load("Images\pause.png")           
-            
-            self.sound_on_img = pygame.image.load("Images\sound_on.png")
-            self.sound_off_img = pygame.image.load("Images\sound_off.png")
-
-            self.controle_img = pygame.image.load("Images\\Controls.png")
+            # load Images from the asset manager, each image is loaded, converted and scaled once per process
+            button_size = (self.grid_cell_size * 5, self.grid_cell_size * 2)
 
+            self.restart_button_img = assets.image("Restart_btn.png", button_size)
+            self.exit_button_img = assets.image("Exit_btn.png", button_size)
+            self.start_button_img = assets.image("Start_btn.png", button_size)
+            self.resume_button_img = assets.image("Resume_btn.png", button_size)
+            self.pause_button_img = assets.image("Pause.png", button_size)
 
-            # Transform images to scale them to the expected size
-            self.background_img = pygame.transform.scale(self.background_img, (self.screen_width, self.screen_height))
-            self.restart_button_img = pygame.transform.scale(self.restart_button_img, (self.grid_cell_size * 5, self.grid_cell_size *2))
-            self.exit_button_img = pygame.transform.scale(self.exit_button_img, (self.grid_cell_size * 5, self.grid_cell_size *2))
-            self.start_button_img = pygame.transform.scale(self.start_button_img, (self.grid_cell_size * 5, self.grid_cell_size *2))
-            self.resume_button_img = pygame.transform.scale(self.resume_button_img, (self.grid_cell_size * 5, self.grid_cell_size *2))
-            self.pause_button_img = pygame.transform.scale(self.pause_button_img, (self.grid_cell_size * 5, self.grid_cell_size *2))
+            self.sound_off_img = assets.image("Sound_off.png", button_size)
+            self.sound_on_img = assets.image("Sound_on.png", button_size)
 
-            self.sound_off_img = pygame.transform.scale(self.sound_off_img, (self.grid_cell_size * 5, self.grid_cell_size * 2))
-            self.sound_on_img = pygame.transform.scale(self.sound_on_img, (self.grid_cell_size * 5, self.grid_cell_size * 2))
+            self.control_img = assets.image("Controls.png", (280, 100))
 
-            self.control_img =  pygame.transform.scale(self.controle_img, (280, 100))
-
-            # load Sound:
-            self.snack_sound = pygame.mixer.Sound("Sounds\EatingSound.wav")
-            
             # call function to set the sound to the expected status: on or off
             self.sound_volume()
 
+            # compose the static layer once
+            self.build_background()
+
         except Exception as e:
             logging.error("Error occurred while loading extern files", exc_info=True)
 
@@ -195,10 +320,120 @@ class Game:
             self.button_sound_on    = Menu_Button(self.screen_width - 290, self.screen_height - 320, self.sound_on_img,  self.game_screen)
             self.button_sound_off   = Menu_Button(self.screen_width - 290, self.screen_height - 320, self.sound_off_img, self.game_screen)
 
+            # only one of the sound buttons is shown on the same position
+            self.button_sound_on.show(self.sound_active)
+            self.button_sound_off.show(not self.sound_active)
+
+            # register the buttons for the game states, in which they can be clicked
+            self.ui = UI_Dispatcher()
+            self.ui.register(self.button_start, state_main_menu)
+            self.ui.register(self.button_resume, state_pause)
+            self.ui.register(self.button_restart, state_pause, state_game_over)
+            self.ui.register(self.button_exit, state_main_menu, state_pause, state_game_over)
+            self.ui.register(self.button_pause, state_running)
+            self.ui.register(self.button_sound_on, state_running, state_main_menu, state_pause, state_game_over)
+            self.ui.register(self.button_sound_off, state_running, state_main_menu, state_pause, state_game_over)
+
         except Exception as e:
             logging.error("Error occurred while trying to create object instances", exc_info=True)
 
 
+    def finish_preload(self):
+        """
+        Description:
+            load the sound and post the assets_loaded_event, called by the loader thread after the images are loaded
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the assets_loaded_event is in the event queue after the loader thread finished
+        """
+
+        # the sound is loaded once per process and played on the channel pool of the audio manager
+        audio.load(self.snack_sound, "EatingSound.wav", 0.25, priority=1)
+
+        pygame.event.post(pygame.event.Event(assets_loaded_event))
+
+
+    def load_assets(self):
+        """
+        Description:
+            take the loaded gameplay images: the sprites of snake and food and the full size background,
+            called after the assets_loaded_event and before a game starts, it waits for the loader thread if needed
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the background layer shows the background image after the call
+            2. check if a second call doesn`t build the background layer again
+        """
+
+        if self.assets_loaded:
+            return
+
+        try:
+            self.background_img = assets.image("Background.png", (self.screen_width, self.screen_height), alpha=False)
+            self.snake.load_images()
+            self.food.load_images()
+
+            # the static layer with the background image, the whole screen is drawn with the next frame
+            self.build_background()
+            self.full_redraw = True
+            self.assets_loaded = True
+
+        except Exception as e:
+            logging.error("Error occurred while loading the gameplay images", exc_info=True)
+
+
+    def reset(self):
+        """
+        Description:
+            restart the game in place: the gameplay state is set back to the initial values,
+            the window, images, menus and buttons of the game object are kept
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if health, highscore, effect message and snake body have theire initial values after function call
+            2. check if the button objects are the same objects as before the function call
+        """
+
+        try:
+            # the sprites are needed for the game
+            self.load_assets()
+
+            # body, direction, health, health loss, highscore, random effect values and food
+            self.engine.reset()
+            self.replay.start(self.engine)
+            self.autopilot.reset()
+
+            # the whole screen is drawn with the next frame
+            self.full_redraw = True
+            self.dirty_cells.clear()
+            self.drawn_stats = None
+
+            self.previous_head = self.engine.body[0]
+            self.previous_tail = self.engine.body[-1]
+            self.interpolation = 0.0
+
+            self.update_camera()
+
+        except Exception as e:
+            logging.error("Error occurred while resetting the game", exc_info=True)
+
+
     def update(self):
         """
         Description:
@@ -218,9 +453,36 @@ class Game:
             2. check if game still runs after check_collision function call -> game over or game still running
         """
         try:
+            engine = self.engine
+
+            # remember head, tail and food before the tick, these cells are changed by the tick
+            head = engine.body[0]
+            tail = engine.body[-1]
+            length = len(engine.body)
+            food = engine.food
+
             self.snake.move_snake()
             self.check_snack()
             self.check_collision()
+
+            # head and tail are drawn between the cells before and after this tick
+            # the cells of the tick before still show parts of the sprites
+            self.dirty_cells.update((self.previous_head, self.previous_tail))
+            self.previous_head = head
+            self.previous_tail = tail
+
+            if len(engine.body) < length:
+                # the snake was shortened by an effect --> the removed blocks are not known anymore
+                self.full_redraw = True
+                self.previous_tail = engine.body[-1]
+            else:
+                self.dirty_cells.update((head, tail, engine.body[0]))
+                if food != engine.food:
+                    self.dirty_cells.update((food, engine.food))
+
+            # the camera follows the head, a moved camera shows other cells --> draw the whole screen
+            if self.update_camera():
+                self.full_redraw = True
         
         except Exception as e:
             logging.error("Error occurred when the display update functions where called", exc_info=True)
@@ -243,39 +505,10 @@ class Game:
             2. Check if the food is displayed, with a new position on the playarea
         """
         try:
-            # food position is snakes head position
-            if self.food.pos == self.snake.body[0]:
-                # play sound
-                self.snack_sound.play()
-                
-                # generate new food position
-                self.food.randomize()
-
-                # indicate to add a new blcok
-                self.snake.new_block = True
-                
-                # Increas Highscore 
-                if self.current_health <= 25:
-                    self.highscore += 75
-                elif self.current_health <= 50:
-                    self.highscore += 50
-                else:
-                    self.highscore += 25
-
-                # Regenerate Health
-                if self.current_health <= 90:
-                    self.current_health += 10
-                else:
-                    self.current_health = 100
-
-                # Call a random effect
-                if self.highscore >= self.random_effect_interval:
-                    self.random_effect_status = True
-                    self.random_effect_interval += 250
-
-                    # fucntion call
-                    self.food.randomize_effect()
-
+            # the engine checks the food position, highscore, health and random effects
+            if self.engine.check_snack():
+                # play sound, nothing is done while the sound is off
+                audio.play(self.snack_sound)
 
         except Exception as e:
             logging.error("Error occurred after snake ate food", exc_info=True)
@@ -298,12 +531,8 @@ class Game:
         """
 
         try:
-            # while the game is running, decrease the health every 150 ms 
-            if self.current_health > 0:
-                self.current_health -= self.healt_loss
-            # when health is 0 --> end the game
-            else:
-                self.game_over()
+            # while the game is running, decrease the health every 150 ms, when health is 0 --> end the game
+            self.engine.update_health()
 
         except Exception as e:
             logging.error("Error occurred while trying to update health", exc_info=True)
@@ -326,15 +555,8 @@ class Game:
             2. Check, the snake head crashes the snake body will end the game and the game over screen appears
         """
         try:    
-            # check collision between snake head and field boundaries
-            if not 1 <= self.snake.body[0].x <= self.grid_cell_count_x or not 1 <= self.snake.body[0].y <= self.grid_cell_count_y: 
-                self.game_over()
-
-            # for each body block from 1 to n
-            for block in self.snake.body[1:]:
-                # head = (body[0]), check collision between body block and head
-                if block == self.snake.body[0]:
-                    self.game_over()
+            # check collision between snake head and field boundaries or the snake body
+            self.engine.check_collision()
 
         except Exception as e:
             logging.error("Error occurred when a snake collision was detected", exc_info=True)
@@ -356,16 +578,33 @@ class Game:
             2. Check the direction of the snake after function call, this should be changed from (1,0)/(0,1)/(-1,0)/(0,-1) to (0,0)
         """
         try:
-            # set direction vector to (0,0) so the snake stops moving
-            self.snake.direction = Vector2(0,0)
-
-            # change the game status, to indicate the end of the game
-            self.game_over_status = True
+            # set direction to (0,0) so the snake stops moving and change the game status
+            self.engine.game_over()
         
         except Exception as e:
             logging.error("Error occurred when game over was detected", exc_info=True)
 
 
+    def save_replay(self):
+        """
+        Description:
+            save the replay of the current game with its highscore, e.g. after game over or a crash
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the saved replay is valid after game over
+            2. check if the replay file is written again after the next game
+        """
+
+        self.replay.highscore = self.engine.highscore
+        self.replay.save()
+
+
     def game_quit(self):
         """
         Description:
@@ -395,6 +634,7 @@ class Game:
         """
         Description:
             drawing individual text and it`s size and color to the game_screen with individual coordinates
+            the rendered text comes from the text cache
 
         Params:
             text (String): the given text to display
@@ -412,9 +652,8 @@ class Game:
         """
 
         try:
-            # font settings
-            font = pygame.font.SysFont("comicsans", size)
-            text_surface = font.render(text, True, color)
+            # cached font and text surface, only a new text is rendered
+            text_surface = render_text(text, size, color)
 
             #get the size of the rect, for the given text
             text_rect = text_surface.get_rect()
@@ -429,10 +668,11 @@ class Game:
             logging.error("Error occurred while trying to display text on the screen", exc_info=True)
 
 
-    def draw_elements(self):
+    def build_background(self):
         """ 
         Description:
-            This method draws all fix objects on the screen, including the background image and the playarea and the grid of the playarea
+            This method composes all fix objects once into the background layer, including the background image and the playarea and the grid of the playarea
+            The layer is cached by the asset manager, so a new game object gets the layer without composing it again
 
         Params:
             none
@@ -441,8 +681,8 @@ class Game:
             none
 
         Tests:
-            1. Check if the window has a backgoundimage
-            2. Check if the Game shows an transparent area on the background, with a black grid on it
+            1. Check if the background layer has the size of the window
+            2. Check if the background layer shows an transparent area on the background, with a black grid on it
 
 
         Inspiration Source:
@@ -450,38 +690,324 @@ class Game:
         """
 
         try:
-            # Backgroundimage 
-            self.game_screen.blit(self.background_img, (0,0))
-
-            # Background for the playarea
-            play_area = pygame.Surface((self.play_area_x, self.play_area_y))
-            # set transparency value
-            play_area.set_alpha(230)
-            play_area.fill(darkgrey)
-            self.game_screen.blit(play_area, (40, 40))
-
-            # The Stats on the right block
-            score_block = pygame.Surface((300, self.screen_height-80))
-            # set transparency value
-            score_block.set_alpha(200)
-            score_block.fill(black)
-            self.game_screen.blit(score_block, (self.screen_width-340, 40))
-
-            # Draw grid for play area
-            i = 1
-            while i <= self.grid_cell_count_x +1:    # draw vertical lines
-                pygame.draw.line(self.game_screen, black, (self.grid_cell_size* i ,self.screen_height-40),(self.grid_cell_size* i, 40))
-                i += 1
-
-            i = 1
-            while i <= self.grid_cell_count_y +1:    # draw horizontal lines 
-                pygame.draw.line(self.game_screen, black, (40 ,self.grid_cell_size * i),(self.screen_width- 380, self.grid_cell_size * i))
-                i += 1
+            key = ("background_layer", self.screen_width, self.screen_height, self.grid_cell_size, self.view_cells_x, self.view_cells_y, self.background_img is not None)
+            self.background_layer = assets.surface(key, self.compose_background)
+
+        except Exception as e:
+            logging.error("Error occurred while building the background", exc_info=True)
+
+
+    def compose_background(self):
+        """ 
+        Description:
+            compose the background image, the playarea, the score block and the grid of the playarea into one surface
+
+        Params:
+            none
+
+        Returns: 
+            pygame.Surface: the composed background layer
+
+        Tests:
+            1. Check if the returned surface has the size of the window
+        """
+
+        background_layer = pygame.Surface((self.screen_width, self.screen_height)).convert()
+
+        # Backgroundimage, a plain color until the loader thread loaded the image
+        if self.background_img is not None:
+            background_layer.blit(self.background_img, (0,0))
+        else:
+            background_layer.fill(loading_color)
+
+        # Background for the playarea
+        play_area = pygame.Surface((self.play_area_x, self.play_area_y))
+        # set transparency value
+        play_area.set_alpha(230)
+        play_area.fill(darkgrey)
+        background_layer.blit(play_area, (40, 40))
+
+        # The Stats on the right block
+        score_block = pygame.Surface((300, self.screen_height-80))
+        # set transparency value
+        score_block.set_alpha(200)
+        score_block.fill(black)
+        background_layer.blit(score_block, (self.screen_width-340, 40))
+
+        # Draw grid for play area, only for the visible cells --> the camera moves by whole cells, so the grid stays the same
+        i = 0
+        while i <= self.view_cells_x:    # draw vertical lines
+            pygame.draw.line(background_layer, black, (self.play_rect.x + self.grid_cell_size * i, self.play_rect.bottom), (self.play_rect.x + self.grid_cell_size * i, self.play_rect.y))
+            i += 1
+
+        i = 0
+        while i <= self.view_cells_y:    # draw horizontal lines 
+            pygame.draw.line(background_layer, black, (self.play_rect.x, self.play_rect.y + self.grid_cell_size * i), (self.play_rect.right, self.play_rect.y + self.grid_cell_size * i))
+            i += 1
+
+        return background_layer
+
+
+    def draw_elements(self):
+        """ 
+        Description:
+            This method draws the static background layer on the screen
+
+        Params:
+            none
+
+        Returns: 
+            none
+
+        Tests:
+            1. Check if the window has a backgoundimage
+            2. Check if the Game shows an transparent area on the background, with a black grid on it
+        """
+
+        try:
+            self.game_screen.blit(self.background_layer, (0,0))
 
         except Exception as e:
             logging.error("Error occurred while drawing the background", exc_info=True)
 
 
+    def update_camera(self):
+        """ 
+        Description:
+            move the camera, when the head comes closer than camera_margin cells to the edge of the view,
+            the head is centered in the view again, but the view never leaves the board
+
+        Params:
+            none
+
+        Returns: 
+            bool: True if the camera moved
+
+        Tests:
+            1. Check if the camera doesn`t move on a board, which fits into the playarea
+            2. Check if the head is always visible on a board of 1000 x 1000 cells
+        """
+
+        head_y, head_x = divmod(self.engine.body[0], self.engine.stride)
+
+        camera_x = self.follow(head_x, self.camera_x, self.view_cells_x, self.grid_cell_count_x)
+        camera_y = self.follow(head_y, self.camera_y, self.view_cells_y, self.grid_cell_count_y)
+
+        if camera_x == self.camera_x and camera_y == self.camera_y:
+            return False
+
+        self.camera_x = camera_x
+        self.camera_y = camera_y
+        return True
+
+
+    def follow(self, head, camera, view_cells, cell_count):
+        """ 
+        Description:
+            return the new camera position in one direction
+
+        Params:
+            head (int): grid coordinate of the head
+            camera (int): current camera position
+            view_cells (int): number of visible cells
+            cell_count (int): number of cells of the board
+
+        Returns: 
+            int: the new camera position
+
+        Tests:
+            1. Check if the camera stays, while the head is inside of the margin
+        """
+
+        position = head - camera
+        if position <= self.camera_margin or position > view_cells - self.camera_margin:
+            camera = head - (view_cells + 1) // 2
+
+        return max(0, min(camera, cell_count - view_cells))
+
+
+    def cell_rect(self, cell):
+        """ 
+        Description:
+            return the rect of a grid cell on the screen, if the cell is visible
+
+        Params:
+            cell (int): packed cell of the game engine
+
+        Returns: 
+            pygame.Rect: the rect of the cell, None if the cell is outside of the view
+
+        Tests:
+            1. Check if the cell (1, 1) has the rect (40, 40, 40, 40) without camera movement
+            2. Check if a cell outside of the view returns None
+        """
+
+        y, x = divmod(cell, self.engine.stride)
+        x -= self.camera_x
+        y -= self.camera_y
+
+        if 1 <= x <= self.view_cells_x and 1 <= y <= self.view_cells_y:
+            return pygame.Rect(self.play_rect.x + (x - 1) * self.grid_cell_size, self.play_rect.y + (y - 1) * self.grid_cell_size, self.grid_cell_size, self.grid_cell_size)
+
+        return None
+
+
+    def draw_cell(self, cell):
+        """ 
+        Description:
+            Redraws one grid cell: the background of the cell and the snake block or food on it
+            the head is not drawn, it is drawn between two cells by draw_motion
+
+        Params:
+            cell (int): packed cell of the game engine
+
+        Returns: 
+            pygame.Rect: the rect of the redrawn cell on the screen, None if the cell is not visible
+
+        Tests:
+            1. Check if a cell left by the snake only shows the background after function call
+            2. Check if the body image is drawn on the cell of a body block
+        """
+
+        engine = self.engine
+        cell_rect = self.cell_rect(cell)
+
+        if cell_rect is None:
+            return None
+
+        # restore the static background of the cell
+        self.game_screen.blit(self.background_layer, cell_rect, cell_rect)
+
+        if cell != engine.body[0] and engine.grid[cell] > 0:
+            self.game_screen.blit(self.snake.body_img, cell_rect)
+
+        if cell == engine.food:
+            self.game_screen.blit(self.food.food_img, cell_rect)
+
+        return cell_rect
+
+
+    def draw_sprite(self, image, start_cell, end_cell):
+        """ 
+        Description:
+            Draws an image between two cells, at the position of the interpolation, clipped to the visible playarea
+
+        Params:
+            image (pygame.Surface): the image to draw
+            start_cell (int): packed cell at interpolation 0.0
+            end_cell (int): packed cell at interpolation 1.0
+
+        Returns: 
+            none
+
+        Tests:
+            1. Check if the image is drawn in the middle of both cells with an interpolation of 0.5
+        """
+
+        start_y, start_x = divmod(start_cell, self.engine.stride)
+        end_y, end_x = divmod(end_cell, self.engine.stride)
+
+        # grid position relative to the camera
+        x = start_x + (end_x - start_x) * self.interpolation - self.camera_x - 1
+        y = start_y + (end_y - start_y) * self.interpolation - self.camera_y - 1
+
+        # only inside of the visible playarea
+        self.game_screen.set_clip(self.play_rect)
+        self.game_screen.blit(image, (self.play_rect.x + round(x * self.grid_cell_size), self.play_rect.y + round(y * self.grid_cell_size)))
+        self.game_screen.set_clip(None)
+
+
+    def draw_motion(self):
+        """ 
+        Description:
+            Redraws the dirty cells and the cells of head and tail before and after the last tick,
+            then draws the head and the tail between theire cells at the current interpolation
+
+        Params:
+            none
+
+        Returns: 
+            list: rects of the redrawn cells
+
+        Tests:
+            1. Check if the head is drawn on the cell before the last tick with an interpolation of 0.0
+            2. Check if no old head image stays on the screen after some frames
+        """
+
+        engine = self.engine
+        head = engine.body[0]
+        tail = engine.body[-1]
+
+        self.dirty_cells.update((self.previous_head, head, self.previous_tail, tail))
+
+        dirty_rects = []
+        for cell in self.dirty_cells:
+            if cell is not None:
+                cell_rect = self.draw_cell(cell)
+
+                # only the visible cells are drawn
+                if cell_rect is not None:
+                    dirty_rects.append(cell_rect)
+        self.dirty_cells.clear()
+
+        # the tail block slides out of the cell it left, the head slides into the new cell
+        if self.previous_tail != tail:
+            self.draw_sprite(self.snake.body_img, self.previous_tail, tail)
+        self.draw_sprite(self.snake.head_image(), self.previous_head, head)
+
+        return dirty_rects
+
+
+    def draw_changes(self):
+        """ 
+        Description:
+            Draws only the cells changed by the last ticks and the stats if theire values changed
+            If a full redraw is needed, nothing is drawn and the caller has to draw and flip the whole screen
+
+        Params:
+            none
+
+        Returns: 
+            list: rects for pygame.display.update, None if the whole display has to be updated
+
+        Tests:
+            1. Check if only the old tail, the old head and the new head are returned after a tick without food
+            2. Check if an empty list is returned, when nothing has changed
+        """
+
+        try:
+            if self.full_redraw:
+                # the caller draws the whole screen
+                self.full_redraw = False
+                self.dirty_cells.clear()
+                return None
+
+            # changed cells and the moving head and tail
+            dirty_rects = self.draw_motion()
+
+            # redraw the buttons only if they changed, e.g. the sound button after a click
+            dirty_rects.extend(self.ui.draw_changes(state_running, self.background_layer))
+
+            # the profiler overlay is shown instead of the stats, it is drawn again a few times per second
+            if profiler.overlay_active:
+                if profiler.frame_count - self.profiler_drawn_frame >= self.profiler_interval:
+                    self.draw_profiler()
+                    dirty_rects.append(self.profiler_rect)
+
+            # redraw the stats only if the values changed
+            elif self.drawn_stats != (self.engine.highscore, self.engine.current_health, self.engine.random_effect_message, self.autopilot_active):
+                self.game_screen.blit(self.background_layer, self.hud_rect, self.hud_rect)
+                self.draw_hud()
+                dirty_rects.append(self.hud_rect)
+
+            return dirty_rects
+
+        except Exception as e:
+            logging.error("Error occurred while drawing the changes on the screen", exc_info=True)
+            self.full_redraw = True
+            return None
+
+
     def draw_stats(self):
         """
         Description:
@@ -507,42 +1033,152 @@ class Game:
         """
 
         try:
+            # draw the changing stats or the profiler overlay
+            if profiler.overlay_active:
+                self.draw_profiler()
+            else:
+                self.draw_hud()
+
+            # draw text methode
+            self.draw_text("Sound on/off:", 34, self.play_area_x + 230, self.screen_height - 340, white)
+            
+            # draw text methode
+            self.draw_text("Controls:", 34, self.play_area_x + 230, self.screen_height - 180, white)
+            
+            # create rect and set position to blit control_img into it
+            control_rect = pygame.Rect(1170, self.screen_height - 150, 280, 100)
+            self.game_screen.blit(self.control_img, control_rect)
+            
+
+        except Exception as e:
+            logging.error("Error occurred while drawing gamestats on the screen", exc_info=True)
+
+
+    def draw_hud(self):
+        """
+        Description:
+            Drawing the changing stats inside of the hud_rect:
+            - the Highscore display 
+            - the health display
+            - the effect message
+            - the autopilot status
+            to the game_screen
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Check if the highscore value is printed below the lable "Highscore"
+            2. Check if the healthbare with a white border is printed to stats area
+        """
+
+        try:
+            self.drawn_stats = (self.engine.highscore, self.engine.current_health, self.engine.random_effect_message, self.autopilot_active)
+
             # draw text methode 
             self.draw_text("Highscore:", 40, self.play_area_x + 230, 220, white)
-            self.draw_text(str(self.highscore), 40, self.play_area_x + 230, 250, white)
+            self.draw_text(str(self.engine.highscore), 40, self.play_area_x + 230, 250, white)
 
             # parse int to string
-            tempstr = str(round(self.current_health))
+            tempstr = str(round(self.engine.current_health))
 
             # draw text methode --> current health
             self.draw_text("Health: " + tempstr + "/100", 40, self.play_area_x + 230, 320,white)
 
             # drawing inner rect for the healthbar
-            pygame.draw.rect(self.game_screen, (255, 255, 0), (self.play_area_x + 130, 350, self.current_health * 2, 20))
+            pygame.draw.rect(self.game_screen, (255, 255, 0), (self.play_area_x + 130, 350, self.engine.current_health * 2, 20))
             
             # drawing outline for the healthbar with the parameter 2 at the end of the draw.rect 
-            pygame.draw.rect(self.game_screen, (255, 255, 255), (self.play_area_x + 130, 350, self.max_health * 2, 20), 2)
+            pygame.draw.rect(self.game_screen, (255, 255, 255), (self.play_area_x + 130, 350, self.engine.max_health * 2, 20), 2)
 
             # draw text methode --> effect message
-            message = self.random_effect_message.split("-")
+            message = self.engine.random_effect_message.split("-")
             height = 420
             for msg in message:
                 self.draw_text(msg, 40, self.play_area_x + 230, height, (255,255,0))
                 height += 40
 
-            # draw text methode
-            self.draw_text("Sound on/off:", 34, self.play_area_x + 230, self.screen_height - 340, white)
-            
-            # draw text methode
-            self.draw_text("Controls:", 34, self.play_area_x + 230, self.screen_height - 180, white)
-            
-            # create rect and set position to blit control_img into it
-            control_rect = pygame.Rect(1170, self.screen_height - 150, 280, 100)
-            self.game_screen.blit(self.control_img, control_rect)
-            
+            # draw text methode --> autopilot status
+            if self.autopilot_active == True:
+                self.draw_text("Autopilot", 30, self.play_area_x + 230, 550, white)
 
         except Exception as e:
-            logging.error("Error occurred while drawing gamestats on the screen", exc_info=True)
+            logging.error("Error occurred while drawing the changing gamestats on the screen", exc_info=True)
+
+
+    def draw_profiler(self):
+        """
+        Description:
+            Drawing the profiler overlay inside of the profiler_rect:
+            - the 50th, 95th and 99th percentile in ms of the busy frame time and of each phase
+            - the number of slow frames and the slowest phase of the last slow frame
+            The numbers change each frame, so they are rendered without the text cache
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Check if the frame line is the first line below the header
+            2. Check if the last line shows the slowest phase after a slow frame
+        """
+
+        try:
+            self.profiler_drawn_frame = profiler.frame_count
+            self.game_screen.blit(self.background_layer, self.profiler_rect, self.profiler_rect)
+
+            font = get_font(font_face, 22)
+            x = self.profiler_rect.x + 10
+            y = self.profiler_rect.y + 10
+
+            # header and one line of each phase, the values are right aligned in three columns
+            lines = [("phase", "p50", "p95", "p99")]
+            for name, p50, p95, p99 in profiler.report():
+                lines.append((name, "{:.2f}".format(p50), "{:.2f}".format(p95), "{:.2f}".format(p99)))
+
+            for line in lines:
+                color = (255, 255, 0) if line[0] == "frame" else white
+                self.game_screen.blit(font.render(line[0], True, color), (x, y))
+
+                for column, value in enumerate(line[1:]):
+                    text_surface = font.render(value, True, color)
+                    self.game_screen.blit(text_surface, (x + 165 + column * 60 - text_surface.get_width(), y))
+                y += 24
+
+            # the slowest phase of the last frame over the budget
+            y += 12
+            self.game_screen.blit(font.render("slow frames: {}".format(profiler.slow_frames), True, white), (x, y))
+            if profiler.last_slow is not None:
+                frame, busy, phase, phase_time = profiler.last_slow
+                text = "last: {:.1f} ms, {} {:.1f} ms".format(busy, phase, phase_time)
+                self.game_screen.blit(font.render(text, True, red), (x, y + 24))
+
+        except Exception as e:
+            logging.error("Error occurred while drawing the profiler overlay", exc_info=True)
+
+
+    def toggle_profiler(self):
+        """
+        Description:
+            show or hide the profiler overlay, the score block is drawn again in the next frame
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. Check if the stats are shown again after toggling the overlay twice
+        """
+
+        profiler.overlay_active = not profiler.overlay_active
+        self.full_redraw = True
 
 
     def sound_volume(self):
@@ -558,16 +1194,12 @@ class Game:
 
         Tests:
             1. sound_active = true  -> Check if the volume is on and sound is played, when food is eaten
-            2. sound_active is not true -> Check if the volume of the sound is set to 0
+            2. sound_active is not true -> Check if no sound is played, when food is eaten
         """
 
         try:
-            if self.sound_active:
-                # change sound volume to 0.25 --> game sound is on
-                self.snack_sound.set_volume(0.25)
-            else: 
-                # change sound volumen to 0 --> game sound is off
-                self.snack_sound.set_volume(0.0)
+            # a muted audio manager skips the playback, the volume of the sounds is kept
+            audio.set_muted(not self.sound_active)
         
         except Exception as e:
             logging.error("Error occurred by changing sound volumen", exc_info=True)
\ No newline at end of file
@@ -0,0 +1,304 @@
+""" Python Evolving Snake game
+
+    Description:
+        Logger file configures the logging of all modules once per process:
+        the records are put into a queue and written to logs/logfile.log by a background thread,
+        a repeating error of the same line is only written once in an interval and counted
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# the logfile is found relative to this file, independent of the working directory and the operating system
+log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "logfile.log")
+
+# format of the records in the logfile
+log_format = '%(asctime)s - %(message)s'
+log_date_format = '%y-%m-%d %H:%M'
+
+# seconds, in which the same message of the same line is only written once
+log_interval = 10.0
+
+# the listener of the process, None until setup_logging is called
+log_listener = None
+
+
+class Rate_Limit_Filter(logging.Filter):
+    """
+    Description:
+        Lets only the first record of a call site and message pass in each interval, the others are counted
+        The call site is the file and line of the logging call, so a loop of the same error costs only a dict lookup
+        The next record of the call site after the interval gets the number of the suppressed records appended
+
+    Attributes:
+        interval: seconds, in which a call site and message is only logged once
+        sites: dict (file, line, message) --> [time of the last written record, suppressed records]
+        counts: dict (file, line, message) --> number of all records, written with the suppressed records at the exit
+
+    Params:
+        interval (float): seconds, in which a call site and message is only logged once --> default log_interval
+
+    Tests:
+        1. check if 60 errors of the same line in one second write one record
+        2. check if the record after the interval contains "suppressed 59"
+    """
+
+    def __init__(self, interval=log_interval):
+        super().__init__()
+        self.interval = interval
+        self.sites = {}
+        self.counts = {}
+
+
+    def filter(self, record):
+        """
+        Description:
+            decide if the record is written, called by the handler in the thread of the logging call
+
+        Params:
+            record (logging.LogRecord): the record
+
+        Returns:
+            bool: True if the record is written
+
+        Tests:
+            1. check if a record of an other line passes directly after a suppressed record
+        """
+
+        key = (record.pathname, record.lineno, record.msg)
+        now = time.monotonic()
+
+        self.counts[key] = self.counts.get(key, 0) + 1
+        site = self.sites.get(key)
+
+        if site is None:
+            self.sites[key] = [now, 0]
+            return True
+
+        if now - site[0] < self.interval:
+            site[1] += 1
+            return False
+
+        # the first record after the interval, with the number of the dropped records
+        if site[1] > 0:
+            record.msg = "{} (suppressed {} similar messages)".format(record.msg, site[1])
+        site[0] = now
+        site[1] = 0
+        return True
+
+
+    def suppressed(self):
+        """
+        Description:
+            return the call sites with suppressed records, which were not reported by a later record,
+            the suppressed records are reset, so each record is only reported once
+
+        Params:
+            none
+
+        Returns:
+            list: (file, line, message, suppressed records, all records) of each call site
+
+        Tests:
+            1. check if the list is empty after a record of each call site passed the filter after the interval
+            2. check if a second call returns an empty list
+        """
+
+        suppressed = []
+        for key, site in self.sites.items():
+            if site[1] > 0:
+                suppressed.append(key + (site[1], self.counts[key]))
+                site[1] = 0
+
+        return suppressed
+
+
+class Deferred_Queue_Handler(logging.handlers.QueueHandler):
+    """
+    Description:
+        Queue handler, which puts the record into the queue without formatting it,
+        the message and the traceback are formatted by the writer thread and not in the game loop
+
+    Attributes:
+        queue: the queue of the records
+
+    Params:
+        queue (queue.SimpleQueue): the queue of the records
+
+    Tests:
+        1. check if logging.error(..., exc_info=True) doesn`t format the traceback in the calling thread
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def report_suppressed(queue_handler, rate_limit):
+    """
+    Description:
+        write the number of the suppressed and of all records of each call site, called at the exit of the process
+        the records are put into the queue directly, they don`t pass the rate limit filter
+
+    Params:
+        queue_handler (Deferred_Queue_Handler): the handler of the root logger
+        rate_limit (Rate_Limit_Filter): the filter of the queue handler
+
+    Returns:
+        none
+
+    Tests:
+        1. check if the logfile contains the suppressed records of a call site after the exit
+    """
+
+    for pathname, lineno, msg, count, total in rate_limit.suppressed():
+        queue_handler.enqueue(logging.makeLogRecord({
+            "msg": "{} ({}:{}, suppressed {} of {} similar messages)".format(msg, os.path.basename(pathname), lineno, count, total),
+            "levelno": logging.ERROR,
+            "levelname": "ERROR",
+        }))
+
+
+def stop_logging():
+    """
+    Description:
+        write all queued records and stop the writer thread
+
+    Params:
+        none
+
+    Returns:
+        none
+
+    Tests:
+        1. check if a record logged directly before the call is in the logfile
+    """
+
+    global log_listener
+
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+
+def restart_after_fork():
+    """
+    Description:
+        configure the logging again in a forked child process, e.g. a worker of the tournament,
+        the writer thread of the parent process doesn`t exist in the child
+
+    Params:
+        none
+
+    Returns:
+        none
+
+    Tests:
+        1. check if an error of a tournament worker is written into the logfile
+    """
+
+    global log_listener
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, Deferred_Queue_Handler):
+            root.removeHandler(handler)
+
+    log_listener = None
+    setup_logging()
+
+
+def register_worker_exit():
+    """
+    Description:
+        write the queued and suppressed records at the exit of a worker of multiprocessing, e.g. of the tournament pool,
+        a worker ends with os._exit, which doesn`t call the atexit functions, but the finalizers of multiprocessing
+        Call it in the initializer of the worker, the finalizers registered before the worker started are cleared
+
+    Params:
+        none
+
+    Returns:
+        none
+
+    Tests:
+        1. check if an error of a tournament worker is written into the logfile, after the pool is closed
+    """
+
+    import multiprocessing.util
+
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, Deferred_Queue_Handler):
+            for rate_limit in handler.filters:
+                if isinstance(rate_limit, Rate_Limit_Filter):
+                    multiprocessing.util.Finalize(None, report_suppressed, (handler, rate_limit), exitpriority=20)
+
+    # the higher exitpriority is called first: the suppressed records, then the writer thread stops
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=10)
+
+
+def setup_logging(path=log_path, interval=log_interval):
+    """
+    Description:
+        configure the root logger once per process, each module calls it at the import instead of logging.basicConfig:
+        - the records of the root logger pass the rate limit filter and are put into a queue
+        - a background thread formats the records and writes them into the logfile
+        - the queued and suppressed records are written at the exit of the process
+        Like logging.basicConfig nothing is changed, if the root logger already has a handler
+
+    Params:
+        path (String): path of the logfile --> default logs/logfile.log next to this file
+        interval (float): seconds, in which the same message of the same line is only written once
+
+    Returns:
+        none
+
+    Tests:
+        1. check if a second call doesn`t add a second handler
+        2. check if the logfile is created in the logs folder on Windows and Linux
+    """
+
+    global log_listener
+
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        file_handler = logging.FileHandler(path, delay=True)
+        file_handler.setFormatter(logging.Formatter(log_format, log_date_format))
+
+        records = queue.SimpleQueue()
+        rate_limit = Rate_Limit_Filter(interval)
+
+        queue_handler = Deferred_Queue_Handler(records)
+        queue_handler.addFilter(rate_limit)
+        root.addHandler(queue_handler)
+
+        log_listener = logging.handlers.QueueListener(records, file_handler)
+        log_listener.start()
+
+        # atexit calls the functions in reverse order: first the suppressed records, then the writer thread stops
+        atexit.register(stop_logging)
+        atexit.register(report_suppressed, queue_handler, rate_limit)
+
+        # a forked process gets its own queue and writer thread, only registered once per process
+        if hasattr(os, "register_at_fork") and not getattr(setup_logging, "fork_registered", False):
+            os.register_at_fork(after_in_child=restart_after_fork)
+            setup_logging.fork_registered = True
+
+    except Exception as e:
+        # without the logfile the errors are printed to the console
+        logging.basicConfig(format=log_format, datefmt=log_date_format)
+        logging.error("Error occurred while configuring the logging", exc_info=True)
@@ -15,237 +15,472 @@
 import logging
 
 from Game import *
+from Scheduler import *
+from Controls import key_actions, autopilot_key, profiler_key, trace_key, Input_Queue
+from Profiler import profiler
+from Logger import setup_logging
 
 # Set config for logging
-logging.basicConfig(format='%(asctime)s - %(message)s', filename='logs\\logfile.log', datefmt='%y-%m-%d %H:%M')
+setup_logging()
 
-# Tickrate of the UI 
-clock = pygame.time.Clock()
+# Tickrate of the UI --> set it to the refresh rate of the display (60 - 144), the movement is interpolated
 tickrate = 60
-game_speed = 150    
+game_speed = 150    # time of one simulation tick in ms
+max_catch_up = 5    # maximum ticks simulated in one frame, a longer lag is dropped
+
+# size of the board in grid cells, a board bigger than 27 x 23 is shown by a camera, which follows the snake head
+grid_cell_count_x = 27
+grid_cell_count_y = 23
+
+# simulation ticks with a fixed timestep, independent of the frame rate
+timestep = Fixed_Timestep(game_speed, max_catch_up)
+
+# turns of the player, one turn is taken for each tick
+input_queue = Input_Queue()
+
+# maximum frame rate of each game state, the static states only draw a new frame after an event
+frame_rates = {state_running: tickrate, state_main_menu: 30, state_pause: 30, state_game_over: 30}
+scheduler = Frame_Scheduler(frame_rates)
 
 # Initial start the infinity game loop
 game_pause = False
 main_menu = True
 
 
-def game_loop(game_pause, main_menu):
+class Game_Loop():
     """
     Description:
-        while the game is not paused, this method is an infinity game loop, waiting for the events/user interaction to handle the game
-        also drawing the game elements and updating the display 
+        Holds the state of the game loop between the frames and runs one frame of it:
+        the event pump, the simulation ticks, the drawing and the wait for the next frame
+        game_loop calls it until the window is closed, Allocations.py measures the same frames
+
+    Attributes:
+        game: the game object
+        game_pause: bool, True while the pause menu is shown
+        main_menu: bool, True while the main menu is shown
+        sound_active: bool, True if the sound is on
+        temp_direction: direction vector of the snake before the pause, the snake moves on with it after resume
+        awaited_event: event taken out of the queue by the scheduler, handled first by the next frame
+        timestep: fixed timestep of the simulation ticks
+        input_queue: buffered turns of the player
+        scheduler: frame scheduler, which caps the frame rate and waits in the static states
 
     Params:
+        game (Game): the game object
         game_pause (bool): bool, to check if the game is paused
-        main_menu (bool): Bool to check if the game is already started, to not display the main menu
+        main_menu (bool): bool, to check if the main menu is shown
+        sound_active (bool): bool, if the sound is on --> default True
+        scheduler (Frame_Scheduler): frame scheduler of the loop --> default the scheduler of this module
 
-    Returm:
-        none
-        
     Tests:
-        1. Game starts and the window displayes something
-        2. The game can be exited with the quit X on the top right
+        1. check if a frame of the running game draws only the changes
+        2. check if a click on the start button of the main menu starts the game with the next frame
     """
 
+    def __init__(self, game, game_pause, main_menu, sound_active=True, scheduler=scheduler):
+        self.game = game
+        self.game_pause = game_pause
+        self.main_menu = main_menu
+        self.sound_active = sound_active
+        self.temp_direction = Vector2(0,0)      # initial value of temp direction vector of the snake
+        self.awaited_event = None
 
-    sound_active = True                 # sound is default set on
+        self.timestep = timestep
+        self.input_queue = input_queue
+        self.scheduler = scheduler
 
-    game = Game(sound_active)           # create game object instance
-    temp_direction = Vector2(0,0)       # initial value of temp direction vector of the snake
 
+    def frame(self, steps=None, interpolation=None):
+        """
+        Description:
+            run one frame of the game loop: handle the events, simulate the due ticks and draw the frame
 
+        Params:
+            steps (int): number of simulation ticks of the frame, None for the ticks of the elapsed time of the fixed timestep
+            interpolation (float): position of head and tail between the last two ticks, None for the rest of the fixed timestep
 
-    SCREEN_UPDATE = pygame.USEREVENT
-    pygame.time.set_timer(SCREEN_UPDATE, game_speed)    # timer can speed the game up or down
+        Returns:
+            list: rects of the updated screen regions, None if the whole display was updated
 
-    try:
-        while True:
-            # eventlistener
-            for event in pygame.event.get():
+        Tests:
+            1. check if a frame with steps=1 moves the snake one cell
+            2. check if a frame in the main menu returns None
+        """
+
+        self.handle_events()
+        self.simulate(steps, interpolation)
+
+        return self.draw()
+
+
+    def handle_events(self):
+        """
+        Description:
+            eventlistener --> the only event pump of the game loop, each event is handled once
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. The game can be exited with the quit X on the top right
+            2. check if a button down and button up event in one frame are one click
+        """
+
+        game = self.game
+
+        with profiler.phase("events"):
+            events = pygame.event.get()
+            if self.awaited_event is not None:
+                events.insert(0, self.awaited_event)
+                self.awaited_event = None
+
+            for event in events:
                 # close the window
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     quit()
 
+                # the loader thread finished --> show the background image, the sprites are ready for the game
+                if event.type == assets_loaded_event:
+                    game.load_assets()
 
-                # Screen update rate
-                if event.type == SCREEN_UPDATE:
-                    # updating the game everytime the timer force the Screenupdate --> move snake, check if food was eaten etc.
-                    game.update()
-                    
-                    # only update the health if the game is running
-                    if game_pause == False and main_menu == False and game.game_over_status == False:
-                        game.update_health() 
-
-
-                # Controles for the snake
-                if event.type == pygame.KEYDOWN:
-                    # Move up       - with "Arrow up" or "w"
-                    if (event.key == pygame.K_UP or event.key == pygame.K_w) and game_pause == False and game.game_over_status == False:     
-                        if game.snake.direction.y != 1:
-                            # change direction vector
-                            game.snake.direction = Vector2(0, -1)
-
-                    # Move Right     - with "Arrow right" or "d"
-                    if (event.key == pygame.K_RIGHT or event.key == pygame.K_d) and game_pause == False and game.game_over_status == False:
-                        if game.snake.direction.x != -1:
-                            # change direction vector
-                            game.snake.direction = Vector2(1, 0)
-
-                    # Move Down     - with "Arrow down" or "s"
-                    if (event.key == pygame.K_DOWN or event.key == pygame.K_s) and game_pause == False and game.game_over_status == False:
-                        if game.snake.direction.y != -1:
-                            # change direction vector
-                            game.snake.direction = Vector2(0, 1)
-
-                    # Move Left     - with "Arrow left" or "a"
-                    if (event.key == pygame.K_LEFT or event.key == pygame.K_a) and game_pause == False and game.game_over_status == False:
-                        if game.snake.direction.x != 1:
-                            # change direction vector
-                            game.snake.direction = Vector2(-1, 0)  
-
-
-                # If sound is set on, sound will be set to off
-                if game.button_sound_on.draw_Button():
-                    
-                    # move the sound button on rect out of screen, so there aren`t two rects on each other
-                    game.button_sound_on.rect.x = 1500
-
-                    # move the sound button off into position
-                    game.button_sound_off.rect.x = game.screen_width - 290
+                # the clicked button of the current game state, the mouse is only checked on mouse button events
+                button = game.ui.handle_event(event, game_state(game, self.game_pause, self.main_menu))
 
-                    # change bool
-                    sound_active = False
-                    game.sound_active = False
+                # Open the Main Menu when the game was started
+                if self.main_menu == True:
+                    # waiting for mouse click to leave main menu with set the variable to false
+                    if button is game.button_start:
+                        game.reset()
+                        self.input_queue.clear()
+                        self.main_menu = False
 
-                    # update the volume
-                    game.sound_volume()
-                    
-                # If sound is set off, sound will be set to on
-                elif game.button_sound_off.draw_Button():
+                    # When the exit button was clicked --> close the pygame window
+                    if button is game.button_exit:
+                        pygame.quit()
+                        quit()
 
-                    # move the sound button on into position
-                    game.button_sound_on.rect.x = game.screen_width - 290
+                # the pause menu
+                elif self.game_pause == True:
+                    # When the exit button was clicked --> close the pygame window
+                    if button is game.button_exit:
+                        pygame.quit()
+                        quit()
+
+                    # When the restart button got clicked --> reset the game object to restart game
+                    if button is game.button_restart:
+                        self.game_pause = False
+                        game.reset()
+                        self.input_queue.clear()
+
+                    # Unpause the game and set the direction vector to the direction vector from before
+                    if button is game.button_resume:
+                        self.game_pause = False
+                        # set direction vector to the direction vectore befor pausing the game
+                        game.snake.direction = self.temp_direction
+
+                # the game over menu
+                elif game.engine.game_over_status == True:
+                    # When the restart button got clicked --> reset the game object to restart game
+                    if button is game.button_restart:
+                        # reset the gameplay state, the window, menus and buttons are kept
+                        game.reset()
+                        self.input_queue.clear()
+
+                    # When the exit button was clicked --> close the pygame window
+                    if button is game.button_exit:
+                        pygame.quit()
+                        quit()
+
+                # the running game
+                else:
+                    # Controles for the snake --> buffer the turn until the next tick
+                    if event.type == pygame.KEYDOWN and event.key in key_actions:
+                        self.input_queue.push(key_actions[event.key], game.engine.direction)
+
+                        # the player takes the control back from the autopilot
+                        game.autopilot_active = False
 
-                    # move the sound button off rect out of screen, so there aren`t two rects on each other
-                    game.button_sound_off.rect.x = 1500
+                    # toggle the autopilot --> the autopilot steers the snake to the food
+                    if event.type == pygame.KEYDOWN and event.key == autopilot_key:
+                        game.autopilot_active = not game.autopilot_active
+                        self.input_queue.clear()
 
+                    # Open the Pause Menu and pause the game, when the pause button is clicked
+                    if button is game.button_pause:
+                        self.game_pause = True
+                        self.input_queue.clear()
+
+                        # save direction to resume to game, we need the direction Vector befor pausing game
+                        self.temp_direction = game.snake.direction
+
+                        # stop the snake, with direction Vector (0,0) --> no movement will ahppen
+                        game.snake.direction = Vector2(0,0)
+
+
+                # toggle the sound, the sound button is shown in each game state
+                if button is game.button_sound_on or button is game.button_sound_off:
                     # change bool
-                    sound_active = True
-                    game.sound_active = True
+                    self.sound_active = not self.sound_active
+                    game.sound_active = self.sound_active
 
                     # update the volume
                     game.sound_volume()
 
-                # Open the Pause Menu and pause the game, when the pause button is clicked
-                if game.button_pause.draw_Button():
-                    game_pause = True
+                    # show the other sound button on the same position, it is drawn with the next frame
+                    game.button_sound_on.show(self.sound_active)
+                    game.button_sound_off.show(not self.sound_active)
 
-                    # save direction to resume to game, we need the direction Vector befor pausing game
-                    temp_direction = game.snake.direction
+                # show the profiler overlay or write the trace of the last frames, in each game state
+                if event.type == pygame.KEYDOWN and event.key == profiler_key:
+                    game.toggle_profiler()
+                if event.type == pygame.KEYDOWN and event.key == trace_key:
+                    profiler.export_trace()
 
-                    # stop the snake, with direction Vector (0,0) --> no movement will ahppen
-                    game.snake.direction = Vector2(0,0)
 
+    def simulate(self, steps=None, interpolation=None):
+        """
+        Description:
+            simulate the ticks of the elapsed time with a fixed timestep --> move snake, check if food was eaten etc.
+            the time of menus and pause is not simulated
 
-            draw_screen(game, sound_active)
+        Params:
+            steps (int): number of simulation ticks, None for the ticks of the elapsed time of the fixed timestep
+            interpolation (float): position of head and tail between the last two ticks, None for the rest of the fixed timestep
 
+        Returns:
+            none
 
-            # Open the Main Menu when the game was started
-            if main_menu == True:
-                # stop snake movement
-                game.snake.direction = Vector2(0,0)
+        Tests:
+            1. check if no tick is simulated in the pause menu
+            2. check if the replay records one input for each tick
+        """
 
-                # draw buttons
-                game.button_start.draw_Button()
-                game.button_exit.draw_Button()
+        game = self.game
 
-                for event in pygame.event.get():
-                    # Close window
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        quit()
+        if self.main_menu == False and self.game_pause == False and game.engine.game_over_status == False:
+            if steps is None:
+                steps = self.timestep.advance()
 
-                    # waiting for mouse click to leave main menu with set the variable to false
-                    if game.button_start.draw_Button():
-                        game = Game(sound_active)
-                        main_menu = False
+            for i in range(steps):
+                if game.engine.game_over_status == True:
+                    break
 
-                    # When the exit button was clicked --> close the pygame window
-                    if game.button_exit.draw_Button():
-                        pygame.quit()
-                        quit()
+                # exactly one buffered turn for each tick, or the turn of the autopilot
+                if game.autopilot_active == True:
+                    with profiler.phase("autopilot"):
+                        action = game.autopilot.next_action(game.engine)
+                else:
+                    action = self.input_queue.pop()
+                game.replay.record(action)
+                if action is not None:
+                    game.engine.turn(action)
 
-            # Draw the game elements
-            else:
-                # call the health function and the clock, draw the rest of the game elements    
-                if(game_pause == False and game.game_over_status == False):
-                    game.snake.draw_snake()
-                    game.food.draw_food()          
-                    
-                    game.button_pause.draw_Button()
+                with profiler.phase("update"):
+                    game.update()
+
+                # only update the health if the game is running
+                if game.engine.game_over_status == False:
+                    with profiler.phase("update_health"):
+                        game.update_health()
+
+                # keep the replay of the finished game, it can be simulated with Replay.py
+                if game.engine.game_over_status == True:
+                    game.save_replay()
+
+            # draw head and tail between the last two ticks
+            game.interpolation = self.timestep.alpha if interpolation is None else interpolation
+        else:
+            # the time of menus and pause is not simulated
+            self.timestep.stop()
+
+
+    def draw(self):
+        """
+        Description:
+            drawing the game elements of the current game state and updating the display
+
+        Params:
+            none
+
+        Returns:
+            list: rects of the updated screen regions, None if the whole display was updated
+
+        Tests:
+            1. Game starts and the window displayes something
+            2. check if the pause menu is drawn over the snake and the food
+        """
+
+        game = self.game
+
+        # rects of the changed screen regions, None --> the whole display is updated
+        dirty_rects = None
 
-                    # timer tick
-                    clock.tick(tickrate)
+        # Draw the Main Menu when the game was started
+        if self.main_menu == True:
+            draw_screen(game, self.sound_active)
 
-                # open the pause menu
-                elif(game_pause == True and game.game_over_status == False):
+            # stop snake movement
+            game.snake.direction = Vector2(0,0)
+
+            # draw buttons
+            game.button_start.draw_Button()
+            game.button_exit.draw_Button()
+
+        # draw the rest of the game elements    
+        elif(self.game_pause == False and game.engine.game_over_status == False):
+            # only draw the changes, as long as no full redraw is needed
+            with profiler.phase("draw_changes"):
+                dirty_rects = game.draw_changes()
+
+            if dirty_rects is None:
+                draw_screen(game, self.sound_active)
+
+                with profiler.phase("draw_snake"):
                     game.snake.draw_snake()
+                with profiler.phase("draw_food"):
                     game.food.draw_food()
-                    
-                    game.game_pause_menu.blit_background()
-
-                    game.button_restart.draw_Button()
-                    game.button_resume.draw_Button()
-                    game.button_exit.draw_Button()
-
-                    # When the window is closed, quit pygame
-                    for event in pygame.event.get():
-                        # When the exit button was clicked --> close the pygame window
-                        if event.type == pygame.QUIT or game.button_exit.draw_Button():
-                            pygame.quit()
-                            quit()
-
-                        # When the restart button got clicked --> reset game object instance to restart game
-                        if game.button_restart.draw_Button():
-                            game_pause = False
-                            game = Game(sound_active)
-
-                        # Unpause the game and set the direction vector to the direction vector from before
-                        if game.button_resume.draw_Button():
-                            game_pause = False
-                            # set direction vector to the direction vectore befor pausing the game
-                            game.snake.direction = temp_direction
-
-                # open the game over menu
-                elif(game_pause == False and game.game_over_status == True):
-                        game.game_over_menu.blit_background()
-
-                        # Draw buttons on the game play area
-                        game.button_restart.draw_Button()
-                        game.button_exit.draw_Button()
-                    
-                        # When the window is closed, quit pygame
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                pygame.quit()
-                                quit()
-
-                            # When the restart button got clicked --> reset game object instance to restart game
-                            if game.button_restart.draw_Button():
-                                # create new game object --> creating a new game --> simulates a restart
-                                game = Game(sound_active)
-
-                            # When the exit button was clicked --> close the pygame window
-                            if game.button_exit.draw_Button():
-                                pygame.quit()
-                                quit()  
-
-            pygame.display.flip()
+                with profiler.phase("draw_motion"):
+                    game.draw_motion()
+            
+                with profiler.phase("buttons"):
+                    game.button_pause.draw_Button()
+
+        # draw the pause menu
+        elif(self.game_pause == True and game.engine.game_over_status == False):
+            draw_screen(game, self.sound_active)
+            game.full_redraw = True
+
+            game.snake.draw_snake()
+            game.food.draw_food()
+            
+            game.game_pause_menu.blit_background()
+
+            game.button_restart.draw_Button()
+            game.button_resume.draw_Button()
+            game.button_exit.draw_Button()
+
+        # draw the game over menu
+        elif(self.game_pause == False and game.engine.game_over_status == True):
+            draw_screen(game, self.sound_active)
+            game.full_redraw = True
+
+            game.game_over_menu.blit_background()
+
+            # Draw buttons on the game play area
+            game.button_restart.draw_Button()
+            game.button_exit.draw_Button()
+
+        with profiler.phase("flip"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
+
+        return dirty_rects
+
+
+    def wait(self):
+        """
+        Description:
+            cap the frame rate, menus, pause and game over wait for the next event
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the running game doesn`t get more than tickrate frames per second
+        """
+
+        with profiler.phase("wait"):
+            self.awaited_event = self.scheduler.end_frame(game_state(self.game, self.game_pause, self.main_menu))
+
+
+def game_loop(game_pause, main_menu, max_frames=None):
+    """
+    Description:
+        while the game is not paused, this method is an infinity game loop, waiting for the events/user interaction to handle the game
+        also drawing the game elements and updating the display 
+
+    Params:
+        game_pause (bool): bool, to check if the game is paused
+        main_menu (bool): Bool to check if the game is already started, to not display the main menu
+        max_frames (int): the loop returns after this number of frames, e.g. for the startup benchmark --> default None, no limit
+
+    Returm:
+        none
+        
+    Tests:
+        1. Game starts and the window displayes something
+        2. The game can be exited with the quit X on the top right
+    """
+
+
+    sound_active = True                 # sound is default set on
+
+    game = Game(sound_active, grid_cell_count_x, grid_cell_count_y)   # create game object instance
+    loop = Game_Loop(game, game_pause, main_menu, sound_active)
+    frame_count = 0                     # number of drawn frames
+
+    # without the main menu the game starts at once and needs the gameplay images
+    if main_menu == False:
+        game.load_assets()
+
+
+    try:
+        while True:
+            # start the measurement of the new frame
+            profiler.begin_frame()
+
+            loop.frame()
+
+            # the startup benchmark stops after the first frames
+            frame_count += 1
+            if max_frames is not None and frame_count >= max_frames:
+                return
+
+            loop.wait()
         
     except Exception as e:
         logging.error("Error occurred in the gameloop", exc_info=True)
 
+        # the replay reproduces the game up to the crash
+        game.save_replay()
+
+
+def game_state(game, game_pause, main_menu):
+    """
+    Description:
+        return the current state of the game loop
+
+    Params:
+        game (game): instance of the game object
+        game_pause (bool): bool, to check if the game is paused
+        main_menu (bool): Bool to check if the main menu is shown
+
+    Return: 
+        String: state_main_menu, state_pause, state_game_over or state_running
+
+    Tests:
+        1. check if the state is state_main_menu at the start
+        2. check if the state is state_game_over after the snake crashed
+    """
+
+    if main_menu == True:
+        return state_main_menu
+    elif game_pause == True:
+        return state_pause
+    elif game.engine.game_over_status == True:
+        return state_game_over
+
+    return state_running
+
 
 def draw_screen(game, sound_active):
     """
@@ -264,14 +499,17 @@ def draw_screen(game, sound_active):
         2. Sound off OR sound on icon is displayed on the bottom slightly transparent of the right bar
     """
     try:
-        # draw elements, stats and buttons on the screen
-        game.draw_elements()
-        game.draw_stats()
-
-        if sound_active ==  True:
-            game.button_sound_on.draw_Button()
-        elif sound_active == False:
-            game.button_sound_off.draw_Button()
+        # draw elements, stats and buttons on the screen, each phase is measured by the profiler
+        with profiler.phase("draw_elements"):
+            game.draw_elements()
+        with profiler.phase("draw_stats"):
+            game.draw_stats()
+
+        with profiler.phase("buttons"):
+            if sound_active ==  True:
+                game.button_sound_on.draw_Button()
+            elif sound_active == False:
+                game.button_sound_off.draw_Button()
     
     except Exception as e:
         logging.error("Error occurred while drawing the elements", exc_info=True)
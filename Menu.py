@@ -1,7 +1,7 @@
 """ Python Evolving Snake game
     
     Description:
-        Menu file includes Menu and Menu_button classes, together you can craft an individual Game menu
+        Menu file includes Menu, Menu_button and UI_Dispatcher classes, together you can craft an individual Game menu
 
     Param:
         Author  : Simon Jess 
@@ -13,10 +13,12 @@
 import pygame
 import logging
 
+from Assets import assets
+from Logger import setup_logging
+
 # Set config for logging
-logging.basicConfig(format='%(asctime)s - %(message)s', filename='logs\\logfile.log', datefmt='%y-%m-%d %H:%M')
+setup_logging()
 
-pygame.init()
 
 class Menu():
     """
@@ -28,7 +30,7 @@ class Menu():
         screen_height: height of the game screen
         screen_width : width of the game screen
         game_screen  : pygame.display, with screen width and height as size
-        area         : pygame.Surface, with the playarea as size
+        area         : pygame.Surface, with the playarea as size, filled with the color and the alpha once
         color        : color as parameter for the background color
         alpha        : alpha as strength of transparency of the background color
 
@@ -48,14 +50,39 @@ class Menu():
             self.screen_height = self.game.screen_height
             self.screen_width  = self.game.screen_width
             self.game_screen = self.game.game_screen
-            self.area = pygame.Surface((self.game.screen_width-420, self.game.screen_height-80))
             self.color = color
             self.alpha = alpha
+
+            # the overlay is composed once and shared by all menus with the same color and transparency
+            key = ("menu_overlay", self.game.screen_width, self.game.screen_height, tuple(color), alpha)
+            self.area = assets.surface(key, self.compose_area)
         
         except Exception as e:
             logging.error("Error occurred when setting initial values to the Menu object", exc_info=True)
 
 
+    def compose_area(self):
+        """
+        Description:
+            compose the transparent overlay of the playarea
+
+        Params:
+            none 
+        
+        Returns:
+            pygame.Surface: the overlay with the color and the alpha of the menu
+
+        Tests:
+            1. check if the overlay has the size of the playarea
+        """
+
+        area = pygame.Surface((self.game.screen_width-420, self.game.screen_height-80)).convert()
+        area.fill(self.color)
+        area.set_alpha(self.alpha)
+
+        return area
+
+
     def blit_background(self):
         """
         Description:
@@ -72,9 +99,7 @@ class Menu():
             2. If the game is paused, the background should be sliightly transparent white
         """
         try:
-            # pause area --> change background 
-            self.area.set_alpha(self.alpha)
-            self.area.fill(self.color)
+            # pause area --> change background with the cached overlay
             self.game_screen.blit(self.area, (40, 40))
         
         except Exception as e:
@@ -84,7 +109,7 @@ class Menu():
 class Menu_Button():
     """
     Description:
-        Creating a button object through an image and the reaction to a click event
+        Creating a button object through an image, the clicks are found by the UI_Dispatcher out of the mouse events
 
     Attribute:
         game_screen : pygame.display, with screen width and height as size
@@ -92,7 +117,8 @@ class Menu_Button():
         rect        : rect filled with the image and forming the button
         rect.x      : x coordinate of the rect
         rect.y      : y coordinate of the rect
-        clicked     : bool to check if the button was clicked
+        visible     : bool, a hidden button is not drawn and can`t be clicked
+        dirty       : bool, which indicates the button has to be drawn again, because it changed since it was drawn
     
     Params:
         x (int): x coordinate  for rect
@@ -114,7 +140,8 @@ class Menu_Button():
             self.rect = self.image.get_rect()
             self.rect.x = x
             self.rect.y = y
-            self.clicked = False
+            self.visible = True
+            self.dirty = True
         
         except Exception as e:
             logging.error("Error occurred when setting initial values to the Button object ", exc_info=True)
@@ -123,14 +150,14 @@ class Menu_Button():
     def draw_Button(self):
         """
         Description:
-            drawing the buttons to the game_screen
-            query mouse position to check collisions and click events
+            drawing the button to the game_screen, if it is visible
+            the button doesn`t query the mouse, clicks are handled by the UI_Dispatcher
 
         Params:
             none
 
         Returns:
-            bool: returns if the button was clicked or not
+            pygame.Rect: the rect of the button
 
         Tests:
             1. check of the button_pause button was drawed on the screen
@@ -141,27 +168,165 @@ class Menu_Button():
         """
 
         try:
-            clickstatus = False
+            if self.visible:
+                self.game_screen.blit(self.image, self.rect)
+
+            self.dirty = False
+            return self.rect
+
+        except Exception as e:
+            logging.error("Error occurred when drawing a button ", exc_info=True)
+
+
+    def show(self, visible):
+        """
+        Description:
+            show or hide the button, the button is drawn again if this changes
+
+        Params:
+            visible (bool): True to show the button
+
+        Returns:
+            none
+
+        Tests:
+            1. check if a hidden button is not returned by a hit test
+            2. check if dirty is set, when the button gets hidden
+        """
+
+        if self.visible != visible:
+            self.visible = visible
+            self.dirty = True
+
+
+class UI_Dispatcher():
+    """
+    Description:
+        Finds the button clicks out of the mouse events: the buttons are registered for the game states, in which they are shown
+        A button is hit tested once on MOUSEBUTTONDOWN and once on MOUSEBUTTONUP, it is clicked when both hit the same button
 
-            # get mouse position
-            mous_position = pygame.mouse.get_pos()
+    Attribute:
+        layers         : list of the registered buttons for each game state, the last registered button is on top
+        pressed_button : button under the mouse at the last MOUSEBUTTONDOWN, None if no button was hit
+
+    Params:
+        none
+
+    Tests:
+        1. check if one click on the sound button toggles the sound exactly once
+        2. check if pressing on a button and releasing outside of it is no click
+    """
 
-            # prove if mouse collides with the button rect
-            if self.rect.collidepoint(mous_position):
+    def __init__(self):
+        self.layers = {}
+        self.pressed_button = None
 
-                # prove if the mouse is clicked
-                if pygame.mouse.get_pressed()[0] == 1 and self.clicked == False:
-                    clickstatus = True
-                    self.clicked = True
 
-                # mouse not clicked
-                if pygame.mouse.get_pressed()[0] == 0:
-                    self.clicked = False
+    def register(self, button, *states):
+        """
+        Description:
+            register a button for the game states, in which it can be clicked
 
-            self.game_screen.blit(self.image, self.rect)
+        Params:
+            button (Menu_Button): the button
+            states (String): the game states of the button
 
-            # return bool for event check
-            return clickstatus
+        Returns:
+            none
+
+        Tests:
+            1. check if the button is in the layer of each state
+        """
+
+        for state in states:
+            self.layers.setdefault(state, []).append(button)
+
+
+    def hit_test(self, position, state):
+        """
+        Description:
+            return the visible button of the state under the position
+
+        Params:
+            position (tuple): (x, y) position of the mouse
+            state (String): the current game state
+
+        Returns:
+            Menu_Button: the top button under the position, None if there is no button
+
+        Tests:
+            1. check if a position outside of all buttons returns None
+        """
+
+        for button in reversed(self.layers.get(state, ())):
+            if button.visible and button.rect.collidepoint(position):
+                return button
+
+        return None
+
+
+    def handle_event(self, event, state):
+        """
+        Description:
+            handle one event of the event loop, only the left mouse button events are checked
+
+        Params:
+            event (pygame.event.Event): the event
+            state (String): the current game state
+
+        Returns:
+            Menu_Button: the clicked button, None if the event doesn`t complete a click
+
+        Tests:
+            1. check if MOUSEBUTTONDOWN and MOUSEBUTTONUP on the start button return the start button for the up event
+            2. check if a MOUSEMOTION event returns None
+        """
+
+        try:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.pressed_button = self.hit_test(event.pos, state)
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                button = self.hit_test(event.pos, state)
+                pressed_button = self.pressed_button
+                self.pressed_button = None
+
+                if button is not None and button is pressed_button:
+                    return button
 
         except Exception as e:
-            logging.error("Error occurred when button interaction happens ", exc_info=True)
\ No newline at end of file
+            logging.error("Error occurred while handling a mouse event", exc_info=True)
+
+        return None
+
+
+    def draw_changes(self, state, background):
+        """
+        Description:
+            draw the changed buttons of the state again, the background under a changed button is restored first
+
+        Params:
+            state (String): the current game state
+            background (pygame.Surface): the static layer of the screen under the buttons
+
+        Returns:
+            list: rects of the redrawn buttons for pygame.display.update
+
+        Tests:
+            1. check if no rect is returned without a changed button
+            2. check if the sound off button is drawn after the sound was switched off
+        """
+
+        buttons = self.layers.get(state, ())
+        dirty_buttons = [button for button in buttons if button.dirty]
+
+        if len(dirty_buttons) == 0:
+            return []
+
+        # restore all rects first, buttons can share a rect like sound on and sound off
+        for button in dirty_buttons:
+            button.game_screen.blit(background, button.rect, button.rect)
+
+        # the buttons on a restored rect are drawn again too, e.g. the shown sound button under the hidden one
+        rects = [button.rect for button in dirty_buttons]
+        return [button.draw_Button() for button in buttons if button.dirty or button.rect.collidelist(rects) != -1]
@@ -0,0 +1,304 @@
+""" Python Evolving Snake game
+
+    Description:
+        Profiler file includes the frame profiler class, which measures the time of each phase of a frame
+        (event pump, update, drawing, display flip, ...), keeps the percentiles of the last frames
+        and exports the measured phases as Chrome trace, which can be opened with chrome://tracing or https://ui.perfetto.dev
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import json
+import time
+import logging
+
+from collections import deque
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# trace of the last frames, saved next to the logfile
+trace_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "frame_trace.json")
+
+# time of one frame at 60 frames per second in ms, a frame with more busy time stutters
+frame_budget = 1000 / 60
+
+# phase of the frame, in which the loop waits for the next frame, it is not counted as busy time
+wait_phase = "wait"
+
+
+class Phase():
+    """
+    Description:
+        Context manager, which measures one phase of the frame with the profiler: with profiler.phase("update"): ...
+        The object is created once for each phase name and used again on each frame
+
+    Attributes:
+        profiler: the profiler of the phase
+        name: name of the phase
+        start: start time of the current measurement in ns
+
+    Params:
+        profiler (Frame_Profiler): the profiler of the phase
+        name (String): name of the phase
+
+    Tests:
+        1. check if the time of the block inside the with statement is added to the phase
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Frame_Profiler():
+    """
+    Description:
+        Measures the phases of each frame of the game loop:
+        - the durations of each phase of the last window frames are kept, to show the 50th, 95th and 99th percentile
+        - the busy time of a frame is the frame time without the wait phase, a frame over the budget is a slow frame,
+          the slowest phase of the last slow frame is kept, to see which phase blew the budget
+        - the phases of the last trace_size measurements are kept for the Chrome trace export
+        A phase called more than once in a frame, like update with some catch up ticks, is summed for the frame
+
+    Attributes:
+        window: number of frames for the percentiles
+        trace_size: number of phase measurements kept for the trace
+        budget: maximum busy time of a frame in ms
+        samples: durations in ns of each phase of the last window frames: name --> deque
+        frame_phases: summed durations in ns of the phases of the current frame
+        events: the last measurements (name, start ns, duration ns, frame) for the trace
+        phases: Phase context managers of each name
+        frame_count: number of the current frame
+        frame_start: start time of the current frame in ns, 0 before the first frame
+        start_time: creation time of the profiler in ns, the trace starts at 0
+        slow_frames: number of frames over the budget
+        last_slow: (frame, busy time ms, slowest phase, time of the slowest phase ms) of the last slow frame, None without a slow frame
+        overlay_active: bool, True if the overlay is shown in the score panel
+
+    Params:
+        window (int): number of frames for the percentiles --> default 600 (10 seconds at 60 frames per second)
+        trace_size (int): number of phase measurements kept for the trace --> default 20000
+        budget (float): maximum busy time of a frame in ms --> default frame_budget
+
+    Tests:
+        1. check if the percentiles of a phase of 1 ms are about 1 ms
+        2. check if a frame with a sleep of 20 ms in the draw phase is a slow frame with draw as slowest phase
+    """
+
+    def __init__(self, window=600, trace_size=20000, budget=frame_budget):
+        self.window = window
+        self.trace_size = trace_size
+        self.budget = budget
+
+        self.samples = {}
+        self.frame_phases = {}
+        self.events = deque(maxlen=trace_size)
+        self.phases = {}
+
+        self.frame_count = 0
+        self.frame_start = 0
+        self.start_time = time.perf_counter_ns()
+
+        self.slow_frames = 0
+        self.last_slow = None
+        self.overlay_active = False
+
+
+    def phase(self, name):
+        """
+        Description:
+            return the context manager, which measures the phase
+
+        Params:
+            name (String): name of the phase
+
+        Returns:
+            Phase: the context manager of the phase
+
+        Tests:
+            1. check if two calls with the same name return the same object
+        """
+
+        phase = self.phases.get(name)
+
+        if phase is None:
+            phase = Phase(self, name)
+            self.phases[name] = phase
+
+        return phase
+
+
+    def add(self, name, start, duration):
+        """
+        Description:
+            add a measured phase to the current frame and the trace
+
+        Params:
+            name (String): name of the phase
+            start (int): start time in ns of time.perf_counter_ns
+            duration (int): duration in ns
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the duration of two measurements of a phase in one frame is summed
+        """
+
+        self.frame_phases[name] = self.frame_phases.get(name, 0) + duration
+        self.events.append((name, start, duration, self.frame_count))
+
+
+    def begin_frame(self):
+        """
+        Description:
+            end the measurement of the last frame and start a new frame, called once at the start of each frame
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the frame phase has the time between two calls
+            2. check if slow_frames grows, if the busy time of the frame is over the budget
+        """
+
+        now = time.perf_counter_ns()
+
+        try:
+            if self.frame_start != 0:
+                frame_phases = self.frame_phases
+                frame_time = now - self.frame_start
+
+                # busy time of the frame, the time of the frame rate cap is not counted
+                busy = frame_time - frame_phases.get(wait_phase, 0)
+                frame_phases["frame"] = busy
+                self.events.append(("frame", self.frame_start, frame_time, self.frame_count))
+
+                for name, duration in frame_phases.items():
+                    samples = self.samples.get(name)
+                    if samples is None:
+                        samples = deque(maxlen=self.window)
+                        self.samples[name] = samples
+                    samples.append(duration)
+
+                # keep the slowest phase of a frame over the budget
+                if busy > self.budget * 1000000:
+                    slowest = max((name for name in frame_phases if name != "frame" and name != wait_phase), key=frame_phases.get, default="")
+                    self.slow_frames += 1
+                    self.last_slow = (self.frame_count, busy / 1000000, slowest, frame_phases.get(slowest, 0) / 1000000)
+
+                frame_phases.clear()
+
+        except Exception as e:
+            logging.error("Error occurred while ending the profiled frame", exc_info=True)
+
+        self.frame_count += 1
+        self.frame_start = now
+
+
+    def percentiles(self, name):
+        """
+        Description:
+            return the 50th, 95th and 99th percentile of the durations of a phase in the last window frames
+
+        Params:
+            name (String): name of the phase
+
+        Returns:
+            tuple: (p50, p95, p99) in ms, None if the phase wasn`t measured
+
+        Tests:
+            1. check if the percentiles of 100 durations 1 - 100 ms are 50, 95 and 99 ms
+        """
+
+        samples = self.samples.get(name)
+
+        if not samples:
+            return None
+
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+
+        return tuple(ordered[round(last * fraction)] / 1000000 for fraction in (0.5, 0.95, 0.99))
+
+
+    def report(self):
+        """
+        Description:
+            return the percentiles of all measured phases, the frame first
+
+        Params:
+            none
+
+        Returns:
+            list: (name, p50, p95, p99) of each phase, times in ms
+
+        Tests:
+            1. check if the first entry is the frame
+        """
+
+        names = sorted(self.samples, key=lambda name: (name != "frame", name))
+        return [(name,) + self.percentiles(name) for name in names]
+
+
+    def export_trace(self, path=trace_path):
+        """
+        Description:
+            write the kept measurements as Chrome trace JSON, each phase is a complete event ("ph": "X") in µs
+
+        Params:
+            path (String): path of the file --> default logs/frame_trace.json
+
+        Returns:
+            bool: True if the file was written
+
+        Tests:
+            1. check if the file is valid JSON with a traceEvents list
+            2. check if the phases of a frame are inside of the frame event
+        """
+
+        try:
+            trace_events = [{
+                "name": name,
+                "cat": "frame" if name == "frame" else "phase",
+                "ph": "X",
+                "ts": (start - self.start_time) / 1000,
+                "dur": duration / 1000,
+                "pid": 1,
+                "tid": 1,
+                "args": {"frame": frame},
+            } for name, start, duration, frame in self.events]
+
+            with open(path, "w") as file:
+                json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
+            return True
+
+        except Exception as e:
+            logging.error("Error occurred while exporting the frame trace", exc_info=True)
+            return False
+
+
+# profiler of the process, used by the game loop and the game object
+profiler = Frame_Profiler()
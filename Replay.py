@@ -0,0 +1,331 @@
+""" Python Evolving Snake game
+
+    Description:
+        Replay file includes the replay class, which records the seed, the board size, the rules and the input of each tick of a game
+        A replay is simulated again with the headless engine, so a game can be reproduced and its highscore validated
+        Run it with: $ python Replay.py <replay file>
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import os
+import sys
+import struct
+import logging
+
+from Engine import Engine
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# replay of the last game, saved next to the logfile
+replay_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "last_game.rpl")
+
+# file header: magic, version, seed, grid cells x, grid cells y, ticks, highscore,
+# health loss, points between two random effects, weights of the 5 random effects
+replay_magic = b"SNKR"
+replay_version = 2
+replay_header = struct.Struct("<4sBQHHIIdI5I")
+
+# header of the first version without the rules, these replays are simulated with the default rules
+replay_header_v1 = struct.Struct("<4sBQHHII")
+
+# input byte of a tick without a turn, the turns are the actions move_up, move_right, move_down, move_left
+no_input = 255
+
+
+class Replay():
+    """
+    Description:
+        Records one input byte for each tick of a game, the turn of the tick or no_input
+        The file stores the inputs run length encoded: the byte and the length of the run as varint,
+        most ticks have no turn, so a game of 10 minutes needs only a few KB
+
+    Attributes:
+        seed: seed of the random generator of the game
+        grid_cell_count_x: number of grid_cells in x direction
+        grid_cell_count_y: number of grid_cells in y direction
+        healt_loss: health loss of each tick of the game
+        random_effect_step: points between two random effects of the game
+        effect_weights: weight of each of the 5 random effects of the game
+        inputs: bytearray with the input byte of each tick
+        highscore: highscore of the recorded game, to validate the simulated game
+
+    Params:
+        seed (int): seed of the random generator of the game
+        grid_cell_count_x (int): number of grid cells in x direction --> default 27
+        grid_cell_count_y (int): number of grid cells in y direction --> default 23
+        healt_loss (float): health loss of each tick --> default 0.5
+        random_effect_step (int): points between two random effects --> default 250
+        effect_weights (tuple): weight of each of the 5 random effects --> default equal weights (10, 10, 10, 10, 10)
+
+    Tests:
+        1. check if the simulation of a recorded game has the same highscore and snake as the game
+        2. check if decode(encode()) returns the same inputs
+        3. check if a game with a health loss of 1.0 and an effect step of 50 is valid after decode(encode())
+    """
+
+    def __init__(self, seed=0, grid_cell_count_x=27, grid_cell_count_y=23, healt_loss=0.5, random_effect_step=250, effect_weights=(10, 10, 10, 10, 10)):
+        self.seed = seed
+        self.grid_cell_count_x = grid_cell_count_x
+        self.grid_cell_count_y = grid_cell_count_y
+        self.healt_loss = healt_loss
+        self.random_effect_step = random_effect_step
+        self.effect_weights = tuple(effect_weights)
+        self.inputs = bytearray()
+        self.highscore = 0
+
+
+    def start(self, engine):
+        """
+        Description:
+            start the recording of a new game of the engine
+
+        Params:
+            engine (Engine): engine right after the reset of the game
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the seed is the seed of the engine and no input is recorded
+            2. check if the rules are the rules of the engine
+        """
+
+        self.seed = engine.seed
+        self.grid_cell_count_x = engine.grid_cell_count_x
+        self.grid_cell_count_y = engine.grid_cell_count_y
+        self.healt_loss = engine.base_healt_loss
+        self.random_effect_step = engine.random_effect_step
+        self.effect_weights = engine.effect_weights
+        self.inputs.clear()
+        self.highscore = 0
+
+
+    def record(self, action):
+        """
+        Description:
+            record the input of one tick
+
+        Params:
+            action (int): the turn of the tick, None if there is no turn
+
+        Returns:
+            none
+
+        Tests:
+            1. check if the length of inputs grows by one
+            2. check if None is recorded as no_input
+        """
+
+        self.inputs.append(no_input if action is None else action)
+
+
+    def encode(self):
+        """
+        Description:
+            build the bytes of the replay file: header and run length encoded inputs
+
+        Params:
+            none
+
+        Returns:
+            bytes: the replay file
+
+        Tests:
+            1. check if 4000 ticks without a turn need less than 10 bytes after the header
+        """
+
+        data = bytearray(replay_header.pack(replay_magic, replay_version, self.seed, self.grid_cell_count_x,
+                                            self.grid_cell_count_y, len(self.inputs), self.highscore,
+                                            self.healt_loss, self.random_effect_step, *self.effect_weights))
+
+        index = 0
+        while index < len(self.inputs):
+            value = self.inputs[index]
+
+            # length of the run of the same input
+            run = 1
+            while index + run < len(self.inputs) and self.inputs[index + run] == value:
+                run += 1
+            index += run
+
+            # input byte and the run length as varint, 7 bits per byte, the high bit marks a following byte
+            data.append(value)
+            while run >= 0x80:
+                data.append((run & 0x7F) | 0x80)
+                run >>= 7
+            data.append(run)
+
+        return bytes(data)
+
+
+    def save(self, path=replay_path):
+        """
+        Description:
+            write the replay file
+
+        Params:
+            path (String): path of the file --> default logs/last_game.rpl
+
+        Returns:
+            bool: True if the file was written
+
+        Tests:
+            1. check if load returns a replay with the same seed and inputs
+        """
+
+        try:
+            with open(path, "wb") as file:
+                file.write(self.encode())
+            return True
+
+        except Exception as e:
+            logging.error("Error occurred while saving the replay", exc_info=True)
+            return False
+
+
+    def simulate(self):
+        """
+        Description:
+            simulate the recorded game with the headless engine, as fast as possible
+
+        Params:
+            none
+
+        Returns:
+            Engine: the engine after the last recorded tick
+
+        Tests:
+            1. check if two simulations give the same snake, food and highscore
+            2. check if the highscore is the recorded highscore
+        """
+
+        engine = Engine(self.grid_cell_count_x, self.grid_cell_count_y, self.seed, self.healt_loss, self.random_effect_step, self.effect_weights)
+
+        for value in self.inputs:
+            engine.step(None if value == no_input else value)
+
+        return engine
+
+
+    def validate(self):
+        """
+        Description:
+            check if the simulation of the recorded inputs reaches the recorded highscore
+
+        Params:
+            none
+
+        Returns:
+            bool: True if the highscore is valid
+
+        Tests:
+            1. check if a replay with a changed highscore is not valid
+        """
+
+        return self.simulate().highscore == self.highscore
+
+
+def decode(data):
+    """
+    Description:
+        build a replay out of the bytes of a replay file, a replay of version 1 gets the default rules
+
+    Params:
+        data (bytes): the replay file
+
+    Returns:
+        Replay: the replay, None if the data is no valid replay
+
+    Tests:
+        1. check if decode(replay.encode()) has the same seed, board size, inputs and highscore
+        2. check if data without the magic returns None
+        3. check if a replay file of version 1 is decoded with the default rules
+    """
+
+    try:
+        magic, version, seed, grid_cell_count_x, grid_cell_count_y, ticks, highscore = replay_header_v1.unpack_from(data)
+
+        if magic != replay_magic or version not in (1, replay_version):
+            logging.error("Error occurred while decoding the replay: unknown format")
+            return None
+
+        if version == 1:
+            replay = Replay(seed, grid_cell_count_x, grid_cell_count_y)
+            index = replay_header_v1.size
+        else:
+            rules = replay_header.unpack_from(data)[7:]
+            replay = Replay(seed, grid_cell_count_x, grid_cell_count_y, rules[0], rules[1], rules[2:])
+            index = replay_header.size
+
+        replay.highscore = highscore
+
+        while index < len(data):
+            value = data[index]
+            index += 1
+
+            # run length as varint
+            run = 0
+            shift = 0
+            while True:
+                byte = data[index]
+                index += 1
+                run |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+
+            replay.inputs += bytes([value]) * run
+
+        if len(replay.inputs) != ticks:
+            logging.error("Error occurred while decoding the replay: wrong number of ticks")
+            return None
+
+        return replay
+
+    except Exception as e:
+        logging.error("Error occurred while decoding the replay", exc_info=True)
+        return None
+
+
+def load(path=replay_path):
+    """
+    Description:
+        read a replay file
+
+    Params:
+        path (String): path of the file --> default logs/last_game.rpl
+
+    Returns:
+        Replay: the replay, None if the file can`t be read
+
+    Tests:
+        1. check if a saved replay is loaded with the same inputs
+    """
+
+    try:
+        with open(path, "rb") as file:
+            return decode(file.read())
+
+    except Exception as e:
+        logging.error("Error occurred while loading the replay", exc_info=True)
+        return None
+
+
+if __name__ == "__main__":
+    replay = load(sys.argv[1] if len(sys.argv) > 1 else replay_path)
+
+    if replay is None:
+        print("No valid replay file")
+    else:
+        engine = replay.simulate()
+        print("Seed: {}  Board: {}x{}  Ticks: {}".format(replay.seed, replay.grid_cell_count_x, replay.grid_cell_count_y, len(replay.inputs)))
+        print("Health loss: {}  Effect step: {}  Effect weights: {}".format(replay.healt_loss, replay.random_effect_step, ",".join(str(weight) for weight in replay.effect_weights)))
+        print("Highscore: {}  recorded: {}  valid: {}".format(engine.highscore, replay.highscore, engine.highscore == replay.highscore))
+        print("Length: {}  Health: {}  Game over: {}".format(len(engine.body), engine.current_health, engine.game_over_status))
@@ -0,0 +1,176 @@
+""" Python Evolving Snake game
+
+    Description:
+        Scheduler file includes the frame scheduler class, which limits the frame rate of each game state
+        and the fixed timestep class, which decouples the simulation ticks from the frame rate
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import time
+import pygame
+import logging
+
+from Logger import setup_logging
+
+# Set config for logging
+setup_logging()
+
+# game states of the game loop
+state_running = "running"
+state_main_menu = "main_menu"
+state_pause = "pause"
+state_game_over = "game_over"
+
+
+class Frame_Scheduler():
+    """
+    Description:
+        Ends each frame of the game loop: the frame rate is capped for the current state
+        and in static states (menus, pause and game over) the loop sleeps until the next event arrives,
+        so the process doesn`t use a full cpu core while nobody is playing
+
+    Attributes:
+        clock: pygame clock to cap the frame rate
+        frame_rates: maximum frames per second for each state
+        static_states: states, which only need a new frame after an event
+        idle_timeout: maximum time in ms to wait for an event in a static state
+
+    Params:
+        frame_rates (dict): maximum frames per second for each state
+        static_states (tuple): states, which only need a new frame after an event
+        idle_timeout (int): maximum time in ms to wait for an event in a static state
+
+    Tests:
+        1. check if the running state doesn`t get more than 60 frames per second
+        2. check if the cpu usage is nearly 0 in the main menu without mouse or key events
+    """
+
+    def __init__(self, frame_rates, static_states=(state_main_menu, state_pause, state_game_over), idle_timeout=1000):
+        self.clock = pygame.time.Clock()
+        self.frame_rates = frame_rates
+        self.static_states = static_states
+        self.idle_timeout = idle_timeout
+
+
+    def end_frame(self, state):
+        """
+        Description:
+            cap the frame rate of the state and wait for the next event in a static state
+            the loop only sleeps, if no event is queued, the awaited event is taken out of the queue by pygame
+            and returned, so the event loop of the next frame handles it before the later events
+            (posting it again would put it behind them, e.g. the button up of a click before the button down)
+
+        Params:
+            state (String): the current game state
+
+        Returns:
+            pygame.event.Event: the awaited event, None if no event was awaited
+
+        Tests:
+            1. check if the function returns None at once, when an event is waiting in a static state
+            2. check if the function returns None after idle_timeout ms without events in a static state
+            3. check if queued button down and button up events keep their order
+        """
+
+        try:
+            self.clock.tick(self.frame_rates.get(state, 0))
+
+            if state in self.static_states and not pygame.event.peek():
+                # sleep until an event arrives --> no busy loop
+                event = pygame.event.wait(self.idle_timeout)
+
+                if event.type != pygame.NOEVENT:
+                    return event
+
+        except Exception as e:
+            logging.error("Error occurred while waiting for the next frame", exc_info=True)
+
+        return None
+
+
+class Fixed_Timestep():
+    """
+    Description:
+        Measures the elapsed time of the game loop and returns how many simulation ticks are due,
+        every tick simulates exactly step_time ms, independent of the frame rate and of timer jitter
+        The rest of the time, which is not enough for a tick, gives the interpolation between the last two ticks
+
+    Attributes:
+        step_time: time in ms of one simulation tick
+        max_steps: maximum number of ticks for one frame, the lag above is dropped to catch up
+        accumulator: elapsed time in ms, which is not simulated yet
+        last_time: time in ms of the last call of advance, None if the time is stopped
+        alpha: interpolation between the last tick (0.0) and the next tick (1.0)
+
+    Params:
+        step_time (int): time in ms of one simulation tick
+        max_steps (int): maximum number of ticks for one frame
+
+    Tests:
+        1. check if advance returns 1 after step_time ms
+        2. check if advance returns max_steps after a long frame
+    """
+
+    def __init__(self, step_time, max_steps=5):
+        self.step_time = step_time
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last_time = None
+        self.alpha = 0.0
+
+
+    def advance(self):
+        """
+        Description:
+            add the elapsed time since the last call to the accumulator and take the due ticks out of it
+
+        Params:
+            none
+
+        Returns:
+            int: number of ticks to simulate in this frame
+
+        Tests:
+            1. check if the sum of the returned ticks over 1 second is 1000 / step_time
+            2. check if alpha is always between 0.0 and 1.0
+        """
+
+        now = time.perf_counter() * 1000
+
+        # the first frame after a stop doesn`t simulate the stopped time
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = int(self.accumulator // self.step_time)
+        self.accumulator -= steps * self.step_time
+
+        # catch up limit, a very slow frame doesn`t lead to a burst of ticks
+        if steps > self.max_steps:
+            steps = self.max_steps
+
+        self.alpha = self.accumulator / self.step_time
+        return steps
+
+
+    def stop(self):
+        """
+        Description:
+            stop the time, e.g. while the game is paused, the next advance starts with the partly elapsed tick
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if advance returns 0 after stop and a long pause
+        """
+
+        self.last_time = None
@@ -10,13 +10,15 @@
         License : free
 """
 
-import pygame
 import logging
 
 from pygame.math import Vector2
+from Assets import assets
+from Engine import move_directions, move_down
+from Logger import setup_logging
 
 # Set config for logging
-logging.basicConfig(format='%(asctime)s - %(message)s', filename='logs\\logfile.log', datefmt='%y-%m-%d %H:%M')
+setup_logging()
 
 class Snake:
     """
@@ -25,11 +27,15 @@ class Snake:
 
     Attributes:
         game : the game object which contains the snake
-        body : the initial snake body and theire position
-        direction : the initial direktion of the snake
+        body : the snake body of the game engine and theire position
+        direction : the direktion of the game engine snake
         new_block : bool, which idicates the snake body getting a new block
         head_img : the image source for the head block
+        head_imgs : the head image rotated for each action, the mouth points in the moving direction
+        head_action : action of the last moving direction, for the head image while the snake doesn`t move
         body_img : the image source for the body blocks
+        body_blits : (body_img, position) for each visible cell of the playarea, build once
+        blit_buffer : reused list of the body blits of one frame
 
     Prams:
         game (Game) : the game, which calls the snake constructor
@@ -51,29 +57,109 @@ class Snake:
         try:
             self.game = game
 
-            # initial snake
-            self.body = [Vector2(14,12), Vector2(14,11), Vector2(14,10)]
+            # the images are loaded with load_images, the main menu is shown before the loader thread finished
+            self.head_img = None
+            self.body_img = None
+            self.head_imgs = None
+            self.head_action = move_down
+            self.body_blits = []
+            self.blit_buffer = []
 
-            # initial snake moving direction
-            self.direction = Vector2(0,1)
-            self.new_block = False
+        except Exception as e:
+            logging.error("Error occurred while creating a snake object", exc_info=True)
+
+
+    def load_images(self):
+        """
+        Description:
+            get the images of the snake from the asset manager and build the body blits of the visible cells,
+            called by the game after the loader thread finished or before the first game starts
+
+        Params:
+            none
+
+        Returns:
+            none
+
+        Tests:
+            1. check if body_blits has one entry for each visible cell after the call
+        """
+
+        try:
+            # pre loaded and transformed images of the asset manager --> better performance
+            size = (self.game.grid_cell_size, self.game.grid_cell_size)
+            self.head_img = assets.image("Head.png", size)
+            self.body_img = assets.image("Body.png", size)
 
-            # pre loading images --> better performance
-            self.head_img = pygame.image.load("Images\Head.png")
-            self.body_img = img = pygame.image.load("Images\Body.png")
+            # rotated once for the actions up, right, down and left, the image shows the head moving down
+            self.head_imgs = [assets.image("Head.png", size, angle=angle) for angle in (180, 90, 0, -90)]
 
-            # pre transforming images
-            self.head_img = pygame.transform.scale(self.head_img, (self.game.grid_cell_size, self.game.grid_cell_size))
-            self.body_img = pygame.transform.scale(self.body_img, (self.game.grid_cell_size, self.game.grid_cell_size))
+            # the position of each visible cell doesn`t change, only the list of the occupied cells is filled each frame
+            self.body_blits.clear()
+            for row in range(self.game.view_cells_y):
+                for column in range(self.game.view_cells_x):
+                    self.body_blits.append((self.body_img, (self.game.play_rect.x + column * size[0], self.game.play_rect.y + row * size[1])))
 
         except Exception as e:
-            logging.error("Error occurred while creating a snake object", exc_info=True)
+            logging.error("Error occurred while loading the snake images", exc_info=True)
+
+
+    @property
+    def body(self):
+        """ the snake body of the engine as Vector2 blocks, body[0] is the head """
+        return [Vector2(self.game.engine.position(block)) for block in self.game.engine.body]
+
+
+    @property
+    def direction(self):
+        """ the moving direction of the engine snake as Vector2 """
+        return Vector2(self.game.engine.direction)
+
+
+    @direction.setter
+    def direction(self, direction):
+        self.game.engine.direction = (int(direction[0]), int(direction[1]))
+
+
+    @property
+    def new_block(self):
+        """ bool, which indicates the snake body getting a new block with the next move """
+        return self.game.engine.new_block
+
+
+    @new_block.setter
+    def new_block(self, new_block):
+        self.game.engine.new_block = new_block
+
+
+    def head_image(self):
+        """
+        Description:
+            return the head image of the moving direction, the direction of the last movement while the snake doesn`t move
+
+        Params:
+            none
+
+        Returns:
+            pygame.Surface: the rotated head image
+
+        Tests:
+            1. check if the head image of a snake moving down is head_img
+            2. check if the head image stays the same after the snake stopped
+        """
+
+        direction = self.game.engine.direction
+        if direction in move_directions:
+            self.head_action = move_directions.index(direction)
+
+        return self.head_imgs[self.head_action]
 
 
     def draw_snake(self):
         """
         Description:
-            Create rect for Snake body and draw them on the screen, as well as filling the rect with the images for the body parts
+            Draw the snake blocks of the visible cells on the screen: all body blocks with one blits call and the head once
+            only the cells in the view of the camera are checked, so the time doesn`t depend on the board size or the snake length
 
         Params:
             none
@@ -83,20 +169,39 @@ class Snake:
 
         Tests: 
             1. check if the images where loaded
-            2. check if the snake body is printed to the game screen
+            2. check if a snake with 2000 blocks is drawn in less than 16 ms
         """
 
         try:
-            for block in self.body:
-                # body[0] <-- represents the head of the snake
-                if block == self.body[0]:
-                    block_rect = pygame.Rect((block.x * self.game.grid_cell_size) , (block.y * self.game.grid_cell_size), self.game.grid_cell_size , self.game.grid_cell_size)
-                    self.game.game_screen.blit(self.head_img, block_rect)
-                # body[1:], means each index until n starting at 1  <-- represents the body of the snake
-                else:
-                    block_rect = pygame.Rect((block.x * self.game.grid_cell_size) , (block.y * self.game.grid_cell_size), self.game.grid_cell_size , self.game.grid_cell_size)
-                    self.game.game_screen.blit(self.body_img, block_rect)
-        
+            game = self.game
+            engine = game.engine
+            grid = engine.grid
+            head = engine.body[0]
+
+            body_blits = self.body_blits
+            sequence = self.blit_buffer
+            sequence.clear()
+
+            # first visible cell of each row and the number of visible cells in a row
+            first_x = game.camera_x + 1
+            count_x = game.view_cells_x
+
+            for row in range(game.view_cells_y):
+                start = (game.camera_y + 1 + row) * engine.stride + first_x
+                index = row * count_x
+
+                # the grid counts the snake blocks on each cell
+                for column, blocks in enumerate(grid[start:start + count_x]):
+                    if blocks > 0 and start + column != head:
+                        sequence.append(body_blits[index + column])
+
+            game.game_screen.blits(sequence, False)
+
+            # body[0] <-- represents the head of the snake
+            head_rect = game.cell_rect(head)
+            if head_rect is not None:
+                game.game_screen.blit(self.head_image(), head_rect)
+
         except Exception as e:
             logging.error("Error occurred while drawing the snake to the screen", exc_info=True)
 
@@ -119,28 +224,7 @@ class Snake:
         """
 
         try:
-            if(self.direction != (0,0)):
-                if self.new_block == True:
-                    # temp copy the full body
-                    body_copy = self.body[:]
-
-                    # Adding the new head by adding the direction vector to the first index
-                    body_copy.insert(0, body_copy[0] + self.direction)
-
-                    # set the body to the "new" temp body
-                    self.body = body_copy[:]
-
-                    # reset the new_block flag 
-                    self.new_block = False
-                else:
-                    # temp copy the body without the last element 
-                    body_copy = self.body[:-1]
-
-                    # Adding the new head by adding the direction vector to the first index
-                    body_copy.insert(0, body_copy[0] + self.direction)
-
-                    # set the body to the "new" temp body
-                    self.body = body_copy[:]
+            self.game.engine.move_snake()
 
         except Exception as e:
             logging.error("Error occurred while moving the snakes body blocks positions", exc_info=True)
\ No newline at end of file
@@ -0,0 +1,353 @@
+""" Python Evolving Snake game
+
+    Description:
+        Tournament file runs many headless games with a policy on all cpu cores and writes the result of each game
+        as one JSON line, e.g. to tune the health loss, the random effect interval and the effect weights
+        Run it with: $ python Tournament.py --games 100000 --policy greedy --output results.jsonl
+        A policy is a function policy(engine), which returns the action of the next tick or None to keep the direction,
+        own policies are given as "module:function", a policy with a state has a reset attribute called before each game
+
+    Param:
+        Author  : Simon Jess
+        Date    : 06.06.2021
+        Version : 1.0.0
+        License : free
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import importlib
+import multiprocessing
+
+from Engine import Engine, effect_names, move_directions, check_effect_weights
+from Autopilot import autopilot_policy
+from Logger import setup_logging, register_worker_exit
+
+# Set config for logging
+setup_logging()
+
+# engine and policy of a worker process, created once for all games of the worker
+worker_engine = None
+worker_policy = None
+worker_max_ticks = 0
+
+# random generator of the random policy, seeded from the seed of each game, so the food of the game doesn`t depend on the policy
+policy_rng = random.Random()
+
+
+def policy_seed(seed):
+    """
+    Description:
+        return the seed of the policy generator of a game, a string seed is hashed by random.Random,
+        so the moves of the random policy are not the same random stream as the food positions of the engine
+
+    Params:
+        seed (int): seed of the game
+
+    Returns:
+        String: seed of the policy generator
+
+    Tests:
+        1. check if random.Random(policy_seed(seed)).random() differs from random.Random(seed).random()
+    """
+
+    return "{}-policy".format(seed)
+
+
+def random_policy(engine):
+    """
+    Description:
+        policy, which turns into a random direction in a quarter of the ticks
+
+    Params:
+        engine (Engine): the engine of the game
+
+    Returns:
+        int: action of the next tick, None to keep the direction
+
+    Tests:
+        1. check if the returned actions are None or 0 - 3
+    """
+
+    if policy_rng.random() < 0.25:
+        return policy_rng.randrange(len(move_directions))
+    return None
+
+
+def greedy_policy(engine):
+    """
+    Description:
+        policy, which moves towards the food and never into a blocked cell, if a free cell is next to the head
+
+    Params:
+        engine (Engine): the engine of the game
+
+    Returns:
+        int: action of the next tick, None to keep the direction
+
+    Tests:
+        1. check if the snake eats the food on an empty board
+        2. check if the snake doesn`t move into the border, when it moves along the border
+    """
+
+    head = engine.body[0]
+    food = engine.food if engine.food is not None else head
+    head_y, head_x = divmod(head, engine.stride)
+    food_y, food_x = divmod(food, engine.stride)
+
+    # actions towards the food first, than all other actions
+    actions = []
+    if food_y < head_y:
+        actions.append(0)
+    if food_x > head_x:
+        actions.append(1)
+    if food_y > head_y:
+        actions.append(2)
+    if food_x < head_x:
+        actions.append(3)
+    actions.extend((0, 1, 2, 3))
+
+    for action in actions:
+        dx, dy = move_directions[action]
+
+        # no reversal and no blocked cell
+        if dx == -engine.direction[0] and dy == -engine.direction[1]:
+            continue
+        if engine.grid[head + dy * engine.stride + dx] == 0:
+            return action
+
+    return None
+
+
+# policies, which can be given by name
+policies = {"random": random_policy, "greedy": greedy_policy, "autopilot": autopilot_policy}
+
+
+def load_policy(name):
+    """
+    Description:
+        return the policy function of the name, a name of the policies dict or "module:function"
+
+    Params:
+        name (String): name of the policy
+
+    Returns:
+        function: the policy
+
+    Tests:
+        1. check if "greedy" returns greedy_policy
+        2. check if "Tournament:random_policy" returns random_policy
+    """
+
+    if name in policies:
+        return policies[name]
+
+    module_name, function_name = name.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def init_worker(policy_name, max_ticks, rules):
+    """
+    Description:
+        create the engine and the policy of a worker process once, each game only resets the engine
+
+    Params:
+        policy_name (String): name of the policy
+        max_ticks (int): maximum number of ticks of a game
+        rules (dict): parameters of the engine (board size, health loss, effect interval and weights)
+
+    Returns:
+        none
+
+    Tests:
+        1. check if no pygame module is imported in the worker
+    """
+
+    global worker_engine, worker_policy, worker_max_ticks
+
+    # the worker ends with os._exit, the queued records are written by a finalizer
+    register_worker_exit()
+
+    worker_engine = Engine(**rules)
+    worker_policy = load_policy(policy_name)
+    worker_max_ticks = max_ticks
+
+
+def play_game(seed):
+    """
+    Description:
+        play one game with the policy of the worker
+
+    Params:
+        seed (int): seed of the game
+
+    Returns:
+        dict: result of the game: seed, score, length, ticks survived and the number of each random effect
+
+    Tests:
+        1. check if the same seed gives the same result
+        2. check if ticks is never greater than max_ticks
+    """
+
+    engine = worker_engine
+    policy = worker_policy
+    engine.reset(seed)
+    policy_rng.seed(policy_seed(seed))
+
+    if hasattr(policy, "reset"):
+        policy.reset()
+
+    ticks = 0
+    while ticks < worker_max_ticks and engine.step(policy(engine)):
+        ticks += 1
+
+    # the tick of the game over is survived too
+    if engine.game_over_status:
+        ticks += 1
+
+    return {
+        "seed": seed,
+        "score": engine.highscore,
+        "length": len(engine.body),
+        "ticks": ticks,
+        "game_over": engine.game_over_status,
+        "effects": dict(zip(effect_names, engine.effect_counts)),
+    }
+
+
+def run_tournament(games, policy_name, output, processes=None, seed=0, max_ticks=100000, rules=None):
+    """
+    Description:
+        play the games on a process pool and write each result as one JSON line, in the order the games finish
+
+    Params:
+        games (int): number of games
+        policy_name (String): name of the policy
+        output (String): path of the JSON lines file, "-" for the console
+        processes (int): number of worker processes, None for all cpu cores
+        seed (int): seed of the first game, game i gets seed + i
+        max_ticks (int): maximum number of ticks of a game
+        rules (dict): parameters of the engine
+
+    Returns:
+        dict: summary of the tournament: games, mean score, best score and games per second
+
+    Tests:
+        1. check if the file has one line for each game
+        2. check if two runs with the same seed give the same results
+    """
+
+    rules = rules or {}
+    start = time.perf_counter()
+    total_score = 0
+    best_score = 0
+
+    file = sys.stdout if output == "-" else open(output, "w")
+
+    try:
+        with multiprocessing.Pool(processes, init_worker, (policy_name, max_ticks, rules)) as pool:
+            # big chunks keep the overhead of the pool small for short games
+            chunksize = max(1, min(256, games // ((processes or multiprocessing.cpu_count()) * 16)))
+
+            for result in pool.imap_unordered(play_game, range(seed, seed + games), chunksize):
+                result["policy"] = policy_name
+                file.write(json.dumps(result) + "\n")
+
+                total_score += result["score"]
+                best_score = max(best_score, result["score"])
+
+            # the workers exit by themselves and write their records, leaving the with block would terminate them
+            pool.close()
+            pool.join()
+
+    except Exception as e:
+        logging.error("Error occurred while running the tournament", exc_info=True)
+
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "games": games,
+        "mean_score": total_score / games if games else 0,
+        "best_score": best_score,
+        "games_per_second": games / elapsed if elapsed else 0,
+    }
+
+
+def parse_effect_weights(text):
+    """
+    Description:
+        read the weights of the random effects from the command line, e.g. "10,10,10,10,10"
+
+    Params:
+        text (String): comma separated weights
+
+    Returns:
+        tuple: the 5 weights
+
+    Tests:
+        1. check if "1,0,0,0,0" gives (1, 0, 0, 0, 0)
+        2. check if "1,2,3,4" and "0,0,0,0,0" stop the script with an error message
+    """
+
+    try:
+        return check_effect_weights(int(weight) for weight in text.split(","))
+
+    except ValueError as e:
+        # argparse prints the message and exits
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_arguments(arguments=None):
+    """
+    Description:
+        read the command line arguments
+
+    Params:
+        arguments (list): command line arguments, None for sys.argv
+
+    Returns:
+        argparse.Namespace: the arguments
+
+    Tests:
+        1. check if the default policy is greedy
+        2. check if --effect-weights 1,0,0,0,0 gives 5 weights
+        3. check if --effect-weights 0,0,0,0,0 fails with an error message
+    """
+
+    parser = argparse.ArgumentParser(description="Run headless snake games on all cpu cores and write the results as JSON lines")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    parser.add_argument("--policy", default="greedy", help="random, greedy, autopilot or module:function")
+    parser.add_argument("--output", default="results.jsonl", help="JSON lines file, - for the console")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes, default all cpu cores")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first game, default random")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="maximum number of ticks of a game")
+    parser.add_argument("--width", type=int, default=27, help="number of grid cells in x direction")
+    parser.add_argument("--height", type=int, default=23, help="number of grid cells in y direction")
+    parser.add_argument("--healt-loss", type=float, default=0.5, help="health loss of each tick")
+    parser.add_argument("--effect-interval", type=int, default=250, help="points between two random effects")
+    parser.add_argument("--effect-weights", type=parse_effect_weights, default=(10, 10, 10, 10, 10), help="weights of the 5 random effects: " + ", ".join(effect_names))
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    rules = {
+        "grid_cell_count_x": arguments.width,
+        "grid_cell_count_y": arguments.height,
+        "healt_loss": arguments.healt_loss,
+        "random_effect_step": arguments.effect_interval,
+        "effect_weights": arguments.effect_weights,
+    }
+    seed = arguments.seed if arguments.seed is not None else random.getrandbits(32)
+
+    summary = run_tournament(arguments.games, arguments.policy, arguments.output, arguments.processes, seed, arguments.max_ticks, rules)
+    print("Games: {games}  Mean score: {mean_score:.1f}  Best score: {best_score}  Games/s: {games_per_second:.0f}".format(**summary), file=sys.stderr)